@@ -0,0 +1,197 @@
+"""Benchmark the cloud code paths against the in-process iftapi.net simulator.
+
+Registers ``--accounts`` accounts with ``--fireplaces`` fireplaces each on an
+:class:`IntelliFireCloudSimulator` answering after ``--latency`` seconds (plus up to ``--jitter``), then
+measures, with no network access:
+
+* ``login``: :class:`IntelliFireCloudInterface` logins, each enumerating and polling its fireplaces
+* ``poll`` / ``command``: :class:`IntelliFireAPICloud` polls and commands over one shared session
+* ``longpoll``: time from a status change to the pending long poll returning it
+* ``failover``: :class:`UnifiedFireplace` reads when local polls start dropping, from the failed
+  local poll through switching to cloud reads and completing a cloud poll
+
+Clients and simulator share one event loop, so the figures include the simulator's own work.
+
+Usage::
+
+    python benchmarks/bench_cloud_simulator.py --accounts 50 --fireplaces 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from typing import TypeVar
+
+import aiohttp
+
+from intellifire4py import IntelliFireAPICloud, UnifiedFireplace
+from intellifire4py.cloud_interface import IntelliFireCloudInterface
+from intellifire4py.testing.cloud_simulator import IntelliFireCloudSimulator
+from intellifire4py.const import IntelliFireApiMode
+from intellifire4py.testing.local_simulator import IntelliFireLocalSimulator
+from intellifire4py.model import IntelliFireUserData
+
+_T = TypeVar("_T")
+
+PASSWORD = "password"  # noqa: S105
+
+
+async def _timed(
+    items: Sequence[_T], action: Callable[[_T], Awaitable[object]]
+) -> tuple[float, list[float]]:
+    """Run `action` on every item concurrently, returning the wall time and each latency."""
+
+    async def one(item: _T) -> float:
+        start = time.perf_counter()
+        await action(item)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one(item) for item in items))
+    return time.perf_counter() - start, list(latencies)
+
+
+def _report(label: str, requests: int, wall: float, latencies: list[float]) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:>9}: {requests / wall:8.0f} req/s, "
+        f"p50 {quantiles[49] * 1000:7.1f} ms, p99 {quantiles[98] * 1000:7.1f} ms"
+    )
+
+
+async def _login(
+    cloud: IntelliFireCloudSimulator, username: str
+) -> IntelliFireUserData:
+    """Log in with a session of its own, as the login cookies land in the session."""
+    interface = IntelliFireCloudInterface(use_http=True, session=cloud.session())
+    async with interface:
+        await interface.login_with_credentials(username=username, password=PASSWORD)
+    return interface.user_data
+
+
+async def _failover(
+    cloud: IntelliFireCloudSimulator,
+    local: IntelliFireLocalSimulator,
+    user_data: IntelliFireUserData,
+) -> None:
+    """Measure falling back from local to cloud reads for one account's fireplaces."""
+    session = cloud.session()
+    fireplaces = await UnifiedFireplace.build_fireplaces_from_user_data(
+        user_data, use_http=True, polling_enabled=False, session=session
+    )
+    await asyncio.gather(*(fireplace.perform_local_poll() for fireplace in fireplaces))
+    for device in local.fireplaces.values():
+        device.drop_rate = 1.0
+
+    async def fail_over(fireplace: UnifiedFireplace) -> None:
+        try:
+            await fireplace.perform_poll(timeout_seconds=1.0)
+        except (aiohttp.ClientError, TimeoutError):
+            await fireplace.set_read_mode(IntelliFireApiMode.CLOUD)
+            await fireplace.perform_poll()
+
+    wall, latencies = await _timed(fireplaces, fail_over)
+    _report("failover", len(latencies), wall, latencies)
+    switched = sum(f.read_mode == IntelliFireApiMode.CLOUD for f in fireplaces)
+    print(f"{switched}/{len(fireplaces)} fireplaces reading from the cloud")
+    await asyncio.gather(*(fireplace.close() for fireplace in fireplaces))
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Populate the simulator and measure each path."""
+    async with (
+        IntelliFireCloudSimulator(time_scale=args.time_scale, seed=0) as cloud,
+        IntelliFireLocalSimulator(seed=0) as local,
+    ):
+        accounts = [
+            cloud.add_account(f"user{index}@example.com", PASSWORD)
+            for index in range(args.accounts)
+        ]
+        devices = {}
+        for index, account in enumerate(accounts):
+            for _ in range(args.fireplaces):
+                # The first account's fireplaces are also reachable locally, for failover
+                device = await local.add_fireplace() if index == 0 else None
+                device = cloud.add_fireplace(account, device)
+                devices[device.serial] = device
+        cloud.faults.latency = args.latency
+        cloud.faults.jitter = args.jitter
+        total = args.accounts * args.fireplaces
+        print(
+            f"{args.accounts} accounts, {total} fireplaces, "
+            f"{args.latency * 1000:.0f} ms latency"
+        )
+
+        users: list[IntelliFireUserData] = []
+
+        async def login(account) -> None:
+            users.append(await _login(cloud, account.username))
+
+        wall, latencies = await _timed(accounts, login)
+        # login, enumlocations, enumfireplaces and a poll per fireplace
+        _report("login", 3 * len(accounts) + total, wall, latencies)
+
+        connector = aiohttp.TCPConnector(limit=0, resolver=cloud.resolver())
+        async with aiohttp.ClientSession(connector=connector) as session:
+            apis = [
+                IntelliFireAPICloud(
+                    serial=fireplace.serial,
+                    use_http=True,
+                    cookie_jar=user.cookie_jar,
+                    session=session,
+                )
+                for user in users
+                for fireplace in user.fireplaces
+            ]
+            latencies = []
+            wall = 0.0
+            for _ in range(args.rounds):
+                elapsed, round_latencies = await _timed(apis, lambda api: api.poll())
+                wall += elapsed
+                latencies += round_latencies
+            _report("poll", len(latencies), wall, latencies)
+
+            wall, latencies = await _timed(apis, lambda api: api.flame_on())
+            _report("command", len(latencies), wall, latencies)
+
+            # Each long poll is woken by a change made once it is waiting
+            await asyncio.gather(*(api.poll() for api in apis))
+            pending = [asyncio.create_task(api.long_poll()) for api in apis]
+            await asyncio.sleep(args.latency + args.jitter + 0.2)
+            started = time.perf_counter()
+            for device in devices.values():
+                device.update(temperature=device.state["temperature"] + 1)
+            changed = await asyncio.gather(*pending)
+            wall = time.perf_counter() - started
+            print(
+                f"{'longpoll':>9}: {sum(changed)}/{len(apis)} changes delivered "
+                f"in {wall * 1000:.1f} ms"
+            )
+
+        cloud.faults.latency = cloud.faults.jitter = 0.0
+        await _failover(
+            cloud,
+            local,
+            next(user for user in users if user.username == accounts[0].username),
+        )
+        print(f"simulator requests: {dict(cloud.stats)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--fireplaces", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.05,
+        help="Multiplier applied to the 57s long poll timeout and 30s queue window",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,157 @@
+"""Measure the memory and CPU cost of each fireplace in a FireplaceFleet.
+
+Registers ``--fireplaces`` fireplaces on the local and cloud simulators, adds them to a
+:class:`FireplaceFleet` and reports, with no network access:
+
+* memory retained per fireplace once built, traced with ``tracemalloc``
+* CPU time (``time.process_time``) and wall time per fireplace of a full polling round
+* with ``--slow`` units answering after ``--slow-latency`` seconds, when results arrive from
+  ``poll_all()`` compared with gathering every poll (the first, half and last result)
+
+Clients and simulators share one process, so CPU figures include the simulators' own work; compare
+runs with different ``--history-capacity`` values or fleet sizes rather than reading them as absolute.
+
+Usage::
+
+    python benchmarks/bench_fleet.py --fireplaces 1000 --rounds 5 --slow 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import logging
+import time
+import tracemalloc
+
+from intellifire4py.testing.cloud_simulator import IntelliFireCloudSimulator
+from intellifire4py.fleet import FireplaceFleet
+from intellifire4py.testing.local_simulator import IntelliFireLocalSimulator
+from intellifire4py.model import IntelliFireCommonFireplaceData, IntelliFireUserData
+
+
+async def _compare_streaming(fleet: FireplaceFleet, slow_latency: float) -> None:
+    """Report when results of a round arrive, streamed and gathered."""
+    start = time.perf_counter()
+    arrivals = [time.perf_counter() - start async for _ in fleet.poll_all()]
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            fireplace.perform_poll(timeout_seconds=slow_latency * 2)
+            for fireplace in fleet
+        ),
+        return_exceptions=True,
+    )
+    gathered = time.perf_counter() - start
+
+    half = arrivals[len(arrivals) // 2]
+    print(
+        f"{'poll_all':>9}: first {arrivals[0]:.3f} s, half {half:.3f} s, "
+        f"last {arrivals[-1]:.3f} s"
+    )
+    print(f"{'gather':>9}: all at {gathered:.3f} s")
+
+
+async def main(
+    fireplaces: int,
+    rounds: int,
+    concurrency: int,
+    history_capacity: int | None,
+    slow: int,
+    slow_latency: float,
+) -> None:
+    """Build the fleet, then time polling rounds."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFireCloudSimulator() as cloud,
+    ):
+        account = cloud.add_account()
+        common = []
+        virtual = []
+        for _ in range(fireplaces):
+            fireplace = cloud.add_fireplace(account, await local.add_fireplace())
+            virtual.append(fireplace)
+            common.append(
+                IntelliFireCommonFireplaceData(
+                    ip_address=fireplace.address,
+                    api_key=fireplace.api_key,
+                    serial=fireplace.serial,
+                    user_id=account.user_id,
+                    auth_cookie=account.auth_cookie,
+                    web_client_id=account.web_client_id,
+                )
+            )
+        user_data = IntelliFireUserData(
+            user_id=account.user_id,
+            auth_cookie=account.auth_cookie,
+            web_client_id=account.web_client_id,
+            fireplaces=common,
+        )
+
+        async with FireplaceFleet(
+            session=cloud.session(),
+            max_concurrency=concurrency,
+            history_capacity=history_capacity,
+            use_http=True,
+        ) as fleet:
+            gc.collect()
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            await fleet.add_user_data(user_data)
+            build = time.perf_counter() - start
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0] - before
+            tracemalloc.stop()
+            print(
+                f"{len(fleet)} fireplaces built in {build:.2f} s, "
+                f"{retained / len(fleet) / 1024:.1f} KiB each "
+                f"(history capacity {history_capacity})"
+            )
+
+            for round_ in range(rounds):
+                cpu, wall = time.process_time(), time.perf_counter()
+                results = await fleet.poll()
+                cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+                failed = sum(result is not None for result in results.values())
+                print(
+                    f"poll round {round_ + 1}: {wall:.3f} s, "
+                    f"{cpu / len(fleet) * 1e3:.3f} ms CPU/fireplace, {failed} failed"
+                )
+            print(fleet.health())
+
+            if slow:
+                for fireplace in virtual[:slow]:
+                    fireplace.latency = slow_latency
+                print(f"{slow} fireplaces answering after {slow_latency} s")
+                await _compare_streaming(fleet, slow_latency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fireplaces", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument(
+        "--history-capacity",
+        type=lambda value: None if value == "none" else int(value),
+        default=None,
+        help="Samples of history per API, or 'none' (default: none)",
+    )
+    parser.add_argument("--slow", type=int, default=0)
+    parser.add_argument("--slow-latency", type=float, default=2.0)
+    args = parser.parse_args()
+    # Simulated fireplaces report 127.0.0.1, which the local API warns about on every read
+    logging.getLogger("intellifire4py").setLevel(logging.ERROR)
+    asyncio.run(
+        main(
+            args.fireplaces,
+            args.rounds,
+            args.concurrency,
+            args.history_capacity,
+            args.slow,
+            args.slow_latency,
+        )
+    )
@@ -0,0 +1,129 @@
+"""Benchmark local command send latency with and without challenge prefetching.
+
+An in-process fireplace serves ``/get_challenge`` and ``/post`` with an artificial per-request delay
+mimicking the slow ZentriOS WiFi module. Commands are sent at a human pace and timed in three ways:
+
+* ``legacy``: ``/get_challenge``, a fixed ``sleep(0.2)``, then ``/post`` - the previous pipeline
+* ``cold``: :func:`IntelliFireAPILocal.send_command` with the challenge cache emptied before each command
+* ``prefetch``: :func:`IntelliFireAPILocal.send_command` signing with the prefetched challenge
+
+Usage::
+
+    python benchmarks/bench_local_send_latency.py --commands 20 --latency 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import secrets
+import statistics
+import time
+
+import aiohttp
+from aiohttp import web
+
+from intellifire4py import IntelliFireAPILocal
+from intellifire4py.const import IntelliFireCommand
+
+API_KEY = "deadbeefdeadbeefdeadbeefdeadbeef"
+USER_ID = "bench_user"
+
+
+async def _start_server(latency: float) -> tuple[web.AppRunner, str]:
+    async def handle_challenge(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.Response(text=secrets.token_hex(16).upper())
+
+    async def handle_post(request: web.Request) -> web.Response:
+        await request.read()
+        await asyncio.sleep(latency)
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_get("/get_challenge", handle_challenge)
+    app.router.add_post("/post", handle_post)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+    return runner, f"127.0.0.1:{port}"
+
+
+async def _legacy_send(
+    api: IntelliFireAPILocal, session: aiohttp.ClientSession
+) -> None:
+    challenge = await api._get_challenge(session)
+    if challenge is None:
+        raise RuntimeError("Simulated fireplace did not return a challenge")
+    await asyncio.sleep(0.2)
+    data = api._construct_payload(command="power", value=1, challenge=challenge)
+    async with session.post(
+        f"http://{api.fireplace_ip}/post",
+        data=data,
+        headers={"content-type": "application/x-www-form-urlencoded"},
+    ) as resp:
+        resp.raise_for_status()
+
+
+async def _measure(name: str, send, commands: int, gap: float, prepare=None) -> None:
+    latencies: list[float] = []
+    for _ in range(commands):
+        # Leave time between presses, as a person would
+        await asyncio.sleep(gap)
+        if prepare is not None:
+            prepare()
+        start = time.perf_counter()
+        await send()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    print(
+        f"{name:>9}: mean {statistics.fmean(latencies):7.1f} ms"
+        f"  p50 {latencies[len(latencies) // 2]:7.1f} ms"
+        f"  max {latencies[-1]:7.1f} ms"
+    )
+
+
+async def main(args) -> None:
+    """Run every variant against the same simulated fireplace."""
+    runner, address = await _start_server(args.latency)
+    try:
+        async with aiohttp.ClientSession() as session:
+            api = IntelliFireAPILocal(
+                fireplace_ip=address, user_id=USER_ID, api_key=API_KEY, session=session
+            )
+
+            async def send() -> None:
+                await api.send_command(command=IntelliFireCommand.POWER, value=1)
+
+            def drop_prefetched() -> None:
+                api._challenge = None
+
+            await _measure(
+                "legacy",
+                lambda: _legacy_send(api, session),
+                args.commands,
+                args.gap,
+            )
+            await _measure("cold", send, args.commands, args.gap, drop_prefetched)
+            await api.prefetch_challenge()
+            await _measure("prefetch", send, args.commands, args.gap)
+            await api.close()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=20)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.25,
+        help="Simulated fireplace response time per request in seconds",
+    )
+    parser.add_argument(
+        "--gap", type=float, default=1.0, help="Seconds between commands"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,89 @@
+"""Load test local polling and commands against many simulated fireplaces.
+
+Starts ``--fireplaces`` simulated fireplaces with ``--latency`` seconds (plus up to ``--jitter``) per
+response, then polls all of them ``--rounds`` times concurrently over one shared session, and sends a
+command to each. Reports throughput and latency percentiles for both paths.
+
+Each fireplace listens on its own port, and each shared connection uses a descriptor on both ends;
+raise ``ulimit -n`` for many thousands of fireplaces.
+
+Usage::
+
+    python benchmarks/bench_local_simulator_load.py --fireplaces 1000 --rounds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+import aiohttp
+
+from intellifire4py import IntelliFireAPILocal
+from intellifire4py.testing.local_simulator import IntelliFireLocalSimulator
+
+
+async def _timed(
+    apis: list[IntelliFireAPILocal],
+    action: Callable[[IntelliFireAPILocal], Awaitable[object]],
+) -> tuple[float, list[float]]:
+    """Run `action` on every api concurrently, returning the wall time and each latency."""
+
+    async def one(api: IntelliFireAPILocal) -> float:
+        start = time.perf_counter()
+        await action(api)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one(api) for api in apis))
+    return time.perf_counter() - start, list(latencies)
+
+
+def _report(label: str, requests: int, wall: float, latencies: list[float]) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:>8}: {requests / wall:8.0f} req/s, "
+        f"p50 {quantiles[49] * 1000:7.1f} ms, p99 {quantiles[98] * 1000:7.1f} ms"
+    )
+
+
+async def main(fireplaces: int, rounds: int, latency: float, jitter: float) -> None:
+    """Start the fireplaces and measure."""
+    async with IntelliFireLocalSimulator(seed=0) as simulator:
+        devices = [
+            await simulator.add_fireplace(latency=latency, jitter=jitter)
+            for _ in range(fireplaces)
+        ]
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            apis = [device.api(session=session) for device in devices]
+            print(f"{fireplaces} fireplaces, {latency * 1000:.0f} ms latency")
+
+            latencies: list[float] = []
+            wall = 0.0
+            for _ in range(rounds):
+                elapsed, round_latencies = await _timed(apis, lambda api: api.poll())
+                wall += elapsed
+                latencies += round_latencies
+            _report("poll", len(latencies), wall, latencies)
+
+            wall, latencies = await _timed(apis, lambda api: api.flame_on())
+            # A cold command is a challenge and a post
+            _report("command", 2 * len(latencies), wall, latencies)
+            accepted = sum(device.stats["post_204"] for device in devices)
+            print(f"{accepted}/{fireplaces} commands accepted")
+            # Stop the challenge prefetches that followed the commands
+            await asyncio.gather(*(api.close() for api in apis))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fireplaces", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    args = parser.parse_args()
+    asyncio.run(main(args.fireplaces, args.rounds, args.latency, args.jitter))
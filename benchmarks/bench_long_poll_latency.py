@@ -0,0 +1,177 @@
+"""Benchmark cloud event-to-callback latency for the long poll engine.
+
+An in-process fake iftapi.net (``apppoll`` / ``applongpoll`` with Etag queue semantics) is served on
+localhost and ``iftapi.net`` is resolved to it. Status changes are injected at random intervals and the
+time until the change reaches a callback is measured for:
+
+* ``legacy``: ``long_poll()`` followed by ``sleep(minimum_wait - duration)`` - the previous loop
+* ``engine``: :class:`IntelliFireLongPollEngine`, which re-arms immediately
+
+Usage::
+
+    python benchmarks/bench_long_poll_latency.py --events 20 --min-wait 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+from aiohttp.abc import AbstractResolver
+
+from intellifire4py import IntelliFireAPICloud
+from intellifire4py.const import CLOUD_LONG_POLL_SERVER_TIMEOUT_SECONDS
+from intellifire4py.long_poll import IntelliFireLongPollEngine
+from intellifire4py.model import IntelliFirePollData
+
+FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "cloud_poll.json"
+SERIAL = "BENCH"
+
+
+class _LocalResolver(AbstractResolver):
+    """Resolve every host to the local fake server."""
+
+    def __init__(self, port: int) -> None:
+        self._port = port
+
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> list[dict[str, Any]]:
+        return [
+            {
+                "hostname": host,
+                "host": "127.0.0.1",
+                "port": self._port,
+                "family": socket.AF_INET,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST,
+            }
+        ]
+
+    async def close(self) -> None:
+        pass
+
+
+class _FakeCloud:
+    """Minimal iftapi.net status queue for a single fireplace."""
+
+    def __init__(self, time_scale: float) -> None:
+        self.status = json.loads(FIXTURE.read_text())
+        self.version = 0
+        self.changed = asyncio.Condition()
+        self.time_scale = time_scale
+
+    async def change(self, temperature: int) -> None:
+        async with self.changed:
+            self.status["temperature"] = str(temperature)
+            self.version += 1
+            self.changed.notify_all()
+
+    async def apppoll(self, request: web.Request) -> web.Response:
+        return web.json_response(self.status)
+
+    async def applongpoll(self, request: web.Request) -> web.Response:
+        seen = int(request.headers.get("If-None-Match", self.version))
+        async with self.changed:
+            try:
+                await asyncio.wait_for(
+                    self.changed.wait_for(lambda: self.version > seen),
+                    CLOUD_LONG_POLL_SERVER_TIMEOUT_SECONDS * self.time_scale,
+                )
+            except TimeoutError:
+                return web.Response(status=408, headers={"Etag": str(seen)})
+        return web.Response(
+            text=json.dumps(self.status),
+            content_type="text/html",
+            headers={"Etag": str(self.version)},
+        )
+
+
+async def _run(name: str, cloud: _FakeCloud, api: IntelliFireAPICloud, args) -> None:
+    received: dict[int, float] = {}
+
+    def on_update(data: IntelliFirePollData) -> None:
+        received.setdefault(data.temperature_c, time.perf_counter())
+
+    if name == "engine":
+        engine = IntelliFireLongPollEngine(api, on_update=on_update)
+        task = asyncio.create_task(engine.run())
+    else:
+
+        async def legacy() -> None:
+            await api.poll()
+            while True:
+                start = time.time()
+                if await api.long_poll():
+                    on_update(api.data)
+                await asyncio.sleep(args.min_wait - (time.time() - start))
+
+        task = asyncio.create_task(legacy())
+
+    await asyncio.sleep(0.2)
+    rng = random.Random(1)  # noqa: S311
+    sent: dict[int, float] = {}
+    for event in range(args.events):
+        await asyncio.sleep(rng.uniform(0.05, args.min_wait))
+        temperature = 100 + event
+        sent[temperature] = time.perf_counter()
+        await cloud.change(temperature)
+    await asyncio.sleep(args.min_wait + 0.5)
+    task.cancel()
+
+    latencies = sorted((received[t] - sent[t]) * 1000 for t in sent if t in received)
+    if not latencies:
+        print(f"{name:>7}: no events delivered")
+        return
+    print(
+        f"{name:>7}: delivered {len(latencies)}/{len(sent)}"
+        f"  mean {statistics.fmean(latencies):8.1f} ms"
+        f"  p50 {latencies[len(latencies) // 2]:8.1f} ms"
+        f"  max {latencies[-1]:8.1f} ms"
+    )
+
+
+async def main(args) -> None:
+    """Run both loops against a fresh fake server."""
+    for name in ("legacy", "engine"):
+        cloud = _FakeCloud(time_scale=args.time_scale)
+        app = web.Application()
+        app.router.add_get(f"/a/{SERIAL}//apppoll", cloud.apppoll)
+        app.router.add_get(f"/a/{SERIAL}/applongpoll", cloud.applongpoll)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        port = runner.addresses[0][1]
+
+        connector = aiohttp.TCPConnector(resolver=_LocalResolver(port))
+        async with aiohttp.ClientSession(connector=connector) as session:
+            api = IntelliFireAPICloud(
+                serial=SERIAL,
+                use_http=True,
+                cookie_jar=aiohttp.CookieJar(),
+                session=session,
+            )
+            await _run(name, cloud, api, args)
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--min-wait", type=float, default=2.0)
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.05,
+        help="Multiplier applied to the 57s server timeout",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,69 @@
+"""Compare change detection delay under uniform polling and an IntelliFirePollBudget at the same rate.
+
+Models a fleet of ``--fireplaces`` units of which ``--active`` are lit and changing state every
+``--active-change`` seconds on average, while idle units change every ``--idle-change`` seconds. With
+periodic polls a change is seen after half the polling interval on average, so the mean delay over all
+changes is the change-rate weighted mean of ``interval / 2``. Both strategies spend exactly
+``--rate`` polls per second; the uniform one gives every unit the same interval, the budget shares the
+rate by state.
+
+Usage::
+
+    python benchmarks/bench_poll_budget.py --fireplaces 2000 --active 0.1 --rate 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from intellifire4py.model import IntelliFirePollData
+from intellifire4py.polling import IntelliFirePollBudget
+
+
+def main(
+    fireplaces: int,
+    active: float,
+    rate: float,
+    active_change: float,
+    idle_change: float,
+) -> None:
+    """Allocate both ways and report the mean detection delay."""
+    lit = int(fireplaces * active)
+    on = IntelliFirePollData(power=1)
+    off = IntelliFirePollData()
+
+    budget = IntelliFirePollBudget(max_polls_per_second=rate)
+    start = time.perf_counter()
+    for index in range(fireplaces):
+        budget.update(index, on if index < lit else off)
+    budget.interval(0)
+    allocate = time.perf_counter() - start
+
+    # Mean delay = sum(change rate * interval / 2) / sum(change rate)
+    changes = [1 / active_change] * lit + [1 / idle_change] * (fireplaces - lit)
+    uniform = fireplaces / rate
+    uniform_delay = sum(c * uniform / 2 for c in changes) / sum(changes)
+    budget_delay = sum(
+        c * budget.interval(index) / 2 for index, c in enumerate(changes)
+    ) / sum(changes)
+
+    print(f"{fireplaces} fireplaces, {lit} lit, {rate} polls/s")
+    print(f"{'uniform':>8}: every {uniform:7.1f} s, mean delay {uniform_delay:7.1f} s")
+    print(
+        f"{'budget':>8}: lit every {budget.interval(0):7.1f} s, "
+        f"idle every {budget.interval(fireplaces - 1):7.1f} s, "
+        f"mean delay {budget_delay:7.1f} s, {budget.total_rate:.2f} polls/s"
+    )
+    print(f"allocation of {fireplaces} updates took {allocate * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fireplaces", type=int, default=2000)
+    parser.add_argument("--active", type=float, default=0.1)
+    parser.add_argument("--rate", type=float, default=20.0)
+    parser.add_argument("--active-change", type=float, default=30.0)
+    parser.add_argument("--idle-change", type=float, default=3600.0)
+    args = parser.parse_args()
+    main(args.fireplaces, args.active, args.rate, args.active_change, args.idle_change)
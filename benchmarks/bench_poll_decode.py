@@ -0,0 +1,65 @@
+"""Benchmark poll payload decoding paths on the fixtures in ``tests/fixtures``.
+
+Compares, per payload:
+
+* ``text+kwargs``: ``bytes.decode()``, ``json.loads`` and ``IntelliFirePollData(**data)`` - the previous path
+* ``json+validate``: ``json.loads(bytes)`` and ``model_validate``
+* ``orjson+validate``: ``orjson.loads`` and ``model_validate`` (only if orjson is installed)
+* ``from_json``: :func:`IntelliFirePollData.from_json` - pydantic parsing and validating the bytes in one pass
+
+Usage::
+
+    python benchmarks/bench_poll_decode.py --number 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from pathlib import Path
+
+from intellifire4py.model import IntelliFirePollData
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+PAYLOADS = ("local_poll.json", "cloud_poll.json", "error_6_642.json")
+
+
+def _paths(payload: bytes) -> dict:
+    paths = {
+        "text+kwargs": lambda: IntelliFirePollData(**json.loads(payload.decode())),
+        "json+validate": lambda: IntelliFirePollData.model_validate(
+            json.loads(payload)
+        ),
+        "from_json": lambda: IntelliFirePollData.from_json(payload),
+    }
+    if orjson is not None:
+        paths["orjson+validate"] = lambda: IntelliFirePollData.model_validate(
+            orjson.loads(payload)
+        )
+    return paths
+
+
+def main(number: int) -> None:
+    """Time every path on every fixture."""
+    for name in PAYLOADS:
+        payload = (FIXTURES / name).read_bytes()
+        paths = _paths(payload)
+        reference = paths["text+kwargs"]()
+        print(f"{name} ({len(payload)} bytes)")
+        for label, decode in paths.items():
+            if decode() != reference:
+                raise RuntimeError(f"{label} decoded {name} differently")
+            seconds = min(timeit.repeat(decode, number=number, repeat=3))
+            print(f"  {label:>16}: {seconds / number * 1e6:7.2f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    main(parser.parse_args().number)
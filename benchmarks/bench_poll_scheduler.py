@@ -0,0 +1,90 @@
+"""Compare one sleeping task per device with the shared IntelliFirePollScheduler.
+
+Runs ``--devices`` no-op polls at ``--interval`` seconds for ``--duration`` seconds, first the way
+``__background_poll`` does (a task per device that polls, then sleeps) and then through an
+:class:`IntelliFirePollScheduler`, and reports for each:
+
+* polls run and CPU time (``time.process_time``) per poll
+* tasks alive while polling
+* the largest number of polls started within any 10 ms, i.e. how much the wakeups line up
+
+Usage::
+
+    python benchmarks/bench_poll_scheduler.py --devices 5000 --interval 1 --duration 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+
+from intellifire4py.poll_scheduler import IntelliFirePollScheduler
+
+
+def _poller(starts: Counter[int]) -> Callable[[], Awaitable[None]]:
+    """Return a poll that records the 10 ms slot it started in."""
+
+    async def poll() -> None:
+        starts[int(time.monotonic() * 100)] += 1
+        await asyncio.sleep(0)
+
+    return poll
+
+
+async def _per_device(devices: int, interval: float, duration: float) -> Counter[int]:
+    """Poll from one task per device, like the APIs' own background polling."""
+    starts: Counter[int] = Counter()
+    poll = _poller(starts)
+
+    async def loop() -> None:
+        while True:
+            await poll()
+            await asyncio.sleep(interval)
+
+    tasks = [asyncio.create_task(loop()) for _ in range(devices)]
+    await asyncio.sleep(duration)
+    print(f"{'tasks alive':>24}: {len(asyncio.all_tasks())}")
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return starts
+
+
+async def _scheduled(devices: int, interval: float, duration: float) -> Counter[int]:
+    """Poll from the shared scheduler."""
+    starts: Counter[int] = Counter()
+    poll = _poller(starts)
+    async with IntelliFirePollScheduler() as scheduler:
+        for device in range(devices):
+            scheduler.add(device, poll, lambda failed_attempts: interval)
+        await asyncio.sleep(duration)
+        print(f"{'tasks alive':>24}: {len(asyncio.all_tasks())}")
+    return starts
+
+
+async def main(devices: int, interval: float, duration: float) -> None:
+    """Run both strategies and report."""
+    for label, strategy in (
+        ("task per device", _per_device),
+        ("IntelliFirePollScheduler", _scheduled),
+    ):
+        print(label)
+        cpu = time.process_time()
+        starts = await strategy(devices, interval, duration)
+        cpu = time.process_time() - cpu
+        polls = sum(starts.values())
+        print(f"{'polls':>24}: {polls}")
+        print(f"{'CPU per poll':>24}: {cpu / polls * 1e6:.1f} us")
+        print(f"{'most starts in 10 ms':>24}: {max(starts.values())}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=2000)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.devices, args.interval, args.duration))
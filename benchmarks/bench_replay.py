@@ -0,0 +1,103 @@
+"""Benchmark poll parsing and change detection by replaying recorded traffic.
+
+Without ``--trace``, records ``--polls`` exchanges from an in-process fireplace whose state changes
+on roughly one poll in ``--change-every`` (as a real, mostly idle fireplace does) and replays them.
+With ``--trace``, replays a log written by :class:`IntelliFireTrafficRecorder`, e.g. captured from
+production, so regressions in the parse path can be measured without hardware.
+
+Usage::
+
+    python benchmarks/bench_replay.py --polls 2000 --change-every 20
+    python benchmarks/bench_replay.py --trace traffic.jsonl.gz
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+from intellifire4py import IntelliFireAPILocal
+from intellifire4py.recorder import (
+    IntelliFireExchange,
+    IntelliFireTrafficRecorder,
+    load_exchanges,
+    replay_polls,
+)
+
+API_KEY = "deadbeefdeadbeefdeadbeefdeadbeef"
+USER_ID = "bench_user"
+FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "local_poll.json"
+
+
+async def _record(path: Path, polls: int, change_every: int) -> None:
+    """Record polls of a simulated fireplace to `path`."""
+    payload = json.loads(FIXTURE.read_bytes())
+    served = 0
+
+    async def handle_poll(request: web.Request) -> web.Response:
+        nonlocal served
+        served += 1
+        if served % change_every == 0:
+            payload["temperature"] = 15 + served // change_every % 10
+        return web.json_response(payload)
+
+    app = web.Application()
+    app.router.add_get("/poll", handle_poll)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+
+    recorder = IntelliFireTrafficRecorder(path)
+    api = IntelliFireAPILocal(
+        fireplace_ip=f"127.0.0.1:{runner.addresses[0][1]}",
+        user_id=USER_ID,
+        api_key=API_KEY,
+        session=recorder.session(),
+    )
+    for _ in range(polls):
+        await api.poll()
+    await recorder.close()
+    await runner.cleanup()
+
+
+def _replay(exchanges: list[IntelliFireExchange], repeat: int) -> None:
+    """Replay the exchanges into fresh providers and report throughput."""
+    best = float("inf")
+    for _ in range(repeat):
+        api = IntelliFireAPILocal(
+            fireplace_ip="127.0.0.1", user_id=USER_ID, api_key=API_KEY
+        )
+        start = time.perf_counter()
+        applied, changed = replay_polls(api, exchanges)
+        best = min(best, time.perf_counter() - start)
+    print(
+        f"replayed {applied} polls ({changed} changed) in {best * 1000:.2f} ms: "
+        f"{applied / best:,.0f} polls/s, {best / applied * 1e6:.2f} us/poll"
+    )
+
+
+def main(trace: Path | None, polls: int, change_every: int, repeat: int) -> None:
+    """Record if needed, then replay."""
+    with tempfile.TemporaryDirectory() as directory:
+        if trace is None:
+            trace = Path(directory) / "bench.jsonl.gz"
+            asyncio.run(_record(trace, polls, change_every))
+            print(f"recorded {polls} polls to {trace.stat().st_size} bytes")
+        exchanges = list(load_exchanges(trace))
+        _replay(exchanges, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trace", type=Path)
+    parser.add_argument("--polls", type=int, default=2000)
+    parser.add_argument("--change-every", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.trace, args.polls, args.change_every, args.repeat)
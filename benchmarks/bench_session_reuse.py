@@ -0,0 +1,91 @@
+"""Benchmark per-poll latency and allocations with and without session reuse.
+
+Serves the ``tests/fixtures/local_poll.json`` payload from an in-process aiohttp server and polls it
+with :class:`IntelliFireAPILocal` in two ways:
+
+* ``per-call``: a brand-new ``ClientSession`` (and connector) for every poll - the historical behaviour
+* ``shared``: a single long-lived session reused for every poll
+
+Usage::
+
+    python benchmarks/bench_session_reuse.py --polls 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+from intellifire4py import IntelliFireAPILocal
+
+FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "local_poll.json"
+
+
+async def _start_server() -> tuple[web.AppRunner, str]:
+    body = FIXTURE.read_bytes()
+
+    async def handle_poll(request: web.Request) -> web.Response:
+        return web.Response(body=body, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/poll", handle_poll)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"127.0.0.1:{port}"
+
+
+async def _poll_per_call(address: str) -> None:
+    async with aiohttp.ClientSession() as session:
+        api = IntelliFireAPILocal(fireplace_ip=address, session=session)
+        await api.poll()
+
+
+async def _measure(name: str, poll, polls: int) -> None:
+    latencies: list[float] = []
+    peaks: list[int] = []
+    tracemalloc.start()
+    for _ in range(polls):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        await poll()
+        latencies.append((time.perf_counter() - start) * 1000)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    tracemalloc.stop()
+
+    latencies.sort()
+    print(
+        f"{name:>9}: mean {statistics.fmean(latencies):7.3f} ms"
+        f"  p50 {latencies[len(latencies) // 2]:7.3f} ms"
+        f"  p95 {latencies[int(len(latencies) * 0.95)]:7.3f} ms"
+        f"  peak alloc/poll {statistics.fmean(peaks) / 1024:8.1f} KiB"
+    )
+
+
+async def main(polls: int) -> None:
+    """Run both variants against the same in-process server."""
+    runner, address = await _start_server()
+    try:
+        await _measure("per-call", lambda: _poll_per_call(address), polls)
+
+        async with IntelliFireAPILocal(fireplace_ip=address) as api:
+            await _measure("shared", api.poll, polls)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=500)
+    asyncio.run(main(parser.parse_args().polls))
@@ -0,0 +1,73 @@
+"""Benchmark memory held by poll data history, as pydantic models and as compact snapshots.
+
+Builds ``--count`` snapshots from the local poll fixture, varying the values that change between real
+polls (temperature, uptime, timer), and reports the memory retained by each representation with
+``tracemalloc``, and separately (without tracing overhead) the time to parse them from raw bytes.
+
+Usage::
+
+    python benchmarks/bench_snapshot_memory.py --count 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from intellifire4py.model import IntelliFirePollData
+from intellifire4py.snapshot import IntelliFireSnapshot
+
+FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "local_poll.json"
+
+
+def _payloads(count: int) -> list[bytes]:
+    """Return `count` distinct poll bodies."""
+    base = json.loads(FIXTURE.read_bytes())
+    payloads = []
+    for i in range(count):
+        base.update(
+            temperature=15 + i % 10, remote_uptime=3362 + i, timeremaining=i % 600
+        )
+        payloads.append(json.dumps(base).encode())
+    return payloads
+
+
+def _measure(label: str, parse: Callable[[bytes], Any], payloads: list[bytes]) -> None:
+    """Parse every payload, keep the results and report retained memory and parse time."""
+    start = time.perf_counter()
+    for payload in payloads:
+        parse(payload)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    history = [parse(payload) for payload in payloads]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(
+        f"{label:>20}: {retained / 1024:9.1f} KiB total, "
+        f"{retained / len(history):7.1f} B/snapshot, "
+        f"{elapsed / len(history) * 1e6:6.2f} us/parse"
+    )
+
+
+def main(count: int) -> None:
+    """Compare both representations."""
+    payloads = _payloads(count)
+    print(f"{count} snapshots")
+    _measure("IntelliFirePollData", IntelliFirePollData.from_json, payloads)
+    _measure("IntelliFireSnapshot", IntelliFireSnapshot.from_json, payloads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000)
+    main(parser.parse_args().count)
@@ -0,0 +1,90 @@
+"""Benchmark bytes per sample and query speed of the compressed telemetry store.
+
+Writes ``--days`` of simulated 15 second polls - a fireplace used in the evenings, with a slowly
+drifting temperature, a little jitter on the poll timestamps and a noisy connection quality - and
+reports the file size per sample against uncompressed 8 byte columns, then times a full scan and a
+one hour range query.
+
+Usage::
+
+    python benchmarks/bench_telemetry_store.py --days 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+from intellifire4py.history import HISTORY_FIELDS
+from intellifire4py.telemetry_store import IntelliFireTelemetryStore
+
+POLL_SECONDS = 15
+
+
+def _write(path: Path, samples: int, seed: int) -> float:
+    """Write simulated samples and return the first timestamp."""
+    rng = random.Random(seed)  # noqa: S311
+    start = time.time() - samples * POLL_SECONDS
+    temperature = 18
+    with IntelliFireTelemetryStore(path) as store:
+        for i in range(samples):
+            timestamp = start + i * POLL_SECONDS + rng.random() * 0.05
+            hour = (i * POLL_SECONDS // 3600) % 24
+            on = 18 <= hour < 22
+            if rng.random() < 0.01:
+                temperature += 1 if on else -1
+                temperature = max(15, min(temperature, 28))
+            quality = 995000 + rng.randrange(0, 1000, 100) if i % 20 == 0 else 995000
+            store.append(
+                timestamp,
+                [
+                    temperature,
+                    3 if on else 0,
+                    2 if on else 0,
+                    3 if on else 0,
+                    0,
+                    0,
+                    quality,
+                    0,
+                ],
+            )
+    return start
+
+
+def main(days: int) -> None:
+    """Write, measure and query a store."""
+    samples = days * 86400 // POLL_SECONDS
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.ifts"
+        start = _write(path, samples, seed=0)
+        size = path.stat().st_size
+        raw = samples * 8 * (len(HISTORY_FIELDS) + 1)
+        print(f"{samples} samples over {days} days")
+        print(
+            f"  file: {size / 1024:8.1f} KiB, {size / samples:5.2f} B/sample "
+            f"(uncompressed {raw / samples:.0f} B/sample, {raw / size:.0f}x)"
+        )
+
+        with IntelliFireTelemetryStore(path) as store:
+            middle = start + samples * POLL_SECONDS / 2
+            for label, query in (
+                ("full scan", lambda: store.query()),
+                ("full scan, 1 field", lambda: store.query(["temperature_c"])),
+                ("1 hour range", lambda: store.query(start=middle, end=middle + 3600)),
+            ):
+                seconds = min(timeit.repeat(query, number=3, repeat=3)) / 3
+                rows = len(query()["timestamp"])
+                print(
+                    f"  {label:>18}: {seconds * 1000:8.2f} ms for {rows} rows "
+                    f"({seconds / rows * 1e6:.2f} us/row)"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=30)
+    main(parser.parse_args().days)
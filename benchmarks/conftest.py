@@ -0,0 +1,229 @@
+"""Timing fixture, stored baselines and comparison output for the benchmark suite.
+
+The suite lives next to the standalone ``bench_*.py`` scripts and is not part of the regular test run::
+
+    pytest benchmarks                                  # compare against benchmarks/baseline.json
+    pytest benchmarks --bench-save benchmarks/baseline.json
+    pytest benchmarks --bench-max-regression 0.25      # fail if a median got 25% slower
+
+Every test measures one hot path through the ``benchmark`` fixture. At the end of the run the median,
+minimum and spread of each are printed beside the baseline median and the relative change. Baselines
+are machine specific; regenerate the stored one on the machine you compare on.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+_RESULTS = pytest.StashKey[dict[str, "BenchmarkResult"]]()
+_REPORT = pytest.StashKey[list[str]]()
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing of one benchmark, in seconds per iteration."""
+
+    rounds: int
+    iterations: int
+    median: float
+    min: float
+    mean: float
+    stdev: float
+
+    @classmethod
+    def from_samples(cls, samples: list[float], iterations: int) -> BenchmarkResult:
+        """Summarize the per-iteration times of each round."""
+        return cls(
+            rounds=len(samples),
+            iterations=iterations,
+            median=statistics.median(samples),
+            min=min(samples),
+            mean=statistics.fmean(samples),
+            stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        )
+
+
+class Benchmark:
+    """Time a callable over several rounds, after a warmup, and keep the result for the report."""
+
+    def __init__(
+        self, name: str, results: dict[str, BenchmarkResult], rounds: int | None
+    ) -> None:
+        """Record under `name` into `results`, running `rounds` rounds if set."""
+        self.name = name
+        self._results = results
+        self._rounds = rounds
+
+    def __call__(
+        self,
+        function: Callable[..., Any],
+        *args: Any,
+        rounds: int = 20,
+        iterations: int = 1,
+        warmup: int = 1,
+    ) -> Any:
+        """Time `function(*args)`, called `iterations` times per round, and return its last result."""
+        result = None
+        for _ in range(warmup * iterations):
+            result = function(*args)
+        samples = []
+        for _ in range(self.rounds(rounds)):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = function(*args)
+            samples.append((time.perf_counter() - start) / iterations)
+        self.record(samples, iterations)
+        return result
+
+    async def run(
+        self,
+        function: Callable[..., Awaitable[Any]],
+        *args: Any,
+        rounds: int = 20,
+        iterations: int = 1,
+        warmup: int = 1,
+    ) -> Any:
+        """Time an awaited coroutine function, like :meth:`__call__`."""
+        result = None
+        for _ in range(warmup * iterations):
+            result = await function(*args)
+        samples = []
+        for _ in range(self.rounds(rounds)):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = await function(*args)
+            samples.append((time.perf_counter() - start) / iterations)
+        self.record(samples, iterations)
+        return result
+
+    def rounds(self, default: int) -> int:
+        """Return the rounds to run, `default` unless overridden with `--bench-rounds`."""
+        return self._rounds or default
+
+    def record(self, samples: list[float], iterations: int = 1) -> None:
+        """Keep samples timed by the test itself, e.g. when each round needs its own setup."""
+        self._results[self.name] = BenchmarkResult.from_samples(samples, iterations)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the baseline and regression options."""
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--bench-save",
+        metavar="PATH",
+        help="Write the results to PATH as a new baseline",
+    )
+    group.addoption(
+        "--bench-compare",
+        metavar="PATH",
+        default=str(BASELINE),
+        help="Baseline to compare against (default: benchmarks/baseline.json)",
+    )
+    group.addoption(
+        "--bench-max-regression",
+        type=float,
+        metavar="FRACTION",
+        help="Fail the run if a median is slower than its baseline by more than FRACTION",
+    )
+    group.addoption(
+        "--bench-rounds",
+        type=int,
+        metavar="N",
+        help="Override the number of rounds of every benchmark",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Prepare the result store."""
+    config.stash[_RESULTS] = {}
+    config.stash[_REPORT] = []
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest) -> Benchmark:
+    """Return a timer recording under the test's name."""
+    return Benchmark(
+        request.node.name,
+        request.config.stash[_RESULTS],
+        request.config.getoption("--bench-rounds"),
+    )
+
+
+def _format(seconds: float) -> str:
+    """Format a duration with a readable unit."""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit:<2}"
+    return f"{seconds / 1e-9:8.0f} ns"
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Save and compare the results, failing the run on a regression if asked to."""
+    config = session.config
+    results = config.stash[_RESULTS]
+    if not results:
+        return
+
+    save = config.getoption("--bench-save")
+    if save:
+        Path(save).write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "benchmarks": {
+                        name: asdict(result) for name, result in sorted(results.items())
+                    },
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+
+    compare = Path(config.getoption("--bench-compare"))
+    baseline = json.loads(compare.read_text())["benchmarks"] if compare.exists() else {}
+    limit = config.getoption("--bench-max-regression")
+    width = max(len(name) for name in results)
+    report = config.stash[_REPORT]
+    report.append(
+        f"{'benchmark':<{width}}  {'median':>11}  {'min':>11}  {'stdev':>11}"
+        f"  {'baseline':>11}  change"
+    )
+    regressed = []
+    for name, result in sorted(results.items()):
+        line = (
+            f"{name:<{width}}  {_format(result.median)}  {_format(result.min)}"
+            f"  {_format(result.stdev)}"
+        )
+        if name in baseline:
+            change = result.median / baseline[name]["median"] - 1
+            line += f"  {_format(baseline[name]['median'])}  {change:+7.1%}"
+            if limit is not None and change > limit:
+                line += "  REGRESSED"
+                regressed.append(name)
+        report.append(line)
+    if regressed and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+        report.append(
+            f"{len(regressed)} benchmark(s) regressed by more than {limit:.0%}"
+        )
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    """Print the comparison table."""
+    report = config.stash[_REPORT]
+    if report:
+        terminalreporter.section("benchmarks")
+        for line in report:
+            terminalreporter.write_line(line)
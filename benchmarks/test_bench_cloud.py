@@ -0,0 +1,58 @@
+"""Benchmark cloud long poll latency against the in-process iftapi.net simulator."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from intellifire4py import IntelliFireAPICloud
+from intellifire4py.long_poll import IntelliFireLongPollEngine
+from intellifire4py.model import IntelliFirePollData, IntelliFireUserData
+from intellifire4py.testing import IntelliFireCloudSimulator
+
+
+@pytest.mark.asyncio
+async def test_long_poll_rearm(benchmark):
+    """Time from a status change to the engine's callback, made right after the previous one.
+
+    The change lands before the engine has re-armed, so each sample covers delivering the previous
+    update, issuing the next `applongpoll` and returning the queued change.
+    """
+    async with IntelliFireCloudSimulator(time_scale=0.05) as cloud:
+        account = cloud.add_account()
+        fireplace = cloud.add_fireplace(account)
+        cookies = IntelliFireUserData(
+            user_id=account.user_id,
+            auth_cookie=account.auth_cookie,
+            web_client_id=account.web_client_id,
+        )
+        api = IntelliFireAPICloud(
+            serial=fireplace.serial,
+            use_http=True,
+            cookie_jar=cookies.cookie_jar,
+            session=cloud.session(),
+        )
+        updated = asyncio.Event()
+
+        def on_update(data: IntelliFirePollData) -> None:
+            updated.set()
+
+        engine = IntelliFireLongPollEngine(api, on_update=on_update)
+        task = asyncio.create_task(engine.run())
+        await updated.wait()
+
+        samples = []
+        for temperature in range(benchmark.rounds(50)):
+            updated.clear()
+            start = time.perf_counter()
+            fireplace.update(temperature=temperature)
+            await updated.wait()
+            samples.append(time.perf_counter() - start)
+        benchmark.record(samples)
+
+        engine.stop()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert engine.changes >= len(samples)
@@ -0,0 +1,38 @@
+"""Benchmark local polls and commands against the in-process fireplace simulator."""
+
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from intellifire4py.const import IntelliFireCommand
+from intellifire4py.testing.local_simulator import IntelliFireLocalSimulator
+
+
+@pytest.mark.asyncio
+async def test_local_poll(benchmark):
+    """Poll one simulated fireplace over HTTP, parsing and applying the payload."""
+    async with IntelliFireLocalSimulator(seed=0) as simulator:
+        fireplace = await simulator.add_fireplace()
+        async with fireplace.api() as api:
+            await benchmark.run(api.poll, rounds=50)
+        assert fireplace.stats["poll"] >= 50
+
+
+@pytest.mark.asyncio
+async def test_local_send_command(benchmark):
+    """Send a signed command: take a (usually prefetched) challenge, sign and post it."""
+    async with IntelliFireLocalSimulator(seed=0) as simulator:
+        fireplace = await simulator.add_fireplace()
+        values = itertools.cycle((0, 1))
+        async with fireplace.api() as api:
+            await api.poll()
+
+            async def toggle() -> None:
+                await api.send_command(
+                    command=IntelliFireCommand.LIGHT, value=next(values)
+                )
+
+            await benchmark.run(toggle, rounds=30)
+        assert fireplace.stats["post_204"] >= 30
@@ -0,0 +1,81 @@
+"""Benchmark poll parsing, error code decoding and command signing."""
+
+from __future__ import annotations
+
+import timeit
+from pathlib import Path
+
+from intellifire4py import IntelliFireAPILocal
+from intellifire4py.const import IntelliFireErrorCode
+from intellifire4py.model import IntelliFirePollData
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+LOCAL_POLL = (FIXTURES / "local_poll.json").read_bytes()
+CLOUD_POLL = (FIXTURES / "cloud_poll.json").read_bytes()
+ERROR_POLL = (FIXTURES / "error_6_642.json").read_bytes()
+ERROR_PROPERTIES = [
+    name
+    for name in dir(IntelliFirePollData)
+    if name.startswith("error_")
+    and isinstance(getattr(IntelliFirePollData, name), property)
+]
+
+
+def test_parse_local_poll(benchmark):
+    """Validate a local `/poll` payload."""
+    data = benchmark(
+        IntelliFirePollData.model_validate_json, LOCAL_POLL, iterations=500
+    )
+    assert data.serial
+
+
+def test_parse_cloud_poll(benchmark):
+    """Validate a cloud `apppoll` payload, with string values and remote_* keys."""
+    data = benchmark(
+        IntelliFirePollData.model_validate_json, CLOUD_POLL, iterations=500
+    )
+    assert data.brand == "H&G"
+
+
+def test_error_properties(benchmark):
+    """Read every `error_*` property plus `has_errors` of a poll with errors."""
+    data = IntelliFirePollData.model_validate_json(ERROR_POLL)
+
+    def read_errors() -> int:
+        return (
+            sum(bool(getattr(data, name)) for name in ERROR_PROPERTIES)
+            + data.has_errors
+        )
+
+    assert benchmark(read_errors, iterations=500) > 1
+
+
+def test_error_properties_beat_list_scan():
+    """The bitmask properties are faster than rebuilding the error code list on every access."""
+    data = IntelliFirePollData.model_validate_json(ERROR_POLL)
+    codes = list(IntelliFireErrorCode)
+    names = [f"error_{code.name.lower()}" for code in codes]
+
+    def properties() -> list[bool]:
+        return [getattr(data, name) for name in names] + [data.has_errors]
+
+    def list_scan() -> list[bool]:
+        # The previous implementation: one list of enum lookups per property
+        return [
+            code in [IntelliFireErrorCode(value) for value in data.errors]
+            for code in codes
+        ] + [len(data.errors) > 0]
+
+    assert properties() == list_scan()
+    property_time = min(timeit.repeat(properties, number=500, repeat=5))
+    list_scan_time = min(timeit.repeat(list_scan, number=500, repeat=5))
+    assert property_time < list_scan_time
+
+
+def test_construct_payload(benchmark):
+    """Sign a local command with a fresh challenge."""
+    api = IntelliFireAPILocal(
+        fireplace_ip="127.0.0.1", user_id="user", api_key="ab" * 16
+    )
+    payload = benchmark(api._construct_payload, "power", 1, "CD" * 16, iterations=2000)
+    assert "response=" in payload
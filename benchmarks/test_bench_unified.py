@@ -0,0 +1,90 @@
+"""Benchmark UnifiedFireplace construction and read mode switching against both simulators."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+
+import pytest
+
+from intellifire4py import UnifiedFireplace
+from intellifire4py.const import IntelliFireApiMode
+from intellifire4py.model import IntelliFireCommonFireplaceData, IntelliFireUserData
+from intellifire4py.testing import (
+    IntelliFireCloudAccount,
+    IntelliFireCloudSimulator,
+    IntelliFireLocalSimulator,
+)
+
+
+async def _user_data(
+    local: IntelliFireLocalSimulator,
+    cloud: IntelliFireCloudSimulator,
+    account: IntelliFireCloudAccount,
+    fireplaces: int,
+) -> IntelliFireUserData:
+    """Register fireplaces served by both simulators and return the data a login would produce."""
+    common = []
+    for _ in range(fireplaces):
+        fireplace = cloud.add_fireplace(account, await local.add_fireplace())
+        common.append(
+            IntelliFireCommonFireplaceData(
+                ip_address=fireplace.address,
+                api_key=fireplace.api_key,
+                serial=fireplace.serial,
+                user_id=account.user_id,
+                auth_cookie=account.auth_cookie,
+                web_client_id=account.web_client_id,
+            )
+        )
+    return IntelliFireUserData(
+        user_id=account.user_id,
+        auth_cookie=account.auth_cookie,
+        web_client_id=account.web_client_id,
+        fireplaces=common,
+    )
+
+
+@pytest.mark.asyncio
+async def test_switch_read_mode(benchmark):
+    """Switch between local and cloud reads, carrying the data across, without background polling."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFireCloudSimulator() as cloud,
+    ):
+        user_data = await _user_data(local, cloud, cloud.add_account(), 1)
+        (fireplace,) = await UnifiedFireplace.build_fireplaces_from_user_data(
+            user_data, use_http=True, polling_enabled=False, session=cloud.session()
+        )
+        modes = itertools.cycle((IntelliFireApiMode.CLOUD, IntelliFireApiMode.LOCAL))
+
+        async def switch() -> None:
+            await fireplace._switch_read_mode(next(modes))
+
+        await benchmark.run(switch, iterations=100)
+        await fireplace.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fireplaces", [1, 100, 1000])
+async def test_build_fireplaces_from_user_data(benchmark, fireplaces):
+    """Build fireplaces from user data, validating local and cloud connectivity of each."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFireCloudSimulator() as cloud,
+    ):
+        user_data = await _user_data(local, cloud, cloud.add_account(), fireplaces)
+        session = cloud.session()
+        samples = []
+        for _ in range(benchmark.rounds(3 if fireplaces > 100 else 10)):
+            start = time.perf_counter()
+            built = await UnifiedFireplace.build_fireplaces_from_user_data(
+                user_data, use_http=True, polling_enabled=False, session=session
+            )
+            samples.append(time.perf_counter() - start)
+            await asyncio.gather(*(fireplace.close() for fireplace in built))
+        benchmark.record(samples)
+        assert all(
+            fireplace.read_mode == IntelliFireApiMode.LOCAL for fireplace in built
+        )
@@ -7,23 +7,41 @@ from .const import IntelliFireErrorCode  # noqa: F401
 
 
 # noqa: F401
+from .history import IntelliFireHistory  # noqa: F401
 from .local_api import IntelliFireAPILocal  # noqa: F401
 from .model import IntelliFireFireplaceCloud  # noqa: F401
 from .model import IntelliFireFireplaces  # noqa: F401
 from .model import IntelliFireLocationDetails  # noqa: F401
 from .model import IntelliFireLocations  # noqa: F401
+from .poll_scheduler import IntelliFirePollScheduler  # noqa: F401
+from .polling import IntelliFirePollBudget  # noqa: F401
+from .polling import IntelliFirePollingPolicy  # noqa: F401
+from .recorder import IntelliFireTrafficRecorder  # noqa: F401
+from .snapshot import IntelliFireSnapshot  # noqa: F401
+from .sqlite_sink import IntelliFireSQLiteSink  # noqa: F401
+from .telemetry_store import IntelliFireTelemetryStore  # noqa: F401
 from .unified_fireplace import UnifiedFireplace  # noqa: F401
+from .fleet import FireplaceFleet  # noqa: F401
 from .udp import UDPFireplaceFinder  # noqa: F401
 
 
 __all__ = [
+    "FireplaceFleet",
     "IntelliFireAPICloud",
     "IntelliFireErrorCode",
     "IntelliFireAPILocal",
+    "IntelliFireHistory",
     "IntelliFireFireplaceCloud",
     "IntelliFireFireplaces",
     "IntelliFireLocationDetails",
     "IntelliFireLocations",
+    "IntelliFirePollBudget",
+    "IntelliFirePollScheduler",
+    "IntelliFirePollingPolicy",
+    "IntelliFireSnapshot",
+    "IntelliFireTrafficRecorder",
+    "IntelliFireSQLiteSink",
+    "IntelliFireTelemetryStore",
     "UDPFireplaceFinder",
     "UnifiedFireplace",
 ]
@@ -4,18 +4,20 @@ from __future__ import annotations
 import time
 import asyncio
 from datetime import datetime, timezone
+from json import JSONDecodeError
 
 from asyncio import Task
+from collections.abc import Iterable
 from typing import Any
-import json
 import aiohttp
 from aiohttp import CookieJar, ClientSession, ClientTimeout
+from pydantic import ValidationError
 
 from .exceptions import CloudError
 from .model import (
     IntelliFireUserData,
 )
-from .model import IntelliFirePollData
+from .model import IntelliFireCommandResult, IntelliFirePollData
 
 from .const import IntelliFireCommand, IntelliFireApiMode, IntelliFireCloudPollType
 
@@ -23,7 +25,12 @@ from .control import IntelliFireController
 from .read import IntelliFireDataProvider
 from .utils import _range_check, _convert_aiohttp_response_to_curl
 import logging
-from .const import USER_AGENT
+from .const import (
+    USER_AGENT,
+    CLOUD_LONG_POLL_QUEUE_SECONDS,
+    CLOUD_LONG_POLL_DROP_SECONDS,
+)
+from .long_poll import IntelliFireLongPollEngine
 
 
 class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
@@ -39,6 +46,7 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
         use_http: bool = False,
         verify_ssl: bool = True,
         cookie_jar: CookieJar | None = None,
+        session: ClientSession | None = None,
     ):
         """Initialize the class with specific configuration for fireplace communication.
 
@@ -60,6 +68,13 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
             cookie_jar (CookieJar): A `Cookies` object containing authentication or session cookies required for
                           communicating with the fireplace. This is essential for maintaining a secure and
                           authenticated session.
+            session (ClientSession, optional): An externally owned `aiohttp.ClientSession` shared with other
+                          fireplaces so that keep-alive connections and TLS sessions are reused. Cookies and the
+                          user agent are sent per request in that case. Create it with
+                          `cookie_jar=aiohttp.DummyCookieJar()` if it serves more than one account, or
+                          cookies set by one account's responses are sent with the others'. The caller
+                          remains responsible for closing it. If omitted a long-lived session is created on
+                          first use and released by :func:`close`.
 
         Note:
             Modifying `use_http` and `verify_ssl` from their default values should be done with caution, as
@@ -72,6 +87,8 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
         self._log = logging.getLogger(__name__)
 
         self._cookie_jar = cookie_jar
+        self._session = session
+        self._owns_session = session is None
 
         if use_http:
             self.prefix = "http"  # pragma: no cover
@@ -81,6 +98,7 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
         self._is_polling_in_background = False
         self._should_poll_in_background = False
         self._bg_task: Task[Any] | None = None
+        self._command_tasks: dict[IntelliFireCommand, tuple[int, Task[None]]] = {}
 
         # Data is organized by Fireplace Serial Number
         self._data: IntelliFirePollData = IntelliFirePollData()
@@ -88,14 +106,55 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
         # Full data set on the user
         self._user_data: IntelliFireUserData = IntelliFireUserData()
 
-    def _get_session(self, timeout_seconds: float = 10.0) -> ClientSession:
-        """Ensure that the aiohttp ClientSession is created and open."""
-        timeout = ClientTimeout(timeout_seconds)
-        return aiohttp.ClientSession(
-            timeout=timeout,
-            headers={"user-agent": USER_AGENT},
-            cookie_jar=self._cookie_jar,
-        )
+        # Long poll queue position (Etag) and the monotonic time the queue was last read
+        self._etag: str | None = None
+        self._last_sync: float | None = None
+        self._long_poll_engine = IntelliFireLongPollEngine(self)
+
+    async def __aenter__(self) -> IntelliFireAPICloud:
+        """Asynchronous context manager entry."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type | None,
+        exc_val: Exception | None,
+        exc_tb: object | None,
+    ) -> None:
+        """Asynchronous context manager exit."""
+        await self.close()
+
+    def _get_session(self) -> ClientSession:
+        """Ensure that the long-lived aiohttp ClientSession is created and open."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={"user-agent": USER_AGENT},
+                cookie_jar=self._cookie_jar,
+            )
+            self._owns_session = True
+        return self._session
+
+    def _request_kwargs(self, timeout_seconds: float = 10.0) -> dict[str, Any]:
+        """Build the per-request arguments for a call to iftapi.net.
+
+        A shared session carries neither this fireplace's cookies nor the library user agent,
+        so they are attached to each request instead.
+        """
+        kwargs: dict[str, Any] = {"timeout": ClientTimeout(total=timeout_seconds)}
+        if not self._owns_session:
+            kwargs["headers"] = {"user-agent": USER_AGENT}
+            if self._cookie_jar is not None:
+                kwargs["cookies"] = {
+                    morsel.key: morsel.value for morsel in self._cookie_jar
+                }
+        return kwargs
+
+    async def close(self) -> None:
+        """Stop background polling and close the session if it is owned by this instance."""
+        await self.stop_background_polling()
+        self.unschedule_polling()
+        if self._owns_session and self._session and not self._session.closed:
+            await self._session.close()
 
     def get_data(self) -> IntelliFirePollData:
         """Return data to the user."""
@@ -105,6 +164,28 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
             self._log.warning("Returning uninitialized poll data")  # pragma: no cover
         return self._data
 
+    @property
+    def is_long_poll_synced(self) -> bool:
+        """Return whether a position in the server side update queue is known."""
+        return self._last_sync is not None
+
+    def reset_long_poll_queue(self) -> None:
+        """Forget the long poll queue position so the next cycle starts with a full poll."""
+        self._etag = None
+        self._last_sync = None
+
+    @property
+    def long_poll_window_exceeded(self) -> bool:
+        """Return whether the server side update queue may have dropped updates since the last sync.
+
+        iftapi.net only keeps status updates queued for `30` seconds, so a long poll issued later
+        than that after the previous response must be preceded by a full `apppoll`.
+        """
+        return (
+            self._last_sync is not None
+            and time.monotonic() - self._last_sync > CLOUD_LONG_POLL_QUEUE_SECONDS
+        )
+
     @property
     def is_polling_in_background(self) -> bool:
         """Return whether api is polling."""
@@ -122,7 +203,39 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
             )
             return
 
-        await self._send_cloud_command(command=command, value=value)
+        await self._send_superseding(
+            command=command, value=value, send=self._send_cloud_command
+        )
+
+    async def send_commands(
+        self, commands: Iterable[tuple[IntelliFireCommand, int]]
+    ) -> list[IntelliFireCommandResult]:
+        """Send several commands in order over the long-lived session and report the outcome of each.
+
+        Args:
+            commands (Iterable[tuple[IntelliFireCommand, int]]): `(command, value)` pairs, sent in order.
+
+        Returns:
+            list[IntelliFireCommandResult]: One result per command, in the same order.
+        """
+        batch = list(commands)
+        if not self._cookie_jar:
+            for command, value in batch:
+                _range_check(command, value)
+            self._log.warning(
+                "Unable to send %d commands without authentication cookies.",
+                len(batch),
+            )
+            return [
+                IntelliFireCommandResult(
+                    command=command,
+                    value=value,
+                    success=False,
+                    error="authentication cookies are required",
+                )
+                for command, value in batch
+            ]
+        return await super().send_commands(batch)
 
     async def _send_cloud_command(
         self,
@@ -133,9 +246,9 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
         url = f"{self.prefix}://iftapi.net/a/{self._serial}//apppost"
         content = f"{command.value['cloud_command']}={value}".encode()
 
-        async with self._get_session().post(url, data=content) as response:
-            self._log.info(f">> Created Session {response}")
-
+        async with self._get_session().post(
+            url, data=content, **self._request_kwargs()
+        ) as response:
             curl_command = await _convert_aiohttp_response_to_curl(response)
             self._log.debug(f"Generated curl command: {curl_command}")
             response.raise_for_status()
@@ -150,6 +263,7 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
             """
             if response.status == 204:
                 self._last_send = datetime.now(timezone.utc)
+                self._poll_soon()
                 return
             # elif (
             #     response.status == 403
@@ -181,8 +295,9 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
         limit is nominally `60` seconds. After `57` seconds, the server will send a `408` response, and after `61` seconds,
         the mobile app should assume that the connection has been dropped.
 
-        Args:
-            fireplace (IntelliFireFireplace | None, optional): _description_. Defaults to None.
+        The Etag of each response is tracked and echoed back in `If-None-Match`. A full :func:`poll` resets the
+        queue position, and is issued automatically first when more than `30` seconds have passed since the
+        previous response (see :attr:`long_poll_window_exceeded`). A dropped connection clears the queue position.
 
         Raises:
             ApiCallError: Issue with the API call, either bad credentials or a bad serial number
@@ -191,50 +306,75 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
             bool: `True` if status changed, `False` if it did not
         """
 
+        if self.long_poll_window_exceeded:
+            # Updates may have expired from the server queue - resync with a full poll
+            self._log.debug("long_poll() queue window exceeded - resyncing via apppoll")
+            await self.poll()
+
         long_poll_url = f"{self.prefix}://iftapi.net/a/{self._serial}/applongpoll"
-        self._log.debug(f"long_poll() {long_poll_url}")
+        self._log.debug(f"long_poll() {long_poll_url} [etag={self._etag}]")
+
+        session = self._get_session()
+        kwargs = self._request_kwargs(timeout_seconds=CLOUD_LONG_POLL_DROP_SECONDS)
+        if self._etag is not None:
+            kwargs["headers"] = {
+                **kwargs.get("headers", {}),
+                "If-None-Match": self._etag,
+            }
+        try:
+            response = await session.get(long_poll_url, **kwargs)
 
-        async with self._get_session() as session:
-            try:
-                response = await session.get(long_poll_url, timeout=ClientTimeout(61))
-
-                self._log.debug("Long Poll Status Code %d", response.status)
-                if response.status == 200:
-                    self._log.debug("Long poll: 200 - Received data")
-
-                    # Data has text/html header type so we need to manually convert it to json
-                    json_data = json.loads(await response.text())
-
-                    self._data = IntelliFirePollData(**json_data)
-                    self._log.debug(f"poll() complete: {self._data}")
-
-                    self._last_poll = datetime.now(timezone.utc)
-                    return True
-                elif response.status == 408:
-                    self._log.debug("Long poll: 408 - No Data changed")
-                    self._last_poll = datetime.now(timezone.utc)
-                    return False
-            except aiohttp.ClientResponseError as e:
-                if e.status == 403:
-                    raise CloudError("Not authorized") from e
-                if e.status == 404:
-                    raise CloudError("Fireplace not found (bad serial number)") from e
-                else:
-                    response_text = ""
-                    # Only try to get response text if response exists
-                    e_response = getattr(e, "response", None)
-                    if e_response is not None:
-                        try:
-                            response_text = await e_response.text()
-                        except Exception:
-                            response_text = "<no body>"
-                    self._log.error(
-                        f"Unexpected status code: {getattr(e, 'status', '?')}, Response: {response_text}"
-                    )
-                    raise CloudError(
-                        f"Unexpected status code: {getattr(e, 'status', '?')}"
-                    ) from e
-        return False
+            self._log.debug("Long Poll Status Code %d", response.status)
+            if response.status == 200:
+                self._log.debug("Long poll: 200 - Received data")
+
+                # Data has text/html header type so we need to manually convert it to json
+                changes = self._apply_poll_payload(await response.read())
+                self._log.debug(f"long_poll() complete: {changes or 'unchanged'}")
+
+                self._etag = response.headers.get("Etag", self._etag)
+                self._last_sync = time.monotonic()
+                self._last_poll = datetime.now(timezone.utc)
+                return True
+            elif response.status == 408:
+                self._log.debug("Long poll: 408 - No Data changed")
+                self._etag = response.headers.get("Etag", self._etag)
+                response.release()
+                self._last_sync = time.monotonic()
+                self._last_poll = datetime.now(timezone.utc)
+                return False
+            # Any other status is an error - raising it lets the engine back off instead of re-arming
+            response.raise_for_status()
+            response.release()
+            raise CloudError(f"Unexpected status code: {response.status}")
+        except (TimeoutError, aiohttp.ClientConnectionError):
+            # The connection dropped - the queue position can no longer be trusted
+            self.reset_long_poll_queue()
+            raise
+        except aiohttp.ClientResponseError as e:
+            if e.status == 403:
+                raise CloudError("Not authorized") from e
+            if e.status == 404:
+                raise CloudError("Fireplace not found (bad serial number)") from e
+            else:
+                response_text = ""
+                # Only try to get response text if response exists
+                e_response = getattr(e, "response", None)
+                if e_response is not None:
+                    try:
+                        response_text = await e_response.text()
+                    except Exception:
+                        response_text = "<no body>"
+                self._log.error(
+                    f"Unexpected status code: {getattr(e, 'status', '?')}, Response: {response_text}"
+                )
+                raise CloudError(
+                    f"Unexpected status code: {getattr(e, 'status', '?')}"
+                ) from e
+
+    async def _scheduled_poll(self) -> None:
+        """Perform one poll on behalf of :attr:`poll_scheduler`."""
+        await self.poll()
 
     async def poll(self, timeout_seconds: float = 10.0) -> None:
         """Return a fireplace’s status in JSON.
@@ -283,29 +423,39 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
             403: Not Authorized
             404: Bad Serial Number - Fireplace not found
 
+        A payload that is not valid JSON raises `JSONDecodeError`, one that does not describe valid poll
+        data raises `ValidationError`.
+
         """
 
         poll_url = f"{self.prefix}://iftapi.net/a/{self._serial}//apppoll"
 
         self._log.debug(f"poll() {poll_url}")
-        async with self._get_session() as session:
-            try:
-                response = await session.get(poll_url)
-                response.raise_for_status()  # Handle 4xx/5xx responses here
-                json_data = await response.json()
-                self._data = IntelliFirePollData(**json_data)
-                self._log.debug(f"poll() complete: {self._data}")
-
-                self._last_poll = datetime.now(timezone.utc)
-
-            except aiohttp.ClientResponseError as e:
-                if e.status == 403:
-                    self._log.debug("Not authorized")
-                if e.status == 404:
-                    self._log.debug("Fireplace not found (bad serial number)")
-
-                # Reraise the exception
-                raise e
+        session = self._get_session()
+        try:
+            response = await session.get(
+                poll_url, **self._request_kwargs(timeout_seconds=timeout_seconds)
+            )
+            response.raise_for_status()  # Handle 4xx/5xx responses here
+            changes = self._apply_poll_payload(await response.read())
+            self._log.debug(f"poll() complete: {changes or 'unchanged'}")
+
+            # A full poll restarts the long poll queue from the current status
+            self._etag = None
+            self._last_sync = time.monotonic()
+            self._last_poll = datetime.now(timezone.utc)
+
+        except aiohttp.ClientResponseError as e:
+            if e.status == 403:
+                self._log.debug("Not authorized")
+            if e.status == 404:
+                self._log.debug("Fireplace not found (bad serial number)")
+
+            # Reraise the exception
+            raise e
+        except (JSONDecodeError, ValidationError) as e:
+            self._log.warning("Invalid poll data from %s: %s", poll_url, e)
+            raise e
 
     async def start_background_polling(self, minimum_wait_in_seconds: int = 10) -> None:
         """Start an ensure-future background polling loop."""
@@ -325,41 +475,49 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
     async def stop_background_polling(self) -> bool:
         """Stop background polling - return whether it had been polling."""
         self._should_poll_in_background = False
+        self._long_poll_engine.stop()
         was_running = False
         if self._bg_task:
             if not self._bg_task.cancelled():
                 was_running = True
                 self._bg_task.cancel()
                 self._log.info("Stopping background task to issue a command")
+                # Wait for the task to finish so close() never closes the session under it
+                await asyncio.wait({self._bg_task})
         return was_running
 
     async def __background_poll(self, minimum_wait_in_seconds: int = 15) -> None:
-        """Start a looping cloud background longpoll task."""
+        """Start a looping cloud background longpoll task.
+
+        In `LONG` mode the :class:`IntelliFireLongPollEngine` re-arms each long poll immediately and
+        `minimum_wait_in_seconds` is ignored. In `SHORT` mode `apppoll` is issued with
+        `minimum_wait_in_seconds` as the base interval of the :attr:`polling_policy`.
+        """
         self._log.debug("__background_poll:: Function Called")
         self._is_polling_in_background = True
+        if self._poll_mode == IntelliFireCloudPollType.LONG:
+            try:
+                await self._long_poll_engine.run()
+            finally:
+                self._is_polling_in_background = False
+            return
+        failed_attempts = 0
         while self._should_poll_in_background:
             start = time.time()
             self._log.debug("__background_poll:: Loop start time %f", start)
 
             try:
-                if self._poll_mode == IntelliFireCloudPollType.LONG:
-                    await self.long_poll()
-                else:
-                    await self.poll()
-
-                #
-                # #     has_new_data = await self.long_poll()
-                # #
-                # #     if new_data:
-                # #         self._log.debug(self.data)
-                # #
-                # # Long poll didn't seem to be working so switched to normal polling again
-                #
-                # await self.poll()
+                await self.poll()
+                failed_attempts = 0
 
                 end = time.time()
                 duration: float = end - start
-                sleep_time: float = minimum_wait_in_seconds - duration
+                sleep_time: float = (
+                    self.polling_policy.next_interval(
+                        self._data, base_interval=minimum_wait_in_seconds
+                    )
+                    - duration
+                )
                 self._log.debug(
                     "__background_poll:: [%f] Sleeping for [%fs]",
                     duration,
@@ -371,9 +529,17 @@ class IntelliFireAPICloud(IntelliFireController, IntelliFireDataProvider):
                     end,
                     (end - start),
                 )
-                await asyncio.sleep(minimum_wait_in_seconds - (end - start))
+                await self._sleep_until_next_poll(sleep_time)
             except Exception as ex:
+                failed_attempts += 1
                 self._log.error(ex)
+                await self._sleep_until_next_poll(
+                    self.polling_policy.next_interval(
+                        self._data,
+                        base_interval=minimum_wait_in_seconds,
+                        failed_attempts=failed_attempts,
+                    )
+                )
         self._is_polling_in_background = False
         self._log.info("__background_poll:: Background polling disabled.")
 
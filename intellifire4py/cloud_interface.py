@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import inspect
 import logging
+from typing import Any
 
 import aiohttp
 
@@ -41,23 +42,38 @@ class IntelliFireCloudInterface:
     _cloud_fireplaces: dict[str, IntelliFireAPICloud] = {}
     _is_logged_in = False
 
-    def __init__(self, use_http: bool = False, verify_ssl: bool = True):
+    def __init__(
+        self,
+        use_http: bool = False,
+        verify_ssl: bool = True,
+        session: ClientSession | None = None,
+    ):
         """Initializes the IntelliFireCloudInterface with optional HTTP settings.
 
         Args:
             use_http (bool, optional): If True, use HTTP instead of HTTPS. Default is False.
             verify_ssl (bool, optional): If True, enable SSL certificate verification. Default is True.
+            session (ClientSession, optional): An externally owned `aiohttp.ClientSession` to use for all
+                requests and to hand to the cloud APIs this interface creates. It is not closed on exit.
+                Cookies are sent per request, so one session can serve several accounts if it is created
+                with `cookie_jar=aiohttp.DummyCookieJar()`; a regular jar would store one account's
+                cookies and send them with another account's requests.
         """
 
         self._use_http = use_http
         self._verify_ssl = verify_ssl
+        # Per instance, so interfaces logged into different accounts do not share fireplaces
+        self._user_data = IntelliFireUserData()
+        self._cloud_fireplaces = {}
+        self._is_logged_in = False
 
         if use_http:
             self.prefix = "http"  # pragma: no cover
         else:
             self.prefix = "https"
 
-        self._session: ClientSession | None = None
+        self._session: ClientSession | None = session
+        self._owns_session = session is None
         self._in_context = False
 
     async def __aenter__(self) -> IntelliFireCloudInterface:
@@ -82,12 +98,46 @@ class IntelliFireCloudInterface:
             self._session = ClientSession(
                 headers={"user-agent": USER_AGENT},
             )
+            self._owns_session = True
 
     async def close_session(self) -> None:
-        """Close the aiohttp ClientSession."""
-        if self._session and not self._session.closed:
+        """Close the aiohttp ClientSession if it is owned by this interface."""
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
 
+    def _request_kwargs(self) -> dict[str, Any]:
+        """Build the per-request arguments for an enumeration call to iftapi.net.
+
+        An injected session carries neither this account's cookies nor the library user agent, so they
+        are attached to each request instead.
+        """
+        if self._owns_session:
+            return {}
+        return {
+            "headers": {"user-agent": USER_AGENT},
+            "cookies": {
+                "user": self._user_data.user_id,
+                "auth_cookie": self._user_data.auth_cookie,
+                "web_client_id": self._user_data.web_client_id,
+            },
+        }
+
+    def _create_cloud_api(
+        self, serial: str, cookie_jar: aiohttp.CookieJar
+    ) -> IntelliFireAPICloud:
+        """Create a cloud API for a fireplace.
+
+        An injected session is shared with the API. A session owned by this interface is not, since it
+        closes with the interface while the API may live on; the API then creates its own.
+        """
+        return IntelliFireAPICloud(
+            serial=serial,
+            use_http=self._use_http,
+            verify_ssl=self._verify_ssl,
+            cookie_jar=cookie_jar,
+            session=None if self._owns_session else self._session,
+        )
+
     # async def login_with_cookie_vars(
     #     self, *, user_id: str, auth_cookie: str, web_client_id: str
     # ) -> None:
@@ -188,7 +238,9 @@ class IntelliFireCloudInterface:
             raise RuntimeError("Session is not initialized")
         try:
             async with self._session.post(
-                f"{self.prefix}://iftapi.net/a/login", data=data
+                f"{self.prefix}://iftapi.net/a/login",
+                data=data,
+                headers=None if self._owns_session else {"user-agent": USER_AGENT},
             ) as response:
                 if response.status != 204:
                     raise LoginError()
@@ -253,15 +305,15 @@ class IntelliFireCloudInterface:
 
             for fireplace in fireplaces.fireplaces:
                 # Construct a Cloud Fireplace so that we can poll it to construct a common fireplace
-                cloud_fireplace = IntelliFireAPICloud(
-                    serial=fireplace.serial,
-                    use_http=self._use_http,
-                    verify_ssl=self._verify_ssl,
-                    cookie_jar=self.user_data.cookie_jar,
+                cloud_fireplace = self._create_cloud_api(
+                    fireplace.serial, self.user_data.cookie_jar
                 )
 
                 # Poll the fireplace
-                await cloud_fireplace.poll()
+                try:
+                    await cloud_fireplace.poll()
+                finally:
+                    await cloud_fireplace.close()
 
                 # Construct a Common Fireplace
                 common_fireplace = IntelliFireCommonFireplaceData(
@@ -299,7 +351,8 @@ class IntelliFireCloudInterface:
 
         try:
             async with self._session.get(  # type: ignore
-                url=f"{self.prefix}://iftapi.net/a/enumlocations"
+                url=f"{self.prefix}://iftapi.net/a/enumlocations",
+                **self._request_kwargs(),
             ) as response:
                 response.raise_for_status()  # Raises an HTTPError for 4xx/5xx responses
                 json_data = await response.json()
@@ -327,7 +380,8 @@ class IntelliFireCloudInterface:
 
         try:
             async with self._session.get(  # type: ignore
-                url=f"{self.prefix}://iftapi.net/a/enumfireplaces?location_id={location_id}"
+                url=f"{self.prefix}://iftapi.net/a/enumfireplaces?location_id={location_id}",
+                **self._request_kwargs(),
             ) as response:
                 response.raise_for_status()  # Raises an HTTPError for 4xx/5xx responses
                 json_data = await response.json()
@@ -348,12 +402,7 @@ class IntelliFireCloudInterface:
             list[IntelliFireFireplaceCloud]: A list of IntelliFireFireplace instances representing each fireplace.
         """
         cloud_fireplaces = [
-            IntelliFireAPICloud(
-                serial=common_fireplace.serial,
-                cookie_jar=common_fireplace.cookie_jar,
-                use_http=self.use_http,
-                verify_ssl=self.verify_ssl,
-            )
+            self._create_cloud_api(common_fireplace.serial, common_fireplace.cookie_jar)
             for common_fireplace in self._user_data.fireplaces
         ]
 
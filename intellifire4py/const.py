@@ -10,6 +10,18 @@ import importlib.metadata
 PACKAGE_VERSION = importlib.metadata.version("intellifire4py")
 USER_AGENT = f"intellifire4py/{PACKAGE_VERSION}"
 
+# iftapi.net keeps fireplace status updates queued for this long; a long poll issued
+# later than this after the previous response may have missed updates.
+CLOUD_LONG_POLL_QUEUE_SECONDS = 30
+# The server answers an unchanged long poll with a 408 after 57 seconds; a request still
+# outstanding after 61 seconds should be treated as a dropped connection.
+CLOUD_LONG_POLL_SERVER_TIMEOUT_SECONDS = 57
+CLOUD_LONG_POLL_DROP_SECONDS = 61
+
+# A local /get_challenge response is valid for roughly 10 seconds - only sign commands with a
+# challenge younger than this to leave room for the /post round trip.
+LOCAL_CHALLENGE_MAX_AGE_SECONDS = 7
+
 
 class IntelliFireApiMode(Enum):
     """API Operation Mode (Local or Cloud)."""
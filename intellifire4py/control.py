@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+from collections.abc import Callable, Coroutine, Iterable
 from datetime import datetime
+from typing import Any
 
 from .const import IntelliFireCommand, IntelliFireApiMode
 from abc import ABC, abstractmethod
 
-from .model import IntelliFirePollData
+from .model import IntelliFireCommandResult, IntelliFirePollData
+from .utils import _range_check
 
 
 class IntelliFireController(ABC):
@@ -15,9 +20,13 @@ class IntelliFireController(ABC):
 
     def __init__(self, control_mode: IntelliFireApiMode):  # pragma: no cover
         """Initialize the controller knowing whether its local or cloud based."""
+        self._log = logging.getLogger(__name__)
         self._control_mode = control_mode
         self._data = IntelliFirePollData()
         self._last_send: datetime | None = None
+        self._command_tasks: dict[
+            IntelliFireCommand, tuple[int, asyncio.Task[None]]
+        ] = {}
 
     async def flame_on(self) -> None:
         """Turn on the flame."""
@@ -130,6 +139,105 @@ class IntelliFireController(ABC):
         """Issue a beep command (Cloud Only)."""
         await self.send_command(command=IntelliFireCommand.BEEP, value=1)
 
+    async def send_commands(
+        self, commands: Iterable[tuple[IntelliFireCommand, int]]
+    ) -> list[IntelliFireCommandResult]:
+        """Send several commands in order and report the outcome of each.
+
+        Example:
+
+            .. code:: Python
+
+                results = await ift_control.send_commands(
+                    [
+                        (IntelliFireCommand.POWER, 1),
+                        (IntelliFireCommand.FLAME_HEIGHT, 3),
+                        (IntelliFireCommand.FAN_SPEED, 2),
+                        (IntelliFireCommand.LIGHT, 1),
+                    ]
+                )
+
+        Args:
+            commands (Iterable[tuple[IntelliFireCommand, int]]): `(command, value)` pairs, sent in order.
+
+        Returns:
+            list[IntelliFireCommandResult]: One result per command, in the same order.
+
+        Raises:
+            InputRangError: If any value is out of range - nothing is sent in that case.
+        """
+        batch = list(commands)
+        for command, value in batch:
+            _range_check(command, value)
+
+        results: list[IntelliFireCommandResult] = []
+        for command, value in batch:
+            try:
+                await self.send_command(command=command, value=value)
+            except Exception as ex:
+                results.append(
+                    IntelliFireCommandResult(
+                        command=command, value=value, success=False, error=str(ex)
+                    )
+                )
+            else:
+                results.append(
+                    IntelliFireCommandResult(command=command, value=value, success=True)
+                )
+        return results
+
+    async def _send_superseding(
+        self,
+        *,
+        command: IntelliFireCommand,
+        value: int,
+        send: Callable[..., Coroutine[Any, Any, None]],
+    ) -> None:
+        """Send a command so that only the latest value of each :class:`IntelliFireCommand` is delivered.
+
+        While a send of the same command is pending or retrying, a call with the same value joins it and a
+        call with a different value cancels it - the superseded caller then returns without an error. This
+        collapses bursts (e.g. a UI slider driving :func:`set_flame_height`) to the final value.
+
+        Args:
+            command (IntelliFireCommand): The command being sent.
+            value (int): The value to send.
+            send (Callable): Coroutine function performing the actual send, called with `command` and `value`.
+        """
+        current = self._command_tasks.get(command)
+        if current is not None and not current[1].done():
+            current_value, current_task = current
+            if current_value == value:
+                try:
+                    await asyncio.shield(current_task)
+                except asyncio.CancelledError:
+                    # The joined send was superseded - return quietly like its own caller does
+                    caller = asyncio.current_task()
+                    if caller is not None and caller.cancelling() > 0:
+                        raise
+                    self._log.debug("Command [%s=%s] superseded", command.name, value)
+                return
+            current_task.cancel()
+
+        task = asyncio.create_task(
+            send(command=command, value=value), name=f"send_{command.name}"
+        )
+        self._command_tasks[command] = (value, task)
+        try:
+            await task
+        except asyncio.CancelledError:
+            latest = self._command_tasks.get(command)
+            caller = asyncio.current_task()
+            caller_cancelled = caller is not None and caller.cancelling() > 0
+            if (latest is None or latest[1] is not task) and not caller_cancelled:
+                self._log.debug("Command [%s=%s] superseded", command.name, value)
+                return
+            raise
+        finally:
+            latest = self._command_tasks.get(command)
+            if latest is not None and latest[1] is task:
+                del self._command_tasks[command]
+
     @abstractmethod
     async def send_command(
         self,
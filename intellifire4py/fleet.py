@@ -0,0 +1,736 @@
+"""Manage many fireplaces through one shared session, one polling loop and one registry."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import logging
+import time
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+)
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import NamedTuple, TypeVar
+
+from aiohttp import ClientSession, DummyCookieJar, TCPConnector
+
+from .const import IntelliFireApiMode, IntelliFireCommand
+from .local_api import IntelliFireAPILocal
+from .model import IntelliFireCommandResult, IntelliFireUserData
+from .poll_scheduler import IntelliFirePollScheduler
+from .polling import IntelliFirePollBudget
+from .snapshot import IntelliFireSnapshot
+from .unified_fireplace import UnifiedFireplace
+
+_T = TypeVar("_T")
+
+
+class IntelliFireFleetHealth(NamedTuple):
+    """Aggregate state of every fireplace in a :class:`FireplaceFleet`."""
+
+    total: int
+    #: Fireplaces that have been polled successfully at least once
+    polled: int
+    #: Fireplaces whose last poll failed
+    failing: int
+    #: Fireplaces not polled successfully within three of their current poll intervals, including never
+    stale: int
+    on: int
+    with_errors: int
+    local: int
+    cloud: int
+
+
+class IntelliFireFleetPollResult(NamedTuple):
+    """Outcome of one poll yielded by :func:`poll_all`."""
+
+    #: Serial of a `UnifiedFireplace`, or the IP address of an `IntelliFireAPILocal`
+    serial: str
+    #: Snapshot of the polled data, or the exception the poll raised
+    result: IntelliFireSnapshot | Exception
+    #: Seconds the poll took, not counting time spent waiting for a free slot
+    latency: float
+
+
+@dataclass(slots=True)
+class _LatencyEstimate:
+    """Smoothed latency of one device."""
+
+    latency: float
+    deviation: float
+    backoff: int = 1
+
+
+class IntelliFireLatencyTracker:
+    """Derive a poll timeout per device from the latency it has shown so far.
+
+    Like TCP's retransmission timer (RFC 6298), it keeps a smoothed latency and mean deviation per
+    device and allows `latency + deviations * deviation`, within `min_timeout_seconds` and
+    `max_timeout_seconds`. A unit that usually answers in 100 ms is then given up on after about a
+    second instead of holding a slot for the full timeout. Devices not yet heard from get
+    `initial_timeout_seconds`, and each timeout doubles the next one until a poll succeeds.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_timeout_seconds: float = 10.0,
+        min_timeout_seconds: float = 1.0,
+        max_timeout_seconds: float = 10.0,
+        deviations: float = 4.0,
+    ) -> None:
+        """Initialize without any observations.
+
+        Args:
+            initial_timeout_seconds (float, optional): Timeout of a device without observations. Defaults to `10`.
+            min_timeout_seconds (float, optional): Shortest timeout derived. Defaults to `1`.
+            max_timeout_seconds (float, optional): Longest timeout derived. Defaults to `10`.
+            deviations (float, optional): Mean deviations allowed above the smoothed latency. Defaults to `4`.
+
+        Raises:
+            ValueError: If `min_timeout_seconds` is not positive or exceeds `max_timeout_seconds`.
+        """
+        if not 0 < min_timeout_seconds <= max_timeout_seconds:
+            raise ValueError(
+                "min_timeout_seconds must be positive and at most max_timeout_seconds"
+            )
+        self.initial_timeout_seconds = initial_timeout_seconds
+        self.min_timeout_seconds = min_timeout_seconds
+        self.max_timeout_seconds = max_timeout_seconds
+        self.deviations = deviations
+        self._estimates: dict[Hashable, _LatencyEstimate] = {}
+
+    def __len__(self) -> int:
+        """Return the number of devices with observations."""
+        return len(self._estimates)
+
+    def record(self, key: Hashable, seconds: float) -> None:
+        """Record the latency of a successful poll."""
+        estimate = self._estimates.get(key)
+        if estimate is None:
+            self._estimates[key] = _LatencyEstimate(seconds, seconds / 2)
+            return
+        estimate.deviation += (abs(estimate.latency - seconds) - estimate.deviation) / 4
+        estimate.latency += (seconds - estimate.latency) / 8
+        estimate.backoff = 1
+
+    def record_timeout(self, key: Hashable) -> None:
+        """Record a poll that timed out, doubling the device's next timeout."""
+        estimate = self._estimates.get(key)
+        if estimate is not None:
+            estimate.backoff = min(estimate.backoff * 2, 64)
+
+    def forget(self, key: Hashable) -> None:
+        """Drop the observations of a device."""
+        self._estimates.pop(key, None)
+
+    def latency(self, key: Hashable) -> float | None:
+        """Return the smoothed latency of a device, if it has been observed."""
+        estimate = self._estimates.get(key)
+        return None if estimate is None else estimate.latency
+
+    def timeout(self, key: Hashable) -> float:
+        """Return the timeout for the next poll of a device."""
+        estimate = self._estimates.get(key)
+        if estimate is None:
+            return self.initial_timeout_seconds
+        timeout = max(
+            estimate.latency + self.deviations * estimate.deviation,
+            self.min_timeout_seconds,
+        )
+        return min(timeout * estimate.backoff, self.max_timeout_seconds)
+
+
+def _poll_key(target: UnifiedFireplace | IntelliFireAPILocal) -> str:
+    """Return the key results and latencies of a poll target are kept under."""
+    if isinstance(target, UnifiedFireplace):
+        return target.serial
+    return target.fireplace_ip
+
+
+async def _timed_poll(
+    target: UnifiedFireplace | IntelliFireAPILocal,
+    key: str,
+    latency: IntelliFireLatencyTracker,
+) -> tuple[Exception | None, float]:
+    """Poll once within the derived timeout, returning any exception and the time taken."""
+    timeout = latency.timeout(key)
+    start = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout):
+            if isinstance(target, UnifiedFireplace):
+                await target.perform_poll(timeout_seconds=timeout)
+            else:
+                await target.poll(timeout_seconds=timeout)
+    except TimeoutError as ex:
+        latency.record_timeout(key)
+        return ex, time.perf_counter() - start
+    except Exception as ex:
+        return ex, time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+    latency.record(key, elapsed)
+    return None, elapsed
+
+
+async def _poll_target(
+    target: UnifiedFireplace | IntelliFireAPILocal,
+    latency: IntelliFireLatencyTracker,
+    semaphore: asyncio.Semaphore | None,
+) -> IntelliFireFleetPollResult:
+    """Poll one target in a free slot and snapshot its data."""
+    key = _poll_key(target)
+    async with semaphore or contextlib.nullcontext():
+        error, elapsed = await _timed_poll(target, key, latency)
+    result = error or IntelliFireSnapshot.from_poll_data(target.data)
+    return IntelliFireFleetPollResult(key, result, elapsed)
+
+
+async def poll_all(
+    targets: Iterable[UnifiedFireplace | IntelliFireAPILocal],
+    *,
+    max_concurrency: int = 64,
+    latency: IntelliFireLatencyTracker | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+) -> AsyncIterator[IntelliFireFleetPollResult]:
+    """Poll many fireplaces and yield each result as soon as it is in.
+
+    At most `max_concurrency` polls run at once, new ones starting as others finish, so one slow unit
+    holds back only its own result. Each poll's timeout comes from `latency`; pass the same tracker
+    to successive calls so the timeouts learn. Polls still running when the caller stops iterating
+    are cancelled.
+
+    Example:
+
+        .. code:: Python
+
+            async for serial, result, latency in poll_all(fireplaces, max_concurrency=32):
+                if isinstance(result, Exception):
+                    ...
+
+    Args:
+        targets (Iterable[UnifiedFireplace | IntelliFireAPILocal]): Fireplaces to poll, each through its
+            current read API, or local APIs. Consumed lazily.
+        max_concurrency (int, optional): Polls in flight at once. Defaults to `64`.
+        latency (IntelliFireLatencyTracker, optional): Source of per device timeouts. Defaults to a new
+            tracker, i.e. the initial timeout for every poll.
+        semaphore (asyncio.Semaphore, optional): Slot to hold per poll, to share a limit with other work.
+
+    Yields:
+        IntelliFireFleetPollResult: `(serial, snapshot or exception, latency)` in completion order.
+
+    Raises:
+        ValueError: If `max_concurrency` is not positive.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    tracker = latency if latency is not None else IntelliFireLatencyTracker()
+    remaining = iter(targets)
+    pending: set[asyncio.Task[IntelliFireFleetPollResult]] = set()
+
+    def fill() -> None:
+        for target in itertools.islice(remaining, max_concurrency - len(pending)):
+            pending.add(asyncio.create_task(_poll_target(target, tracker, semaphore)))
+
+    try:
+        fill()
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            fill()
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+class FireplaceFleet:
+    """Registry of many :class:`UnifiedFireplace` objects sharing one session and one polling loop.
+
+    A fireplace built on its own creates a session per API and, once polling, a background task per
+    API. The fleet instead builds every fireplace with polling disabled on a single shared session,
+    polls them all from one :class:`IntelliFirePollScheduler`, caps polls and bulk operations together
+    at `max_concurrency` requests in flight and, if `history_capacity` is set, keeps that many samples
+    of telemetry history per fireplace. With `max_polls_per_second` set, an :class:`IntelliFirePollBudget`
+    spreads that rate over the fleet, favouring fireplaces whose state is changing, and the scheduler
+    never exceeds it.
+
+    Example:
+
+        .. code:: Python
+
+            async with FireplaceFleet(max_concurrency=32) as fleet:
+                await fleet.add_user_data(user_data)
+                await fleet.start_polling()
+                ...
+                print(fleet.health())
+                await fleet.send_commands([(IntelliFireCommand.POWER, 0)])
+    """
+
+    def __init__(
+        self,
+        *,
+        session: ClientSession | None = None,
+        max_concurrency: int = 64,
+        poll_interval_seconds: float = 15.0,
+        poll_timeout_seconds: float = 10.0,
+        jitter: float = 0.1,
+        max_polls_per_second: float | None = None,
+        history_capacity: int | None = None,
+        use_http: bool = False,
+        verify_ssl: bool = True,
+    ) -> None:
+        """Initialize an empty fleet.
+
+        Args:
+            session (ClientSession, optional): An externally owned session shared by every fireplace; the
+                caller remains responsible for closing it. Cookies are sent per request, so create it with
+                `cookie_jar=aiohttp.DummyCookieJar()` when the fleet spans several accounts. When omitted
+                the fleet creates one, with no cookie jar and a connector allowing `max_concurrency`
+                connections, released by :func:`close`.
+            max_concurrency (int, optional): Requests in flight at once across all bulk operations and
+                polls. Defaults to `64`.
+            poll_interval_seconds (float, optional): Base interval of each fireplace's polling policy.
+                Defaults to `15`.
+            poll_timeout_seconds (float, optional): Timeout of a poll to a fireplace not yet heard from,
+                and the longest timeout ever used; the :attr:`latency` tracker shortens it for units that
+                answer quickly. Defaults to `10`.
+            jitter (float, optional): Fraction by which poll delays are randomly spread. Defaults to `0.1`.
+            max_polls_per_second (float, optional): Fleet wide poll rate shared out by an
+                :class:`IntelliFirePollBudget` in place of each fireplace's polling policy. Defaults to
+                no budget.
+            history_capacity (int | None, optional): Samples of telemetry history kept per API of each
+                fireplace, e.g. `240` for one hour at a 15 second interval. Defaults to `None`, keeping none.
+            use_http (bool, optional): Use HTTP instead of HTTPS for the cloud. Defaults to `False`.
+            verify_ssl (bool, optional): Verify cloud SSL certificates. Defaults to `True`.
+
+        Raises:
+            ValueError: If `max_concurrency` is not positive.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._log = logging.getLogger(__name__)
+        self._session = session
+        self._owns_session = session is None
+        self.max_concurrency = max_concurrency
+        self.poll_interval_seconds = poll_interval_seconds
+        self.poll_timeout_seconds = poll_timeout_seconds
+        self.history_capacity = history_capacity
+        self._use_http = use_http
+        self._verify_ssl = verify_ssl
+        self.scheduler = IntelliFirePollScheduler(
+            max_concurrency=max_concurrency,
+            jitter=jitter,
+            max_polls_per_second=max_polls_per_second,
+        )
+        self.budget = (
+            IntelliFirePollBudget(max_polls_per_second)
+            if max_polls_per_second
+            else None
+        )
+        self._by_serial: dict[str, UnifiedFireplace] = {}
+        self._by_ip: dict[str, UnifiedFireplace] = {}
+        #: Last exception raised while building or polling a fireplace, by serial
+        self.errors: dict[str, Exception] = {}
+        self.latency = IntelliFireLatencyTracker(
+            initial_timeout_seconds=poll_timeout_seconds,
+            min_timeout_seconds=min(1.0, poll_timeout_seconds),
+            max_timeout_seconds=poll_timeout_seconds,
+        )
+
+    async def __aenter__(self) -> FireplaceFleet:
+        """Asynchronous context manager entry."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type | None,
+        exc_val: Exception | None,
+        exc_tb: object | None,
+    ) -> None:
+        """Asynchronous context manager exit."""
+        await self.close()
+
+    @property
+    def session(self) -> ClientSession:
+        """Return the session shared by every fireplace, creating the fleet's own on first use."""
+        if self._session is None or self._session.closed:
+            # Cookies go with each request; a shared jar would mix up the cookies of different accounts
+            self._session = ClientSession(
+                connector=TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300),
+                cookie_jar=DummyCookieJar(),
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self) -> None:
+        """Stop polling, close every fireplace and release the session if the fleet created it."""
+        await self.stop_polling()
+        await asyncio.gather(*(fireplace.close() for fireplace in self))
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    # Registry
+
+    def __len__(self) -> int:
+        """Return the number of fireplaces."""
+        return len(self._by_serial)
+
+    def __iter__(self) -> Iterator[UnifiedFireplace]:
+        """Iterate over the fireplaces."""
+        return iter(list(self._by_serial.values()))
+
+    def __contains__(self, serial: object) -> bool:
+        """Return whether a fireplace with this serial is registered."""
+        return serial in self._by_serial
+
+    def get(self, serial: str) -> UnifiedFireplace | None:
+        """Return the fireplace with this serial, if registered."""
+        return self._by_serial.get(serial)
+
+    def by_ip(self, ip_address: str) -> UnifiedFireplace | None:
+        """Return the fireplace at this IP address, if registered."""
+        return self._by_ip.get(ip_address)
+
+    def add(self, fireplace: UnifiedFireplace) -> None:
+        """Register an already built fireplace, replacing any with the same serial.
+
+        Its background polling should be disabled; the fleet polls it from :func:`start_polling`.
+        """
+        old = self._by_serial.get(fireplace.serial)
+        if old is not None and self._by_ip.get(old.ip_address) is old:
+            del self._by_ip[old.ip_address]
+        if fireplace.is_polling_enabled:
+            self._log.warning(
+                "Fireplace %s has its own background polling enabled", fireplace.serial
+            )
+        self._apply_history_capacity(fireplace)
+        self._by_serial[fireplace.serial] = fireplace
+        if fireplace.ip_address in self._by_ip:
+            self._log.warning(
+                "Fireplaces %s and %s share IP address %s",
+                self._by_ip[fireplace.ip_address].serial,
+                fireplace.serial,
+                fireplace.ip_address,
+            )
+        self._by_ip[fireplace.ip_address] = fireplace
+        self.scheduler.add(
+            fireplace.serial,
+            lambda: self._poll_one(fireplace),
+            lambda failed_attempts: self._poll_interval(fireplace, failed_attempts),
+            first_interval=(
+                self.poll_interval_seconds
+                if fireplace.read_api.last_poll_utc is None
+                else None
+            ),
+        )
+
+    async def remove(self, serial: str) -> None:
+        """Unregister and close the fireplace with this serial, if registered."""
+        fireplace = self._by_serial.pop(serial, None)
+        self.errors.pop(serial, None)
+        self.scheduler.remove(serial)
+        self.latency.forget(serial)
+        if self.budget is not None:
+            self.budget.remove(serial)
+        if fireplace is None:
+            return
+        if self._by_ip.get(fireplace.ip_address) is fireplace:
+            del self._by_ip[fireplace.ip_address]
+        await fireplace.close()
+
+    def _apply_history_capacity(self, fireplace: UnifiedFireplace) -> None:
+        """Give each API of the fireplace a history of :attr:`history_capacity` samples, or none."""
+        if self.history_capacity is None:
+            fireplace._local_api.history = None
+            fireplace._cloud_api.history = None
+        else:
+            fireplace.enable_history(self.history_capacity)
+
+    async def add_user_data(
+        self,
+        user_data: IntelliFireUserData,
+        desired_read_mode: IntelliFireApiMode = IntelliFireApiMode.LOCAL,
+        desired_control_mode: IntelliFireApiMode = IntelliFireApiMode.LOCAL,
+    ) -> list[UnifiedFireplace]:
+        """Build and register every fireplace of a cloud account.
+
+        Each fireplace goes through :func:`UnifiedFireplace.build_fireplaces_from_user_data` on the shared
+        session with polling disabled, at most `max_concurrency` at a time. A fireplace that cannot
+        be reached is left out and its exception kept in :attr:`errors` instead of failing the rest.
+
+        Args:
+            user_data (IntelliFireUserData): Data of a logged in cloud account.
+            desired_read_mode (IntelliFireApiMode, optional): Preferred read mode. Defaults to LOCAL.
+            desired_control_mode (IntelliFireApiMode, optional): Preferred control mode. Defaults to LOCAL.
+
+        Returns:
+            list[UnifiedFireplace]: The fireplaces added.
+        """
+
+        async def build(serial: str) -> UnifiedFireplace:
+            single = user_data.model_copy(
+                update={
+                    "fireplaces": [
+                        fp for fp in user_data.fireplaces if fp.serial == serial
+                    ]
+                }
+            )
+            (fireplace,) = await UnifiedFireplace.build_fireplaces_from_user_data(
+                single,
+                desired_read_mode=desired_read_mode,
+                desired_control_mode=desired_control_mode,
+                use_http=self._use_http,
+                verify_ssl=self._verify_ssl,
+                polling_enabled=False,
+                session=self.session,
+            )
+            return fireplace
+
+        results = await self._bounded({fp.serial: build for fp in user_data.fireplaces})
+        added = []
+        for serial, result in results.items():
+            if isinstance(result, Exception):
+                self._log.warning("Unable to add fireplace %s: %s", serial, result)
+                self.errors[serial] = result
+            else:
+                self.errors.pop(serial, None)
+                self.add(result)
+                added.append(result)
+        return added
+
+    # Bulk operations
+
+    async def _bounded(
+        self, actions: dict[str, Callable[[str], Awaitable[_T]]]
+    ) -> dict[str, _T | Exception]:
+        """Run `actions[serial](serial)` for every serial, at most `max_concurrency` at once."""
+
+        async def guarded(
+            serial: str, action: Callable[[str], Awaitable[_T]]
+        ) -> _T | Exception:
+            async with self.scheduler.semaphore:
+                try:
+                    return await action(serial)
+                except Exception as ex:
+                    return ex
+
+        results = await asyncio.gather(
+            *(guarded(serial, action) for serial, action in actions.items())
+        )
+        return dict(zip(actions, results, strict=True))
+
+    async def run(
+        self,
+        action: Callable[[UnifiedFireplace], Awaitable[_T]],
+        serials: Iterable[str] | None = None,
+    ) -> dict[str, _T | Exception]:
+        """Await `action(fireplace)` for many fireplaces, at most `max_concurrency` at once.
+
+        Example:
+
+            .. code:: Python
+
+                results = await fleet.run(lambda fireplace: fireplace.set_read_mode(IntelliFireApiMode.CLOUD))
+
+        Args:
+            action (Callable[[UnifiedFireplace], Awaitable]): Operation on one fireplace.
+            serials (Iterable[str], optional): Fireplaces to run it on. Defaults to all of them; unknown
+                serials are skipped.
+
+        Returns:
+            dict[str, Any]: The result of each fireplace by serial, or the exception it raised.
+        """
+        fireplaces = self._select(serials)
+        return await self._bounded(
+            {serial: lambda s: action(fireplaces[s]) for serial in fireplaces}
+        )
+
+    def _select(self, serials: Iterable[str] | None) -> dict[str, UnifiedFireplace]:
+        """Return the registered fireplaces among `serials`, or all of them."""
+        if serials is None:
+            return dict(self._by_serial)
+        return {
+            serial: self._by_serial[serial]
+            for serial in serials
+            if serial in self._by_serial
+        }
+
+    async def poll_all(
+        self, serials: Iterable[str] | None = None
+    ) -> AsyncIterator[IntelliFireFleetPollResult]:
+        """Poll many fireplaces and yield each result as soon as it is in.
+
+        Polls share the scheduler's concurrency limit and :attr:`latency` timeouts; see :func:`poll_all`.
+
+        Example:
+
+            .. code:: Python
+
+                async for serial, result, latency in fleet.poll_all():
+                    if isinstance(result, Exception):
+                        ...
+
+        Args:
+            serials (Iterable[str], optional): Fireplaces to poll. Defaults to all of them.
+
+        Yields:
+            IntelliFireFleetPollResult: `(serial, snapshot or exception, latency)` in completion order.
+        """
+        fireplaces = self._select(serials).values()
+        async for result in poll_all(
+            fireplaces,
+            max_concurrency=self.max_concurrency,
+            latency=self.latency,
+            semaphore=self.scheduler.semaphore,
+        ):
+            self._note_poll(result.serial, result.result)
+            yield result
+
+    async def poll(
+        self, serials: Iterable[str] | None = None
+    ) -> dict[str, Exception | None]:
+        """Poll many fireplaces through their current read API and wait for all of them.
+
+        Args:
+            serials (Iterable[str], optional): Fireplaces to poll. Defaults to all of them.
+
+        Returns:
+            dict[str, Exception | None]: `None` for each successful poll, otherwise the exception.
+        """
+        return {
+            result.serial: result.result
+            if isinstance(result.result, Exception)
+            else None
+            async for result in self.poll_all(serials)
+        }
+
+    async def _poll_one(self, fireplace: UnifiedFireplace) -> None:
+        """Poll one fireplace for the scheduler, raising on failure."""
+        error, _ = await _timed_poll(fireplace, fireplace.serial, self.latency)
+        self._note_poll(fireplace.serial, error)
+        if error is not None:
+            raise error
+
+    def _note_poll(self, serial: str, result: object) -> None:
+        """Keep a failed poll's exception in :attr:`errors`, or clear it after a success."""
+        if isinstance(result, Exception):
+            self._log.debug("Poll of %s failed: %s", serial, result)
+            self.errors[serial] = result
+        else:
+            self.errors.pop(serial, None)
+
+    async def send_commands(
+        self,
+        commands: Iterable[tuple[IntelliFireCommand, int]],
+        serials: Iterable[str] | None = None,
+    ) -> dict[str, list[IntelliFireCommandResult] | Exception]:
+        """Send the same batch of commands to many fireplaces through their current control API.
+
+        Args:
+            commands (Iterable[tuple[IntelliFireCommand, int]]): `(command, value)` pairs, sent in order.
+            serials (Iterable[str], optional): Fireplaces to command. Defaults to all of them.
+
+        Returns:
+            dict[str, list[IntelliFireCommandResult] | Exception]: The results of each fireplace by
+            serial, or the exception raised, e.g. for an out of range value.
+        """
+        batch = list(commands)
+        results = await self.run(
+            lambda fireplace: fireplace.send_commands(batch), serials
+        )
+        for serial, result in results.items():
+            if not isinstance(result, Exception):
+                self.scheduler.poll_soon(serial)
+        return results
+
+    # Polling
+
+    @property
+    def is_polling(self) -> bool:
+        """Return whether the fleet is polling."""
+        return self.scheduler.is_running
+
+    async def start_polling(self) -> None:
+        """Poll every fireplace from the shared scheduler, at the pace of its read API's polling policy.
+
+        Successful commands sent through :func:`send_commands` bring that fireplace's next poll forward.
+        """
+        await self.scheduler.start()
+
+    async def stop_polling(self) -> None:
+        """Stop polling."""
+        await self.scheduler.stop()
+
+    def _poll_interval(
+        self, fireplace: UnifiedFireplace, failed_attempts: int = 0
+    ) -> float:
+        """Return the delay before the next poll of a fireplace, updating its share of the budget."""
+        read_api = fireplace.read_api
+        policy = read_api.polling_policy
+        # _data rather than data, which warns about every fireplace not polled yet
+        if self.budget is not None:
+            return self.budget.update(
+                fireplace.serial,
+                read_api._data,
+                failed_attempts,
+                recently_commanded=policy.recently_commanded,
+            )
+        return policy.next_interval(
+            read_api._data, self.poll_interval_seconds, failed_attempts
+        )
+
+    def _current_interval(self, fireplace: UnifiedFireplace) -> float:
+        """Return the delay currently expected between polls of a fireplace.
+
+        Unlike :func:`_poll_interval` this only reads the budget, so checking on the fleet never changes
+        how it is polled. A fireplace without a share yet is expected at the base interval.
+        """
+        if self.budget is not None:
+            if fireplace.serial in self.budget:
+                return self.budget.interval(fireplace.serial)
+            return self.poll_interval_seconds
+        read_api = fireplace.read_api
+        return read_api.polling_policy.next_interval(
+            read_api._data, self.poll_interval_seconds
+        )
+
+    # Health
+
+    def health(self) -> IntelliFireFleetHealth:
+        """Summarize the state of every fireplace."""
+        now = datetime.now(timezone.utc)
+        polled = stale = on = with_errors = local = 0
+        for fireplace in self._by_serial.values():
+            last_poll = fireplace.read_api.last_poll_utc
+            if last_poll is not None:
+                polled += 1
+            if last_poll is None or (
+                now - last_poll
+            ).total_seconds() > 3 * self._current_interval(fireplace):
+                stale += 1
+            data = fireplace.read_api._data
+            on += data.is_on
+            with_errors += data.has_errors
+            local += fireplace.read_mode == IntelliFireApiMode.LOCAL
+        total = len(self._by_serial)
+        return IntelliFireFleetHealth(
+            total=total,
+            polled=polled,
+            failing=sum(serial in self._by_serial for serial in self.errors),
+            stale=stale,
+            on=on,
+            with_errors=with_errors,
+            local=local,
+            cloud=total - local,
+        )
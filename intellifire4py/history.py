@@ -0,0 +1,175 @@
+"""Fixed size in-memory history of numeric telemetry."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from .model import IntelliFirePollData
+
+# Numeric IntelliFirePollData fields recorded by IntelliFireHistory
+HISTORY_FIELDS: tuple[str, ...] = (
+    "temperature_c",
+    "flameheight",
+    "fanspeed",
+    "light_level",
+    "timeremaining_s",
+    "ecm_latency",
+    "connection_quality",
+    "error_mask",
+)
+
+
+class IntelliFireHistoryBucket(NamedTuple):
+    """Aggregate of one field over a downsampling bucket."""
+
+    start: float
+    samples: int
+    min: int
+    max: int
+    mean: float
+
+
+class IntelliFireHistory:
+    """Ring buffer of timestamped numeric telemetry for one fireplace.
+
+    Each field is stored in its own preallocated `array`, so memory is fixed at roughly
+    `capacity * 8 * (len(fields) + 1)` bytes no matter how long the fireplace is polled; once full,
+    the oldest sample is overwritten. Timestamps are seconds since the epoch and kept in order,
+    which lets range queries bisect instead of scanning.
+
+    Example:
+
+        .. code:: Python
+
+            hourly = fireplace.history.downsample("temperature_c", bucket_seconds=3600)
+    """
+
+    def __init__(
+        self, capacity: int = 2880, fields: Iterable[str] = HISTORY_FIELDS
+    ) -> None:
+        """Preallocate the buffers.
+
+        Args:
+            capacity (int): Number of samples kept. Defaults to 2880, 12 hours at the default 15
+                second poll interval.
+            fields (Iterable[str]): Fields to record. Defaults to :data:`HISTORY_FIELDS`.
+
+        Raises:
+            ValueError: If `capacity` is not positive or a field is not in :data:`HISTORY_FIELDS`.
+        """
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1")
+        self.fields = tuple(fields)
+        unknown = set(self.fields) - set(HISTORY_FIELDS)
+        if unknown:
+            raise ValueError(
+                f"Unsupported history fields: {', '.join(sorted(unknown))}"
+            )
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = {field: array("q", bytes(8 * capacity)) for field in self.fields}
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._size
+
+    def record(self, data: IntelliFirePollData, timestamp: float) -> None:
+        """Append a sample, overwriting the oldest one when the buffer is full.
+
+        A timestamp older than the newest sample (e.g. after the wall clock was set back) is clamped
+        to it, keeping the buffer ordered.
+        """
+        if self._size:
+            timestamp = max(timestamp, self._timestamps[self._next - 1])
+        index = self._next
+        self._timestamps[index] = timestamp
+        for field, values in self._values.items():
+            values[index] = int(getattr(data, field))
+        self._next = (index + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def clear(self) -> None:
+        """Drop every sample."""
+        self._next = 0
+        self._size = 0
+
+    def _ordered(self, buffer: array) -> array:
+        """Return the held samples of `buffer`, oldest first."""
+        if self._size < self.capacity:
+            return buffer[: self._size]
+        return buffer[self._next :] + buffer[: self._next]
+
+    def _bounds(
+        self, timestamps: array, start: float | None, end: float | None
+    ) -> tuple[int, int]:
+        """Return the slice of `timestamps` within `[start, end]`."""
+        low = 0 if start is None else bisect_left(timestamps, start)
+        high = len(timestamps) if end is None else bisect_right(timestamps, end)
+        return low, max(low, high)
+
+    def query(
+        self,
+        fields: Iterable[str] | None = None,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> dict[str, array]:
+        """Return the samples between `start` and `end` (inclusive), oldest first.
+
+        Args:
+            fields (Iterable[str], optional): Fields to return. Defaults to every recorded field.
+            start (float, optional): Earliest timestamp. Defaults to the oldest sample.
+            end (float, optional): Latest timestamp. Defaults to the newest sample.
+
+        Returns:
+            dict[str, array]: A `timestamp` array plus one array per field, all the same length.
+        """
+        timestamps = self._ordered(self._timestamps)
+        low, high = self._bounds(timestamps, start, end)
+        result = {"timestamp": timestamps[low:high]}
+        for field in self.fields if fields is None else fields:
+            result[field] = self._ordered(self._values[field])[low:high]
+        return result
+
+    def downsample(
+        self,
+        field: str,
+        bucket_seconds: float,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> list[IntelliFireHistoryBucket]:
+        """Aggregate a field into fixed width time buckets.
+
+        Buckets are aligned to multiples of `bucket_seconds` and empty buckets are omitted. Each
+        bucket is reduced with `min`, `max` and `sum` over an array slice, so the per sample work
+        stays in C.
+
+        Raises:
+            ValueError: If `bucket_seconds` is not positive.
+        """
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive")
+        timestamps = self._ordered(self._timestamps)
+        values = self._ordered(self._values[field])
+        low, high = self._bounds(timestamps, start, end)
+
+        buckets = []
+        while low < high:
+            bucket_start = timestamps[low] // bucket_seconds * bucket_seconds
+            split = bisect_left(timestamps, bucket_start + bucket_seconds, low, high)
+            chunk = values[low:split]
+            buckets.append(
+                IntelliFireHistoryBucket(
+                    bucket_start,
+                    len(chunk),
+                    min(chunk),
+                    max(chunk),
+                    sum(chunk) / len(chunk),
+                )
+            )
+            low = split
+        return buckets
@@ -0,0 +1,154 @@
+"""State change listeners."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable, Iterable
+from typing import Any
+
+from .model import IntelliFirePollData
+
+IntelliFireChanges = dict[str, tuple[Any, Any]]
+IntelliFireListener = Callable[[IntelliFirePollData, IntelliFireChanges], None]
+
+# Computed properties of IntelliFirePollData and the field they are derived from
+DERIVED_FIELDS: dict[str, str] = {
+    "temperature_f": "temperature_c",
+    "thermostat_setpoint_c": "raw_thermostat_setpoint",
+    "thermostat_setpoint_f": "raw_thermostat_setpoint",
+    "error_codes": "errors",
+    "error_codes_string": "errors",
+    "unknown_errors": "errors",
+    "error_mask": "errors",
+    "has_errors": "errors",
+    "error_pilot_flame": "errors",
+    "error_flame": "errors",
+    "error_fan_delay": "errors",
+    "error_maintenance": "errors",
+    "error_disabled": "errors",
+    "error_fan": "errors",
+    "error_lights": "errors",
+    "error_accessory": "errors",
+    "error_soft_lock_out": "errors",
+    "error_ecm_offline": "errors",
+    "error_offline": "errors",
+}
+
+
+class IntelliFireListenerRegistry:
+    """Dispatch poll data changes to listeners, optionally filtered by field.
+
+    Listeners subscribed to specific fields are indexed by field name, so an update only looks at the
+    listeners of the fields that actually changed. Computed properties such as `error_codes` or
+    `temperature_f` can be used as filters and map to the field they are derived from.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._log = logging.getLogger(__name__)
+        self._all: list[IntelliFireListener] = []
+        self._by_field: dict[str, list[IntelliFireListener]] = {}
+
+    def add_listener(
+        self,
+        callback: IntelliFireListener,
+        fields: Iterable[str] | None = None,
+    ) -> Callable[[], None]:
+        """Register a callback for data changes.
+
+        Args:
+            callback (IntelliFireListener): Called as `callback(data, changes)` where `changes` maps each
+                changed field to `(old, new)`. `data` is the provider's live model, see :func:`dispatch`.
+            fields (Iterable[str], optional): Only call back when one of these fields changes. Defaults
+                to every change.
+
+        Returns:
+            Callable[[], None]: Function that removes the listener again.
+
+        Raises:
+            ValueError: If a field is not a field or computed property of :class:`IntelliFirePollData`.
+        """
+        if fields is None:
+            self._all.append(callback)
+            return lambda: self._all.remove(callback)
+
+        keys = {self._resolve_field(field) for field in fields}
+        for key in keys:
+            self._by_field.setdefault(key, []).append(callback)
+
+        def remove() -> None:
+            for key in keys:
+                self._by_field[key].remove(callback)
+                if not self._by_field[key]:
+                    del self._by_field[key]
+
+        return remove
+
+    @staticmethod
+    def _resolve_field(field: str) -> str:
+        """Map a field or computed property name to the model field it depends on."""
+        if field in IntelliFirePollData.model_fields:
+            return field
+        if field in DERIVED_FIELDS:
+            return DERIVED_FIELDS[field]
+        raise ValueError(f"Unknown IntelliFirePollData field: {field}")
+
+    def dispatch(self, data: IntelliFirePollData, changes: IntelliFireChanges) -> None:
+        """Call every listener interested in the given changes exactly once.
+
+        Listeners receive the live data object, not a copy: later polls and optimistic command updates
+        change it in place, so a listener must read what it needs during the call and must not keep or
+        modify it. Copy it with `model_copy()` or take an :class:`IntelliFireSnapshot` to keep a value.
+        Exceptions raised by a listener are logged and do not affect the others.
+        """
+        if not changes:
+            return
+
+        callbacks = list(self._all)
+        if self._by_field:
+            seen = {id(cb) for cb in callbacks}
+            for field in changes:
+                for cb in self._by_field.get(field, ()):
+                    if id(cb) not in seen:
+                        seen.add(id(cb))
+                        callbacks.append(cb)
+
+        for cb in callbacks:
+            try:
+                cb(data, changes)
+            except Exception as ex:
+                self._log.error("Listener %s failed: %s", cb, ex)
+
+    async def stream(
+        self, fields: Iterable[str] | None = None
+    ) -> AsyncIterator[IntelliFirePollData]:
+        """Yield each new snapshot, conflating updates a slow consumer has not picked up yet.
+
+        Only the latest snapshot is buffered: if several updates arrive while the consumer is busy, the
+        next iteration returns the most recent one and the others are dropped. Memory use is therefore
+        constant however far the consumer falls behind. The listener is removed when the iteration ends.
+        Each snapshot is a copy taken when it is handed out, so later polls and optimistic command updates
+        do not change a snapshot the consumer already holds.
+
+        Args:
+            fields (Iterable[str], optional): Only yield when one of these fields changes.
+        """
+        latest: IntelliFirePollData | None = None
+        ready = asyncio.Event()
+
+        def push(data: IntelliFirePollData, changes: IntelliFireChanges) -> None:
+            nonlocal latest
+            latest = data
+            ready.set()
+
+        remove = self.add_listener(push, fields)
+        try:
+            while True:
+                await ready.wait()
+                ready.clear()
+                snapshot, latest = latest, None
+                if snapshot is not None:
+                    yield snapshot.model_copy()
+        finally:
+            remove()
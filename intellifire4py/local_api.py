@@ -4,21 +4,25 @@ from __future__ import annotations
 import asyncio
 import time
 from asyncio import Task
+from collections.abc import Iterable
 from hashlib import sha256
 from json import JSONDecodeError
 from typing import Any
 import logging
 
 from aiohttp import ClientSession, ClientTimeout
+from pydantic import ValidationError
 
 from intellifire4py.model import (
+    IntelliFireCommandResult,
     IntelliFirePollData,
 )
 
-from .const import IntelliFireCommand
+from .const import IntelliFireCommand, LOCAL_CHALLENGE_MAX_AGE_SECONDS
 from .const import IntelliFireApiMode
 from .control import IntelliFireController
 from .read import IntelliFireDataProvider
+from .scheduler import IntelliFireRequestScheduler, RequestPriority
 from .utils import _range_check
 import aiohttp
 
@@ -34,13 +38,22 @@ class IntelliFireAPILocal(IntelliFireController, IntelliFireDataProvider):
     failed_poll_attempts = 0
     is_sending = False
 
-    def __init__(self, fireplace_ip: str, user_id: str = "", api_key: str = "") -> None:
+    def __init__(
+        self,
+        fireplace_ip: str,
+        user_id: str = "",
+        api_key: str = "",
+        session: ClientSession | None = None,
+    ) -> None:
         """Class Initialization.
 
         Args:
             fireplace_ip (str): _description_
             user_id (str, optional): The `user_id` as retrieved from :class:`IntelliFireAPICloud`. If left blank - will not be able to control the unit. Defaults to `""`.
             api_key (str, optional): Each fireplace has a unique `api_key`. If left blank - will not be able to control the unit. Defaults to `""`.
+            session (ClientSession, optional): An externally owned `aiohttp.ClientSession` to share pooled
+                connections with other fireplaces. The caller remains responsible for closing it. If omitted a
+                long-lived session is created on first use and released by :func:`close`.
 
         See Also:
             - :func:`IntelliFireAPICloud.login`
@@ -63,6 +76,19 @@ class IntelliFireAPILocal(IntelliFireController, IntelliFireDataProvider):
         self.failed_poll_attempts = 0
 
         self._bg_task: Task[Any] | None = None
+        self._command_tasks: dict[IntelliFireCommand, tuple[int, Task[None]]] = {}
+        # sha256 state after hashing the api key, reused for every signature
+        self._signing_key: tuple[str, Any] | None = None
+        # Every request to the fireplace goes through here so only one is ever in flight
+        self._scheduler = IntelliFireRequestScheduler()
+
+        # Prefetched /get_challenge result and the monotonic time it was received
+        self._challenge: str | None = None
+        self._challenge_received = 0.0
+        self._challenge_task: Task[None] | None = None
+
+        self._session = session
+        self._owns_session = session is None
 
         if user_id == "":
             self._log.warning(
@@ -85,6 +111,35 @@ class IntelliFireAPILocal(IntelliFireController, IntelliFireDataProvider):
             self._should_poll_in_background,
         )
 
+    async def __aenter__(self) -> IntelliFireAPILocal:
+        """Asynchronous context manager entry."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type | None,
+        exc_val: Exception | None,
+        exc_tb: object | None,
+    ) -> None:
+        """Asynchronous context manager exit."""
+        await self.close()
+
+    def _get_session(self) -> ClientSession:
+        """Return the session used for all requests, creating a long-lived one if needed."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
+        return self._session
+
+    async def close(self) -> None:
+        """Stop background polling and close the session if it is owned by this instance."""
+        await self.stop_background_polling()
+        self.unschedule_polling()
+        if self._challenge_task and not self._challenge_task.done():
+            self._challenge_task.cancel()
+        if self._owns_session and self._session and not self._session.closed:
+            await self._session.close()
+
     def _needs_login(self) -> bool:
         """Return whether a login is required to iftapi.net."""
         return self._api_key == "" or self._user_id == ""
@@ -131,7 +186,9 @@ class IntelliFireAPILocal(IntelliFireController, IntelliFireDataProvider):
             if not self._bg_task.cancelled():
                 was_running = True
                 self._bg_task.cancel()
-                self._log.info("Stopping background task to issue a command")
+                self._log.info("Stopping background task")
+                # Wait for the task to finish so a later start never overlaps with it
+                await asyncio.wait({self._bg_task})
 
         return was_running
 
@@ -152,7 +209,12 @@ class IntelliFireAPILocal(IntelliFireController, IntelliFireDataProvider):
                 end = time.time()
 
                 duration: float = end - start
-                sleep_time: float = minimum_wait_in_seconds - duration
+                sleep_time: float = (
+                    self.polling_policy.next_interval(
+                        self._data, base_interval=minimum_wait_in_seconds
+                    )
+                    - duration
+                )
 
                 self._log.debug(
                     "__background_poll:: [%f] Sleeping for [%fs]",
@@ -166,44 +228,63 @@ class IntelliFireAPILocal(IntelliFireController, IntelliFireDataProvider):
                     end,
                     (end - start),
                 )
-                self._log.debug(
-                    "__background_poll:: Should Sleep For: %f",
-                    (minimum_wait_in_seconds - (end - start)),
-                )
 
-                await asyncio.sleep(minimum_wait_in_seconds - (end - start))
-            except TimeoutError:
+                await self._sleep_until_next_poll(sleep_time)
+            except (TimeoutError, JSONDecodeError, ValidationError):
                 self.failed_poll_attempts += 1
                 self._log.info(
                     "__background_poll:: Polling error [x%d]",
                     self.failed_poll_attempts,
                 )
+                await self._sleep_until_next_poll(
+                    self.polling_policy.next_interval(
+                        self._data,
+                        base_interval=minimum_wait_in_seconds,
+                        failed_attempts=self.failed_poll_attempts,
+                    )
+                )
 
         self._is_polling_in_background = False
         self._log.info("__background_poll:: Background polling disabled.")
 
+    async def _scheduled_poll(self) -> None:
+        """Perform one poll on behalf of :attr:`poll_scheduler`."""
+        await self.poll()
+
     async def poll(
         self, suppress_warnings: bool = False, timeout_seconds: float = 10.0
     ) -> None:
-        """Perform a local poll."""
+        """Perform a local poll.
+
+        Raises:
+            ClientResponseError: If the fireplace answers with an error status.
+            TimeoutError: If no answer arrives within `timeout_seconds`.
+            JSONDecodeError: If the payload is not valid JSON.
+            ValidationError: If the JSON does not describe valid poll data.
+        """
 
         url = f"http://{self.fireplace_ip}/poll"
         self._log.debug(f"poll() {url} with timeout: {timeout_seconds}")
         try:
-            timeout = ClientTimeout(total=timeout_seconds)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                response = await session.get(url)
+            session = self._get_session()
+            async with self._scheduler.slot(RequestPriority.POLL):
+                response = await session.get(
+                    url, timeout=ClientTimeout(total=timeout_seconds)
+                )
                 response.raise_for_status()  # Handle 4xx/5xx responses here
                 try:
                     # Local endpoint doesn't set content_type to JSON
-                    json_data = await response.json(content_type=None)
-                    self._data = IntelliFirePollData(**json_data)
-                    self._log.debug(f"poll() complete: {self._data}")
+                    changes = self._apply_poll_payload(await response.read())
+                    self._log.debug(f"poll() complete: {changes or 'unchanged'}")
                     self._last_poll = datetime.now(timezone.utc)
                 except JSONDecodeError as error:
                     if not suppress_warnings:
                         self._log.warning("Error decoding JSON: [%s]", response.text)
                     raise error
+                except ValidationError as error:
+                    if not suppress_warnings:
+                        self._log.warning("Invalid poll data from %s: %s", url, error)
+                    raise error
         except aiohttp.ClientResponseError as e:
             if e.status == 404 and not suppress_warnings:
                 self._log.warning(f"poll() Error accessing {url} - 404")
@@ -231,27 +312,97 @@ class IntelliFireAPILocal(IntelliFireController, IntelliFireDataProvider):
             )
             return
 
-        was_running = await self.stop_background_polling()
-        self._log.debug(
-            "send_command:: Stopped background task which was running? [%s]",
-            was_running,
-        )
+        # Background polling keeps running - the scheduler holds polls back until the command is done
+        self.is_sending = True
+        try:
+            await self._send_superseding(
+                command=command, value=value, send=self._send_local_command
+            )
+        finally:
+            self.is_sending = False
+
+    async def send_commands(
+        self, commands: Iterable[tuple[IntelliFireCommand, int]]
+    ) -> list[IntelliFireCommandResult]:
+        """Send several commands in order and report the outcome of each.
 
-        await self._send_local_command(command=command, value=value)
+        The whole batch holds the device for its duration, so no poll is interleaved and each
+        challenge is fetched the moment the previous command has been posted.
 
-        if was_running:
-            await self.start_background_polling()
-            self._log.info("send_command:: Restarting background polling")
+        Args:
+            commands (Iterable[tuple[IntelliFireCommand, int]]): `(command, value)` pairs, sent in order.
+
+        Returns:
+            list[IntelliFireCommandResult]: One result per command, in the same order.
+
+        Raises:
+            InputRangError: If any value is out of range - nothing is sent in that case.
+        """
+        batch = list(commands)
+        for command, value in batch:
+            _range_check(command, value)
+
+        if self._needs_login():
+            self._log.warning(
+                "Unable to send %d commands. Both `api_key` and `user_id` fields must be set.",
+                len(batch),
+            )
+            return [
+                IntelliFireCommandResult(
+                    command=command,
+                    value=value,
+                    success=False,
+                    error="api_key and user_id are required",
+                )
+                for command, value in batch
+            ]
+
+        session = self._get_session()
+        results: list[IntelliFireCommandResult] = []
+        self.is_sending = True
+        try:
+            if self._challenge_task is not None and not self._challenge_task.done():
+                await asyncio.wait({self._challenge_task})
+            async with self._scheduler.slot(RequestPriority.COMMAND):
+                for command, value in batch:
+                    success = await self._post_local_command(
+                        session, command=command, value=value
+                    )
+                    results.append(
+                        IntelliFireCommandResult(
+                            command=command,
+                            value=value,
+                            success=success,
+                            error=None if success else "command could not be sent",
+                        )
+                    )
+        finally:
+            self.is_sending = False
+
+        if any(result.success for result in results):
+            self._schedule_challenge_prefetch()
+            self._poll_soon()
+        return results
+
+    def _signing_state(self) -> Any:
+        """Return a sha256 object that has already consumed the api key bytes."""
+        if self._signing_key is None or self._signing_key[0] != self._api_key:
+            self._signing_key = (
+                self._api_key,
+                sha256(bytes.fromhex(self._api_key)),
+            )
+        return self._signing_key[1]
 
     def _construct_payload(self, command: str, value: int, challenge: str) -> str:
         """Construct a payload."""
         payload = f"post:command={command}&value={value}"
-        api_bytes = bytes.fromhex(self._api_key)
-        challenge_bytes = bytes.fromhex(challenge)
-        payload_bytes = payload.encode()
-        response = sha256(
-            api_bytes + sha256(api_bytes + challenge_bytes + payload_bytes).digest()
-        ).hexdigest()
+        key_state = self._signing_state()
+        inner = key_state.copy()
+        inner.update(bytes.fromhex(challenge))
+        inner.update(payload.encode())
+        outer = key_state.copy()
+        outer.update(inner.digest())
+        response = outer.hexdigest()
         return (
             f"command={command}&value={value}&user={self._user_id}&response={response}"
         )
@@ -264,88 +415,154 @@ class IntelliFireAPILocal(IntelliFireController, IntelliFireDataProvider):
     ) -> None:
         """Send a local command to the /post interface."""
 
-        async with aiohttp.ClientSession() as session:
-            self._log.info(f"Created Client Session {session}")
-            success = False
-            retries = 0
-            # We're done when we succeed, but also give up after 10 retries
-            while not success and retries < 10:
-                retries += 1
-                challenge = await self._get_challenge(session)
-                # If the challenge timed out or had another error, try again from the top
-                if not challenge:
-                    continue
-
-                challenge_time = time.time()
-                data = self._construct_payload(
-                    command=command.value["local_command"],  # type: ignore
-                    value=value,
-                    challenge=challenge,
-                )
-                url = f"http://{self.fireplace_ip}/post"
-                try:
-                    while (time.time() - challenge_time) < 7 and not success:
-                        # There is a 10 second timeout on the challenge response - we'll try for 7
-                        self._log.info(
-                            "_send_local_command ➡️ Attempting command via 📬️ post %d [%s]",
-                            (time.time() - challenge_time),
-                            challenge,
-                        )
+        session = self._get_session()
+        if self._challenge_task is not None and not self._challenge_task.done():
+            # A prefetch is already in flight - it will finish sooner than a new request
+            await asyncio.wait({self._challenge_task})
+
+        async with self._scheduler.slot(RequestPriority.COMMAND):
+            success = await self._post_local_command(
+                session, command=command, value=value
+            )
+
+        if success:
+            self._log.debug(
+                "_send_local_command:: SUCCESS!! - IntelliFire Command Sent [%s=%s]",
+                command.value["local_command"],
+                value,
+            )
+            # Commands tend to come in bursts (e.g. dragging a slider) - have the next challenge ready
+            self._schedule_challenge_prefetch()
+            self._poll_soon()
+        else:
+            self._log.debug(
+                "_send_local_command:: FAILURE!! - IntelliFire command could not be sent [%s=%s]",
+                command.value["local_command"],
+                value,
+            )
+
+    async def _post_local_command(
+        self,
+        session: ClientSession,
+        *,
+        command: IntelliFireCommand,
+        value: int,
+    ) -> bool:
+        """Sign and post a command, retrying with new challenges - return whether it succeeded."""
+        success = False
+        retries = 0
+        # We're done when we succeed, but also give up after 10 retries
+        while not success and retries < 10:
+            retries += 1
+            challenge, challenge_age = await self._take_challenge(session)
+            # If the challenge timed out or had another error, try again from the top
+            if not challenge:
+                continue
+
+            challenge_time = time.time() - challenge_age
+            data = self._construct_payload(
+                command=command.value["local_command"],  # type: ignore
+                value=value,
+                challenge=challenge,
+            )
+            url = f"http://{self.fireplace_ip}/post"
+            posts = 0
+            try:
+                while (
+                    time.time() - challenge_time
+                ) < LOCAL_CHALLENGE_MAX_AGE_SECONDS and not success:
+                    # There is a 10 second timeout on the challenge response - we'll try for 7
+                    self._log.info(
+                        "_send_local_command ➡️ Attempting command via 📬️ post %d [%s]",
+                        (time.time() - challenge_time),
+                        challenge,
+                    )
+                    if posts:
+                        # Only pace repeated posts - the first one goes out immediately
                         await asyncio.sleep(0.2)
-                        resp = await session.post(
-                            url=url,
-                            data=data,
-                            headers={
-                                "content-type": "application/x-www-form-urlencoded"
-                            },
-                            timeout=ClientTimeout(total=1.0),
+                    posts += 1
+                    async with session.post(
+                        url=url,
+                        data=data,
+                        headers={"content-type": "application/x-www-form-urlencoded"},
+                        timeout=ClientTimeout(total=1.0),
+                    ) as resp:
+                        status = resp.status
+                    self._log.debug(
+                        "_send_local_command ➡️ Sending Local IntelliFire command: [%s=%s]",
+                        command.value["local_command"],
+                        value,
+                    )
+                    if status == 403:
+                        self._log.warning(
+                            f"_send_local_command 🟥️ 403 Error - Invalid challenge code (it may have expired): {url}{data}"
+                        )
+                        # Retrying a rejected challenge is pointless - fetch a new one
+                        break
+                    elif status == 404:
+                        self._log.warning(
+                            f"_send_local_command 🟥️ Failed to post: {url}{data}"
+                        )
+                    elif status == 422:
+                        self._log.warning(
+                            f"_send_local_command:: 422 Code on: {url}{data}"
                         )
+                    elif 200 <= status < 300:
+                        success = True
                         self._log.debug(
-                            "_send_local_command ➡️ Sending Local IntelliFire command: [%s=%s]",
-                            command.value["local_command"],
-                            value,
+                            "_send_local_command:: Response Code [%d]", status
                         )
-                        if resp.status == 403:
-                            self._log.warning(
-                                f"_send_local_command 🟥️ 403 Error - Invalid challenge code (it may have expired): {url}{data}"
-                            )
-                        elif resp.status == 404:
-                            self._log.warning(
-                                f"_send_local_command 🟥️ Failed to post: {url}{data}"
-                            )
-                        elif resp.status == 422:
-                            self._log.warning(
-                                f"_send_local_command:: 422 Code on: {url}{data}"
-                            )
-                        elif 200 <= resp.status < 300:
-                            success = True
-                            self._log.debug(
-                                "_send_local_command:: Response Code [%d]", resp.status
-                            )
-                            self._last_send = datetime.now(timezone.utc)
-                        else:
-                            self._log.warning(
-                                f"_send_local_command:: Unexpected Response Code: {resp.status}"
-                            )
-                except TimeoutError as error:
-                    self._log.warning("Control Endpoint Timeout Error %s", error)
-                    continue
-                except Exception as error:
-                    self._log.error("Unhandled exception %s", error)
-                    self._log.error(error)
-
-            if success:
-                self._log.debug(
-                    "_send_local_command:: SUCCESS!! - IntelliFire Command Sent [%s=%s]",
-                    command.value["local_command"],
-                    value,
-                )
-            else:
-                self._log.debug(
-                    "_send_local_command:: FAILURE!! - IntelliFire command could not be sent [%s=%s]",
-                    command.value["local_command"],
-                    value,
-                )
+                        self._last_send = datetime.now(timezone.utc)
+                    else:
+                        self._log.warning(
+                            f"_send_local_command:: Unexpected Response Code: {status}"
+                        )
+            except TimeoutError as error:
+                self._log.warning("Control Endpoint Timeout Error %s", error)
+                continue
+            except Exception as error:
+                self._log.error("Unhandled exception %s", error)
+                self._log.error(error)
+
+        return success
+
+    async def prefetch_challenge(self) -> None:
+        """Fetch a challenge ahead of the next command.
+
+        The challenge is cached for up to `7` seconds (the fireplace honours it for roughly `10`) and
+        used by the next command, which then only needs a single `/post` round trip. A challenge is
+        prefetched automatically after every successful command; call this directly when a command is
+        likely to follow, e.g. when a control is opened in a UI.
+        """
+        if self._needs_login():
+            return
+        session = self._get_session()
+        async with self._scheduler.slot(RequestPriority.COMMAND):
+            challenge = await self._get_challenge(session)
+        if challenge:
+            self._challenge = challenge
+            self._challenge_received = time.monotonic()
+
+    def _schedule_challenge_prefetch(self) -> None:
+        """Start a background challenge prefetch unless one is already running."""
+        if self._challenge_task is None or self._challenge_task.done():
+            self._challenge_task = asyncio.create_task(
+                self.prefetch_challenge(), name="challenge_prefetch"
+            )
+
+    async def _take_challenge(self, session: ClientSession) -> tuple[str | None, float]:
+        """Return a challenge and its age in seconds, preferring a fresh prefetched one.
+
+        A challenge can only be used once, so the cached value is always cleared.
+        """
+        challenge, self._challenge = self._challenge, None
+        if challenge is not None:
+            age = time.monotonic() - self._challenge_received
+            if age < LOCAL_CHALLENGE_MAX_AGE_SECONDS:
+                self._log.debug("Using prefetched challenge [%.2fs old]", age)
+                return challenge, age
+
+        return await self._get_challenge(session), 0.0
 
     async def _get_challenge(self, session: ClientSession) -> str | None:
         """Retrieve a challenge result from the fireplace."""
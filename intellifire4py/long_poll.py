@@ -0,0 +1,119 @@
+"""Event driven long poll engine for iftapi.net."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from .const import CLOUD_LONG_POLL_DROP_SECONDS
+from .model import IntelliFirePollData
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .cloud_api import IntelliFireAPICloud
+
+
+class IntelliFireLongPollEngine:
+    """Keep a single `applongpoll` request outstanding for a cloud fireplace.
+
+    The server answers a long poll with `200` as soon as the status changes, or with `408` after `57`
+    seconds without a change. Either way the next request is issued immediately - there is no sleep
+    between requests, so a change arriving right after a `408` is delivered without delay.
+
+    Each request runs against a monotonic deadline of `61` seconds. Reaching it means the connection
+    was silently dropped, so the engine resyncs with a full `apppoll` and re-arms. Only real errors
+    (HTTP errors, refused connections) cause an exponential back off.
+    """
+
+    def __init__(
+        self,
+        api: IntelliFireAPICloud,
+        on_update: Callable[[IntelliFirePollData], None] | None = None,
+        min_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0,
+        drop_timeout_seconds: float = CLOUD_LONG_POLL_DROP_SECONDS,
+    ) -> None:
+        """Initialize the engine.
+
+        Args:
+            api (IntelliFireAPICloud): The cloud API used to issue `apppoll` and `applongpoll` requests.
+            on_update (Callable, optional): Called with the new poll data every time the status changes.
+            min_backoff_seconds (float, optional): First delay after an error. Defaults to `1`.
+            max_backoff_seconds (float, optional): Upper bound of the doubling error delay. Defaults to `60`.
+            drop_timeout_seconds (float, optional): Deadline after which an outstanding request is
+                considered dropped. Defaults to `61`.
+        """
+        self._log = logging.getLogger(__name__)
+        self._api = api
+        self._on_update = on_update
+        self._min_backoff = min_backoff_seconds
+        self._max_backoff = max_backoff_seconds
+        self._drop_timeout = drop_timeout_seconds
+        self._running = False
+
+        self.changes = 0
+        self.timeouts = 0
+        self.drops = 0
+        self.errors = 0
+        self.last_response: float | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Return whether the engine loop is active."""
+        return self._running
+
+    def stop(self) -> None:
+        """Ask the loop to exit once the outstanding request completes."""
+        self._running = False
+
+    def _notify(self) -> None:
+        """Deliver the current data to the update callback."""
+        if self._on_update is None:
+            return
+        try:
+            self._on_update(self._api.data)
+        except Exception as ex:
+            self._log.error("Long poll update callback failed: %s", ex)
+
+    async def run(self) -> None:
+        """Run the long poll loop until :func:`stop` is called or the task is cancelled."""
+        loop = asyncio.get_running_loop()
+        backoff = 0.0
+        self._running = True
+        try:
+            while self._running:
+                try:
+                    if not self._api.is_long_poll_synced:
+                        await self._api.poll()
+                        self._notify()
+
+                    deadline = loop.time() + self._drop_timeout
+                    async with asyncio.timeout_at(deadline):
+                        changed = await self._api.long_poll()
+
+                    self.last_response = time.monotonic()
+                    backoff = 0.0
+                    if changed:
+                        self.changes += 1
+                        self._notify()
+                    else:
+                        self.timeouts += 1
+                except TimeoutError:
+                    # No response within the deadline - assume the connection was dropped
+                    self.drops += 1
+                    self._api.reset_long_poll_queue()
+                    self._log.info("Long poll connection dropped [x%d]", self.drops)
+                except Exception as ex:
+                    self.errors += 1
+                    self._api.reset_long_poll_queue()
+                    backoff = min(
+                        self._max_backoff, max(self._min_backoff, backoff * 2)
+                    )
+                    self._log.warning(
+                        "Long poll error [%s] - retrying in %.1fs", ex, backoff
+                    )
+                    await asyncio.sleep(backoff)
+        finally:
+            self._running = False
@@ -2,17 +2,71 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from functools import cached_property
 from http.cookies import SimpleCookie
+from json import JSONDecodeError
+from typing import Any
 
-from pydantic import ConfigDict, Field
+from pydantic import ConfigDict, Field, ValidationError
 from pydantic import BaseModel
 
-from .const import IntelliFireErrorCode, IntelliFireApiMode
+from .const import IntelliFireCommand, IntelliFireErrorCode, IntelliFireApiMode
 from aiohttp import CookieJar
 
+# One bit per error code, combined in `IntelliFirePollData.error_mask`
+ERROR_BIT_PILOT_FLAME = 1 << 0
+ERROR_BIT_FAN_DELAY = 1 << 1
+ERROR_BIT_FLAME = 1 << 2
+ERROR_BIT_MAINTENANCE = 1 << 3
+ERROR_BIT_DISABLED = 1 << 4
+ERROR_BIT_FAN = 1 << 5
+ERROR_BIT_LIGHTS = 1 << 6
+ERROR_BIT_ACCESSORY = 1 << 7
+ERROR_BIT_SOFT_LOCK_OUT = 1 << 8
+ERROR_BIT_ECM_OFFLINE = 1 << 9
+ERROR_BIT_OFFLINE = 1 << 10
+
+# Keyed by IntelliFireErrorCode, typed Any as mypy does not see aenum members as enum members
+ERROR_CODE_BITS: dict[Any, int] = {
+    IntelliFireErrorCode.PILOT_FLAME: ERROR_BIT_PILOT_FLAME,
+    IntelliFireErrorCode.FAN_DELAY: ERROR_BIT_FAN_DELAY,
+    IntelliFireErrorCode.FLAME: ERROR_BIT_FLAME,
+    IntelliFireErrorCode.MAINTENANCE: ERROR_BIT_MAINTENANCE,
+    IntelliFireErrorCode.DISABLED: ERROR_BIT_DISABLED,
+    IntelliFireErrorCode.FAN: ERROR_BIT_FAN,
+    IntelliFireErrorCode.LIGHTS: ERROR_BIT_LIGHTS,
+    IntelliFireErrorCode.ACCESSORY: ERROR_BIT_ACCESSORY,
+    IntelliFireErrorCode.SOFT_LOCK_OUT: ERROR_BIT_SOFT_LOCK_OUT,
+    IntelliFireErrorCode.ECM_OFFLINE: ERROR_BIT_ECM_OFFLINE,
+    IntelliFireErrorCode.OFFLINE: ERROR_BIT_OFFLINE,
+}
+# Raw firmware error value -> error code, e.g. both 2 and 130 map to PILOT_FLAME
+ERROR_CODE_TABLE: dict[int, IntelliFireErrorCode] = {
+    value: code
+    for code in IntelliFireErrorCode  # type: ignore[attr-defined]
+    for value in code.values
+}
+# Raw firmware error value -> bit
+_ERROR_VALUE_BITS = {
+    value: ERROR_CODE_BITS[code] for value, code in ERROR_CODE_TABLE.items()
+}
+# Source field -> cached properties computed from it, dropped when the field is assigned
+_CACHED_FROM: dict[str, tuple[str, ...]] = {
+    "errors": ("error_mask", "_error_codes", "_unknown_errors"),
+    "temperature_c": ("temperature_f",),
+    "raw_thermostat_setpoint": ("thermostat_setpoint_c", "thermostat_setpoint_f"),
+}
+
 
 class IntelliFirePollData(BaseModel):
-    """Base model for IntelliFire status data."""
+    """Base model for IntelliFire status data.
+
+    Error codes and unit conversions are computed on first access and cached in the instance
+    `__dict__`, so later reads are plain attribute lookups. Assigning the field they derive from
+    drops the cached values. Unknown firmware error codes are kept in `errors` and `unknown_errors`
+    instead of raising.
+    """
 
     battery: int = Field(default=0)
     brand: str = Field(default="unset")
@@ -45,90 +99,167 @@ class IntelliFirePollData(BaseModel):
 
     model_config = ConfigDict(populate_by_name=True)
 
-    @property
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set a field and drop the cached values derived from it."""
+        super().__setattr__(name, value)
+        cached = _CACHED_FROM.get(name)
+        if cached:
+            for key in cached:
+                self.__dict__.pop(key, None)
+
+    def model_copy(
+        self, *, update: Mapping[str, Any] | None = None, deep: bool = False
+    ) -> IntelliFirePollData:
+        """Return a copy, dropping cached values derived from fields in `update`."""
+        copied = super().model_copy(update=update, deep=deep)
+        for name in update or ():
+            for key in _CACHED_FROM.get(name, ()):
+                copied.__dict__.pop(key, None)
+        return copied
+
+    @classmethod
+    def from_json(cls, payload: bytes | str) -> IntelliFirePollData:
+        """Parse and validate a raw poll response body in a single pass.
+
+        The bytes go straight to pydantic's JSON parser instead of being decoded to `str`, loaded into a
+        `dict` and then validated as keyword arguments.
+
+        Raises:
+            JSONDecodeError: If the payload is not valid JSON.
+            ValidationError: If the JSON does not describe valid poll data.
+        """
+        try:
+            return cls.model_validate_json(payload)
+        except ValidationError as error:
+            if error.errors()[0]["type"] != "json_invalid":
+                raise
+            doc = (
+                payload.decode(errors="replace")
+                if isinstance(payload, bytes)
+                else payload
+            )
+            raise JSONDecodeError(error.errors()[0]["msg"], doc, 0) from error
+
+    @cached_property
     def temperature_f(self) -> float:
         """Return temperature in fahrenheit."""
         return (self.temperature_c * 9 / 5) + 32
 
-    @property
+    @cached_property
     def thermostat_setpoint_c(self) -> float:
         """Thermostat set point in celsius."""
         return self.raw_thermostat_setpoint / 100
 
-    @property
+    @cached_property
     def thermostat_setpoint_f(self) -> float:
         """Thermostat setpoint in fahrenheit."""
         return (self.raw_thermostat_setpoint / 100 * 9 / 5) + 32
 
+    @cached_property
+    def _error_codes(self) -> tuple[IntelliFireErrorCode, ...]:
+        """Known error codes, in the order reported."""
+        return tuple(
+            ERROR_CODE_TABLE[value]
+            for value in self.errors
+            if value in ERROR_CODE_TABLE
+        )
+
+    @cached_property
+    def _unknown_errors(self) -> tuple[int, ...]:
+        """Raw error values without a known error code."""
+        return tuple(value for value in self.errors if value not in ERROR_CODE_TABLE)
+
     @property
     def error_codes(self) -> list[IntelliFireErrorCode]:
-        """Error codes returned as IntelliFireErrroCodes."""
-        return [IntelliFireErrorCode(i) for i in self.errors]
+        """Error codes returned as IntelliFireErrroCodes, skipping codes this library does not know."""
+        return list(self._error_codes)
+
+    @cached_property
+    def error_mask(self) -> int:
+        """Known error codes as a bitmask of the `ERROR_BIT_*` constants."""
+        mask = 0
+        for value in self.errors:
+            mask |= _ERROR_VALUE_BITS.get(value, 0)
+        return mask
+
+    @property
+    def unknown_errors(self) -> list[int]:
+        """Raw error values that do not match any known IntelliFireErrorCode."""
+        return list(self._unknown_errors)
 
     @property
     def error_codes_string(self) -> str:
         """Assembled error codes into a formatted string."""
-        return ", ".join([code.name for code in self.error_codes])
+        return ", ".join([code.name for code in self._error_codes])
 
     @property
     def error_pilot_flame(self) -> bool:
         """Return whether PILOT_FLAME error is present."""
-        return IntelliFireErrorCode.PILOT_FLAME in self.error_codes
+        return self.error_mask & ERROR_BIT_PILOT_FLAME != 0
 
     @property
     def error_flame(self) -> bool:
         """Return whether FLAME error is present."""
-        return IntelliFireErrorCode.FLAME in self.error_codes
+        return self.error_mask & ERROR_BIT_FLAME != 0
 
     @property
     def error_fan_delay(self) -> bool:
         """Return whether FAN_DELAY error is present."""
-        return IntelliFireErrorCode.FAN_DELAY in self.error_codes
+        return self.error_mask & ERROR_BIT_FAN_DELAY != 0
 
     @property
     def error_maintenance(self) -> bool:
         """Return whether MAINTENANCE error is present."""
-        return IntelliFireErrorCode.MAINTENANCE in self.error_codes
+        return self.error_mask & ERROR_BIT_MAINTENANCE != 0
 
     @property
     def error_disabled(self) -> bool:
         """Return whether DISABLED error is present."""
-        return IntelliFireErrorCode.DISABLED in self.error_codes
+        return self.error_mask & ERROR_BIT_DISABLED != 0
 
     @property
     def error_fan(self) -> bool:
         """Return whether FAN error is present."""
-        return IntelliFireErrorCode.FAN in self.error_codes
+        return self.error_mask & ERROR_BIT_FAN != 0
 
     @property
     def error_lights(self) -> bool:
         """Return whether LIGHTS error is present."""
-        return IntelliFireErrorCode.LIGHTS in self.error_codes
+        return self.error_mask & ERROR_BIT_LIGHTS != 0
 
     @property
     def error_accessory(self) -> bool:
         """Return whether ACCESSORY error is present."""
-        return IntelliFireErrorCode.ACCESSORY in self.error_codes
+        return self.error_mask & ERROR_BIT_ACCESSORY != 0
 
     @property
     def error_soft_lock_out(self) -> bool:
         """Return whether SOFT_LOCK_OUT error is present."""
-        return IntelliFireErrorCode.SOFT_LOCK_OUT in self.error_codes
+        return self.error_mask & ERROR_BIT_SOFT_LOCK_OUT != 0
 
     @property
     def error_ecm_offline(self) -> bool:
         """Return whether ECM_OFFLINE error is present."""
-        return IntelliFireErrorCode.ECM_OFFLINE in self.error_codes
+        return self.error_mask & ERROR_BIT_ECM_OFFLINE != 0
 
     @property
     def error_offline(self) -> bool:
         """Return whether OFFLINE error is present."""
-        return IntelliFireErrorCode.OFFLINE in self.error_codes
+        return self.error_mask & ERROR_BIT_OFFLINE != 0
 
     @property
     def has_errors(self) -> bool:
         """If there is any errors this will be true."""
-        return len(self.error_codes) > 0
+        return len(self.errors) > 0
+
+
+class IntelliFireCommandResult(BaseModel):
+    """Outcome of a single command sent as part of a batch."""
+
+    command: IntelliFireCommand
+    value: int
+    success: bool
+    error: str | None = None
 
 
 class UDPResponse(BaseModel):
@@ -0,0 +1,273 @@
+"""Fleet wide poll scheduling from a single task."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class _PollJob:
+    """A registered poll and its scheduling state."""
+
+    key: Hashable
+    poll: Callable[[], Awaitable[None]]
+    interval: Callable[[int], float]
+    generation: int = 0
+    failures: int = 0
+    running: bool = False
+    soon: bool = False
+
+
+class IntelliFirePollScheduler:
+    """Run the polls of many fireplaces from one task instead of one sleeping task per device.
+
+    Registered polls sit in a heap ordered by due time. A single dispatcher sleeps until the earliest
+    is due, then starts every poll due within `batch_window_seconds` in one batch, holding one of
+    `max_concurrency` semaphore slots per poll in flight; while all slots are taken, due polls wait in
+    the heap, as they do while `max_polls_per_second` is reached. When a poll finishes, its
+    `interval(failed_attempts)` callback picks the next delay, which is spread by up to `jitter` of
+    itself so polls registered together drift apart instead of waking in lockstep.
+
+    Example:
+
+        .. code:: Python
+
+            scheduler = IntelliFirePollScheduler(max_concurrency=32)
+            for api in apis:
+                api.schedule_polling(scheduler, minimum_wait_in_seconds=15)
+            await scheduler.start()
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 64,
+        jitter: float = 0.1,
+        batch_window_seconds: float = 0.05,
+        max_polls_per_second: float | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize an empty, stopped scheduler.
+
+        Args:
+            max_concurrency (int, optional): Polls in flight at once. Defaults to `64`.
+            jitter (float, optional): Fraction by which each delay is randomly lengthened or shortened.
+                Defaults to `0.1`.
+            batch_window_seconds (float, optional): Polls due within this window of the earliest one are
+                started together. Defaults to `0.05`.
+            max_polls_per_second (float, optional): Hard cap on the rate at which polls start, e.g. to
+                enforce an :class:`IntelliFirePollBudget`. Defaults to no cap.
+            seed (int, optional): Seed for the jitter, for reproducible schedules.
+
+        Raises:
+            ValueError: If `max_concurrency` is not positive or `jitter` is outside `[0, 1)`.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter must be at least 0 and below 1")
+        self._log = logging.getLogger(__name__)
+        self.max_concurrency = max_concurrency
+        self.jitter = jitter
+        self.batch_window_seconds = batch_window_seconds
+        self.max_polls_per_second = max_polls_per_second
+        self._next_start = 0.0
+        #: Shared with callers that want their own requests to count against the same limit
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        #: `dispatched`, `batches` and `failed` counts
+        self.stats: Counter[str] = Counter()
+        self._random = random.Random(seed)  # noqa: S311
+        self._jobs: dict[Hashable, _PollJob] = {}
+        self._heap: list[tuple[float, int, int, _PollJob]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._running: set[asyncio.Task[None]] = set()
+
+    async def __aenter__(self) -> IntelliFirePollScheduler:
+        """Start dispatching."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type | None,
+        exc_val: Exception | None,
+        exc_tb: object | None,
+    ) -> None:
+        """Stop dispatching."""
+        await self.stop()
+
+    def __len__(self) -> int:
+        """Return the number of registered polls."""
+        return len(self._jobs)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether a poll is registered under `key`."""
+        return key in self._jobs
+
+    @property
+    def is_running(self) -> bool:
+        """Return whether the dispatcher is running."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of polls currently running."""
+        return len(self._running)
+
+    def add(
+        self,
+        key: Hashable,
+        poll: Callable[[], Awaitable[None]],
+        interval: Callable[[int], float],
+        *,
+        delay: float | None = None,
+        first_interval: float | None = None,
+    ) -> None:
+        """Register a poll, replacing any registered under the same key.
+
+        Args:
+            key (Hashable): Identifies the poll, e.g. a serial.
+            poll (Callable[[], Awaitable[None]]): Performs one poll; an exception counts as a failure.
+            interval (Callable[[int], float]): Returns the delay after a poll, given the number of
+                consecutive failures.
+            delay (float, optional): Delay before the first poll. Defaults to a random point within
+                `first_interval`, which spreads polls registered together.
+            first_interval (float, optional): Interval the first poll is spread over when `delay` is not
+                given. Defaults to `interval(0)`; pass the base interval for a poll that has never run,
+                whose `interval` would be computed from data not polled yet.
+        """
+        self.remove(key)
+        job = _PollJob(key, poll, interval)
+        self._jobs[key] = job
+        if delay is None:
+            if first_interval is None:
+                first_interval = interval(0)
+            delay = self._random.uniform(0, first_interval)
+        self._push(job, delay)
+
+    def remove(self, key: Hashable) -> None:
+        """Unregister a poll; one already in flight still completes."""
+        job = self._jobs.pop(key, None)
+        if job is not None:
+            job.generation += 1
+
+    def poll_soon(self, key: Hashable) -> None:
+        """Move a registered poll to the front, or run it again right after the one in flight."""
+        job = self._jobs.get(key)
+        if job is None:
+            return
+        if job.running:
+            job.soon = True
+        else:
+            job.generation += 1
+            self._push(job, 0.0)
+
+    def _push(self, job: _PollJob, delay: float) -> None:
+        """Queue the job `delay` seconds from now and wake the dispatcher if it is now first."""
+        due = time.monotonic() + delay
+        heapq.heappush(self._heap, (due, next(self._sequence), job.generation, job))
+        if self._heap[0][3] is job:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """Start the dispatcher task."""
+        if not self.is_running:
+            self._task = asyncio.create_task(self._dispatch(), name="poll_scheduler")
+
+    async def stop(self) -> None:
+        """Stop the dispatcher and cancel polls in flight; registrations are kept."""
+        tasks = set(self._running)
+        if self._task is not None:
+            tasks.add(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def _dispatch(self) -> None:
+        """Sleep until the earliest poll is due, then start the batch due by then."""
+        while True:
+            self._wakeup.clear()
+            delay = self._heap[0][0] - time.monotonic() if self._heap else None
+            if delay is not None and delay <= 0:
+                await self._dispatch_due(time.monotonic() + self.batch_window_seconds)
+                continue
+            try:
+                async with asyncio.timeout(delay):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+
+    async def _dispatch_due(self, horizon: float) -> None:
+        """Start every poll due before `horizon`, waiting for a free slot before each."""
+        self.stats["batches"] += 1
+        while self._heap and self._heap[0][0] <= horizon:
+            # Take the slot before popping, so a stop while waiting leaves the heap intact
+            await self.semaphore.acquire()
+            _, _, generation, job = heapq.heappop(self._heap)
+            if generation != job.generation or self._jobs.get(job.key) is not job:
+                self.semaphore.release()
+                continue
+            if self.max_polls_per_second:
+                try:
+                    await self._pace(self.max_polls_per_second)
+                except asyncio.CancelledError:
+                    self.semaphore.release()
+                    job.generation += 1
+                    self._push(job, 0.0)
+                    raise
+            job.running = True
+            task = asyncio.create_task(self._run(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _pace(self, rate: float) -> None:
+        """Wait for the next start allowed at `rate` polls per second."""
+        now = time.monotonic()
+        start = max(now, self._next_start)
+        self._next_start = start + 1 / rate
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _run(self, job: _PollJob) -> None:
+        """Run one poll in a held slot and reschedule it."""
+        try:
+            self.stats["dispatched"] += 1
+            try:
+                await job.poll()
+                job.failures = 0
+            except Exception as ex:
+                job.failures += 1
+                self.stats["failed"] += 1
+                self._log.debug(
+                    "Poll of %s failed [x%d]: %s", job.key, job.failures, ex
+                )
+        except asyncio.CancelledError:
+            # Stopped mid poll: poll again first thing after a restart
+            if self._jobs.get(job.key) is job:
+                job.generation += 1
+                self._push(job, 0.0)
+            raise
+        finally:
+            self.semaphore.release()
+            job.running = False
+        if self._jobs.get(job.key) is not job:
+            return
+        if job.soon:
+            job.soon = False
+            delay = 0.0
+        else:
+            delay = job.interval(job.failures)
+            delay *= self._random.uniform(1 - self.jitter, 1 + self.jitter)
+        job.generation += 1
+        self._push(job, delay)
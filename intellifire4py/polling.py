@@ -0,0 +1,293 @@
+"""Adaptive background polling policy."""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from collections.abc import Hashable
+
+from .model import IntelliFirePollData
+
+
+class IntelliFirePollingPolicy:
+    """Choose the delay before the next background poll from the latest fireplace state.
+
+    The `minimum_wait_in_seconds` passed to `start_background_polling` is the base interval, used while
+    the fireplace is on, its timer is running or it reports errors. From there:
+
+    * Right after a command, or while the unit is purging (`prepurge`), state is in flux and polls
+      happen every `fast_interval_seconds`.
+    * A unit that is off, idle and error free is polled `idle_multiplier` times less often.
+    * A struggling device - high `ecm_latency` or poor `connection_quality` - gets
+      `degraded_multiplier` times more room, and consecutive failed polls double the delay.
+
+    No delay ever exceeds `max_interval_seconds`. Pass `adaptive=False` to always poll at the base
+    interval.
+    """
+
+    def __init__(
+        self,
+        *,
+        adaptive: bool = True,
+        fast_interval_seconds: float = 3.0,
+        idle_multiplier: float = 4.0,
+        max_interval_seconds: float = 300.0,
+        command_boost_seconds: float = 30.0,
+        degraded_ecm_latency: int = 500,
+        degraded_connection_quality: int = 900_000,
+        degraded_multiplier: float = 2.0,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            adaptive (bool, optional): Set to `False` to always return the base interval. Defaults to `True`.
+            fast_interval_seconds (float, optional): Delay while state is changing. Defaults to `3`.
+            idle_multiplier (float, optional): Base interval multiplier for an idle unit. Defaults to `4`.
+            max_interval_seconds (float, optional): Upper bound for any delay. Defaults to `300`.
+            command_boost_seconds (float, optional): How long after a command to poll fast. Defaults to `30`.
+            degraded_ecm_latency (int, optional): `ecm_latency` above which the device is considered to be
+                struggling. Defaults to `500`.
+            degraded_connection_quality (int, optional): `connection_quality` below which the link is
+                considered poor. Healthy modules report values close to `1000000`. Defaults to `900000`.
+            degraded_multiplier (float, optional): Delay multiplier for a struggling device. Defaults to `2`.
+        """
+        self.adaptive = adaptive
+        self.fast_interval_seconds = fast_interval_seconds
+        self.idle_multiplier = idle_multiplier
+        self.max_interval_seconds = max_interval_seconds
+        self.command_boost_seconds = command_boost_seconds
+        self.degraded_ecm_latency = degraded_ecm_latency
+        self.degraded_connection_quality = degraded_connection_quality
+        self.degraded_multiplier = degraded_multiplier
+        self._last_command: float | None = None
+
+    def note_command(self) -> None:
+        """Record that a command was just sent so the following polls run fast."""
+        self._last_command = time.monotonic()
+
+    @property
+    def recently_commanded(self) -> bool:
+        """Return whether a command was noted within the last `command_boost_seconds`."""
+        return (
+            self._last_command is not None
+            and time.monotonic() - self._last_command < self.command_boost_seconds
+        )
+
+    def is_degraded(self, data: IntelliFirePollData) -> bool:
+        """Return whether the poll data shows the device or its link struggling."""
+        return data.ecm_latency > self.degraded_ecm_latency or (
+            0 < data.connection_quality < self.degraded_connection_quality
+        )
+
+    def next_interval(
+        self,
+        data: IntelliFirePollData,
+        base_interval: float,
+        failed_attempts: int = 0,
+    ) -> float:
+        """Return the number of seconds to wait before the next poll.
+
+        Args:
+            data (IntelliFirePollData): The most recent poll data.
+            base_interval (float): The caller's `minimum_wait_in_seconds`.
+            failed_attempts (int, optional): Number of consecutive failed polls. Defaults to `0`.
+        """
+        if not self.adaptive:
+            return base_interval
+
+        if self.recently_commanded or data.prepurge > 0:
+            interval = min(base_interval, self.fast_interval_seconds)
+        elif data.is_on or data.timer_on or data.errors:
+            interval = base_interval
+        else:
+            interval = base_interval * self.idle_multiplier
+
+        if self.is_degraded(data):
+            interval *= self.degraded_multiplier
+        if failed_attempts:
+            interval *= 2 ** min(failed_attempts, 8)
+
+        return min(interval, self.max_interval_seconds)
+
+
+class IntelliFirePollBudget:
+    """Share a fleet wide poll rate between fireplaces by how likely their state is to change.
+
+    Each fireplace gets a weight from its latest data, and poll rates are handed out in proportion to
+    weight so that all polls together stay at `max_polls_per_second`:
+
+    * `changing_weight` right after a command or while purging
+    * `active_weight` while the flame is on or a timer is running
+    * `warm_weight` while it is off but still hot, reports errors or has its thermostat armed
+    * `idle_weight` otherwise
+    * `offline_weight` after a failed poll
+
+    No fireplace is polled more often than every `min_interval_seconds`; budget a unit cannot use
+    goes to the others. Weights fall into a handful of tiers, so re-allocating after a state change
+    costs time proportional to the number of distinct weights, not of fireplaces.
+
+    Example:
+
+        .. code:: Python
+
+            budget = IntelliFirePollBudget(max_polls_per_second=20)
+            delay = budget.update(serial, api.data, recently_commanded=api.polling_policy.recently_commanded)
+    """
+
+    def __init__(
+        self,
+        max_polls_per_second: float,
+        *,
+        min_interval_seconds: float = 3.0,
+        changing_weight: float = 8.0,
+        active_weight: float = 4.0,
+        warm_weight: float = 2.0,
+        idle_weight: float = 1.0,
+        offline_weight: float = 0.25,
+    ) -> None:
+        """Initialize an empty budget.
+
+        Args:
+            max_polls_per_second (float): Poll rate shared by all fireplaces.
+            min_interval_seconds (float, optional): Shortest delay handed to any fireplace. Defaults to `3`.
+            changing_weight (float, optional): Weight right after a command or while purging. Defaults to `8`.
+            active_weight (float, optional): Weight while on or a timer runs. Defaults to `4`.
+            warm_weight (float, optional): Weight while hot, erroring or on thermostat. Defaults to `2`.
+            idle_weight (float, optional): Weight of an idle fireplace. Defaults to `1`.
+            offline_weight (float, optional): Weight after a failed poll. Defaults to `0.25`.
+
+        Raises:
+            ValueError: If the rate, minimum interval or any weight is not positive.
+        """
+        weights = (
+            changing_weight,
+            active_weight,
+            warm_weight,
+            idle_weight,
+            offline_weight,
+        )
+        if max_polls_per_second <= 0 or min_interval_seconds <= 0 or min(weights) <= 0:
+            raise ValueError(
+                "Poll rate, minimum interval and weights must all be positive"
+            )
+        self.max_polls_per_second = max_polls_per_second
+        self.min_interval_seconds = min_interval_seconds
+        self.changing_weight = changing_weight
+        self.active_weight = active_weight
+        self.warm_weight = warm_weight
+        self.idle_weight = idle_weight
+        self.offline_weight = offline_weight
+        self._weights: dict[Hashable, float] = {}
+        self._tiers: Counter[float] = Counter()
+        # Poll rate per unit of weight for uncapped tiers, and the weights capped at the minimum
+        self._rate_per_weight = 0.0
+        self._capped_above = float("inf")
+        self._dirty = False
+
+    def __len__(self) -> int:
+        """Return the number of fireplaces sharing the budget."""
+        return len(self._weights)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether a fireplace shares the budget."""
+        return key in self._weights
+
+    def weight(
+        self,
+        data: IntelliFirePollData,
+        failed_attempts: int = 0,
+        recently_commanded: bool = False,
+    ) -> float:
+        """Return the weight of a fireplace in this state."""
+        if failed_attempts:
+            return self.offline_weight
+        if recently_commanded or data.prepurge > 0:
+            return self.changing_weight
+        if data.is_on or data.timer_on:
+            return self.active_weight
+        if data.is_hot or data.thermostat_on or data.errors:
+            return self.warm_weight
+        return self.idle_weight
+
+    def update(
+        self,
+        key: Hashable,
+        data: IntelliFirePollData,
+        failed_attempts: int = 0,
+        recently_commanded: bool = False,
+    ) -> float:
+        """Record the latest state of a fireplace and return its delay until the next poll.
+
+        Args:
+            key (Hashable): Identifies the fireplace, e.g. its serial.
+            data (IntelliFirePollData): The most recent poll data.
+            failed_attempts (int, optional): Number of consecutive failed polls. Defaults to `0`.
+            recently_commanded (bool, optional): Whether a command was just sent. Defaults to `False`.
+        """
+        weight = self.weight(data, failed_attempts, recently_commanded)
+        old = self._weights.get(key)
+        if old != weight:
+            if old is not None:
+                self._drop_tier(old)
+            self._weights[key] = weight
+            self._tiers[weight] += 1
+            self._dirty = True
+        return self.interval(key)
+
+    def remove(self, key: Hashable) -> None:
+        """Stop sharing the budget with a fireplace."""
+        weight = self._weights.pop(key, None)
+        if weight is not None:
+            self._drop_tier(weight)
+            self._dirty = True
+
+    def _drop_tier(self, weight: float) -> None:
+        """Take one fireplace out of a weight tier."""
+        self._tiers[weight] -= 1
+        if not self._tiers[weight]:
+            del self._tiers[weight]
+
+    def interval(self, key: Hashable) -> float:
+        """Return the delay between polls currently allotted to a fireplace.
+
+        Raises:
+            KeyError: If the fireplace was never updated.
+        """
+        if self._dirty:
+            self._allocate()
+        weight = self._weights[key]
+        if weight >= self._capped_above:
+            return self.min_interval_seconds
+        return 1 / (weight * self._rate_per_weight)
+
+    @property
+    def total_rate(self) -> float:
+        """Return the combined poll rate of the current allocation, at most `max_polls_per_second`."""
+        if self._dirty:
+            self._allocate()
+        return sum(
+            count
+            * (
+                1 / self.min_interval_seconds
+                if weight >= self._capped_above
+                else weight * self._rate_per_weight
+            )
+            for weight, count in self._tiers.items()
+        )
+
+    def _allocate(self) -> None:
+        """Split the rate between tiers, capping the heaviest at the minimum interval first."""
+        rate = self.max_polls_per_second
+        max_rate = 1 / self.min_interval_seconds
+        tiers = sorted(self._tiers.items(), reverse=True)
+        self._capped_above = float("inf")
+        self._rate_per_weight = 0.0
+        for index, (weight, count) in enumerate(tiers):
+            rate_per_weight = rate / sum(w * c for w, c in tiers[index:])
+            if weight * rate_per_weight <= max_rate:
+                self._rate_per_weight = rate_per_weight
+                break
+            # This tier would poll faster than allowed; fix it at the minimum interval
+            self._capped_above = weight
+            rate -= count * max_rate
+        self._dirty = False
@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from datetime import datetime
+from collections.abc import AsyncIterator, Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any
 
+from .history import IntelliFireHistory
+from .listeners import IntelliFireListener, IntelliFireListenerRegistry
 from .model import IntelliFirePollData
+from .poll_scheduler import IntelliFirePollScheduler
+from .polling import IntelliFirePollingPolicy
 
 
 class IntelliFireDataProvider(ABC):
@@ -15,13 +22,128 @@ class IntelliFireDataProvider(ABC):
         """Define simple initializer."""
         self._data = IntelliFirePollData()
         self._last_poll: datetime | None = None
-        pass
+        self.polling_policy = IntelliFirePollingPolicy()
+        self._poll_sleep: asyncio.Future[None] | None = None
+        # Shared scheduler polling this provider in place of a background task, if any
+        self._poll_scheduler: IntelliFirePollScheduler | None = None
+        # Raw body of the last applied poll and a copy of the data it produced
+        self._last_payload: bytes | None = None
+        self._payload_data: IntelliFirePollData | None = None
+        self._last_changes: dict[str, tuple[Any, Any]] = {}
+        self._listeners = IntelliFireListenerRegistry()
+        # Telemetry of every applied poll, once enabled with enable_history()
+        self.history: IntelliFireHistory | None = None
 
     @property
     def last_poll_utc(self) -> datetime | None:
         """Return the last poll time."""
         return self._last_poll
 
+    def enable_history(self, capacity: int = 2880) -> IntelliFireHistory:
+        """Start recording every applied poll in :attr:`history`.
+
+        History is off by default because the ring buffer preallocates all of its samples, about 200 KiB
+        at the default capacity. An existing history of the same capacity is kept. Set :attr:`history` to
+        `None` to stop recording.
+
+        Args:
+            capacity (int): Number of samples kept. Defaults to 2880, 12 hours at 15 second polls.
+
+        Returns:
+            IntelliFireHistory: The history now recording.
+        """
+        if self.history is None or self.history.capacity != capacity:
+            self.history = IntelliFireHistory(capacity)
+        return self.history
+
+    @property
+    def last_changes(self) -> dict[str, tuple[Any, Any]]:
+        """Return the fields changed by the most recent poll as `{field: (old, new)}`.
+
+        Empty when the poll returned exactly the same payload as the one before.
+        """
+        return self._last_changes
+
+    def add_listener(
+        self,
+        callback: IntelliFireListener,
+        fields: Iterable[str] | None = None,
+    ) -> Callable[[], None]:
+        """Call `callback(data, changes)` whenever a poll changes the data.
+
+        Example:
+
+            .. code:: Python
+
+                remove = fireplace.add_listener(on_temperature, fields=["temperature_c"])
+                ...
+                remove()
+
+        Args:
+            callback (IntelliFireListener): Receives the new data and `{field: (old, new)}` of the changes.
+                The data is the live :attr:`data` object - read it during the call, do not keep it.
+            fields (Iterable[str], optional): Only call back when one of these fields (or computed
+                properties such as `error_codes`) changes. Defaults to any change.
+
+        Returns:
+            Callable[[], None]: Function that removes the listener again.
+        """
+        return self._listeners.add_listener(callback, fields)
+
+    def stream(
+        self, fields: Iterable[str] | None = None
+    ) -> AsyncIterator[IntelliFirePollData]:
+        """Iterate over data snapshots as polls change them.
+
+        Example:
+
+            .. code:: Python
+
+                async for snapshot in fireplace.stream(fields=["temperature_c"]):
+                    print(snapshot.temperature_c)
+
+        A consumer that falls behind receives only the latest snapshot instead of a backlog.
+
+        Args:
+            fields (Iterable[str], optional): Only yield when one of these fields changes. Defaults to any change.
+        """
+        return self._listeners.stream(fields)
+
+    def _apply_poll_payload(self, payload: bytes) -> dict[str, tuple[Any, Any]]:
+        """Update :attr:`data` from a raw poll response body and return the changed fields.
+
+        Most polls return a byte-identical body, in which case decoding and validation are skipped
+        entirely. Data modified since the last poll (e.g. optimistically after a command) is always
+        rebuilt so the device state wins. Every poll, changed or not, is recorded in :attr:`history`.
+
+        Raises:
+            JSONDecodeError: If the payload is not valid JSON.
+            ValidationError: If the JSON does not describe valid poll data.
+        """
+        if payload == self._last_payload and self._data == self._payload_data:
+            self._last_changes = {}
+            self._record_history()
+            return self._last_changes
+
+        new_data = IntelliFirePollData.from_json(payload)
+        old_values = self._data.__dict__
+        self._last_changes = {
+            name: (old_values.get(name), value)
+            for name, value in new_data.__dict__.items()
+            if old_values.get(name) != value
+        }
+        self._data = new_data
+        self._last_payload = payload
+        self._payload_data = new_data.model_copy()
+        self._record_history()
+        self._listeners.dispatch(new_data, self._last_changes)
+        return self._last_changes
+
+    def _record_history(self) -> None:
+        """Add the current data to :attr:`history`, if enabled."""
+        if self.history is not None:
+            self.history.record(self._data, datetime.now(timezone.utc).timestamp())
+
     @property
     @abstractmethod
     def data(self) -> IntelliFirePollData:
@@ -44,6 +166,69 @@ class IntelliFireDataProvider(ABC):
         """Abstract stop polling."""
         return False
 
+    @property
+    def poll_scheduler(self) -> IntelliFirePollScheduler | None:
+        """Return the shared scheduler polling this provider, if any."""
+        return self._poll_scheduler
+
+    def schedule_polling(
+        self,
+        scheduler: IntelliFirePollScheduler,
+        minimum_wait_in_seconds: float = 15,
+    ) -> None:
+        """Have a shared :class:`IntelliFirePollScheduler` poll this provider, without a task of its own.
+
+        Delays come from :attr:`polling_policy` exactly as with :func:`start_background_polling`, which
+        should not be running as well.
+
+        Args:
+            scheduler (IntelliFirePollScheduler): The scheduler to register with.
+            minimum_wait_in_seconds (float, optional): Base interval for the polling policy. Defaults to `15`.
+        """
+        self.unschedule_polling()
+        self._poll_scheduler = scheduler
+        # _data rather than data, which warns while nothing has been polled yet
+        scheduler.add(
+            self,
+            self._scheduled_poll,
+            lambda failed_attempts: self.polling_policy.next_interval(
+                self._data, minimum_wait_in_seconds, failed_attempts
+            ),
+            # Never polled, the policy would take the default data for an idle fireplace
+            first_interval=(
+                minimum_wait_in_seconds if self.last_poll_utc is None else None
+            ),
+        )
+
+    def unschedule_polling(self) -> None:
+        """Stop being polled by the shared scheduler, if registered with one."""
+        if self._poll_scheduler is not None:
+            self._poll_scheduler.remove(self)
+            self._poll_scheduler = None
+
+    @abstractmethod
+    async def _scheduled_poll(self) -> None:
+        """Perform one poll on behalf of :attr:`poll_scheduler`."""
+        pass
+
+    async def _sleep_until_next_poll(self, seconds: float) -> None:
+        """Sleep before the next background poll, waking early if :func:`_poll_soon` is called."""
+        sleep = asyncio.ensure_future(asyncio.sleep(seconds))
+        self._poll_sleep = sleep
+        try:
+            await asyncio.wait({sleep})
+        finally:
+            sleep.cancel()
+            self._poll_sleep = None
+
+    def _poll_soon(self) -> None:
+        """Note a command on the polling policy and bring the next background or scheduled poll forward."""
+        self.polling_policy.note_command()
+        if self._poll_sleep is not None:
+            self._poll_sleep.cancel()
+        if self._poll_scheduler is not None:
+            self._poll_scheduler.poll_soon(self)
+
     def overwrite_data(self, new_data: IntelliFirePollData) -> None:
         """Overwrite existing poll data."""
         self._data = new_data
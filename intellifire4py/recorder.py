@@ -0,0 +1,301 @@
+"""Record and replay raw device traffic."""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import IO, Any
+
+import aiohttp
+from aiohttp import ClientResponse, ClientSession, TraceConfig
+
+from .read import IntelliFireDataProvider
+
+# Headers that carry credentials and are not written to traces unless asked to
+REDACTED_HEADERS = frozenset({"authorization", "cookie", "set-cookie"})
+# URL path endings of local and cloud poll requests
+POLL_PATHS = ("/poll", "/apppoll", "/applongpoll")
+
+
+@dataclass
+class IntelliFireExchange:
+    """One request and its response, as seen on the wire.
+
+    Attributes:
+        started: Wall clock time the request was sent, in seconds since the epoch.
+        elapsed: Seconds from sending the request to reading the response body.
+        method: HTTP method.
+        url: Full request URL.
+        status: Response status, or 0 if the request failed without one.
+        request_headers: Request headers, with :data:`REDACTED_HEADERS` removed.
+        response_headers: Response headers, with :data:`REDACTED_HEADERS` removed.
+        body: Raw response body.
+        error: Description of the exception if the request failed.
+    """
+
+    started: float
+    elapsed: float
+    method: str
+    url: str
+    status: int
+    request_headers: dict[str, str] = field(default_factory=dict)
+    response_headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    error: str | None = None
+
+    @property
+    def is_poll(self) -> bool:
+        """Return whether this is a successful local or cloud poll."""
+        return self.status == 200 and self.url.split("?")[0].endswith(POLL_PATHS)
+
+    def to_json(self) -> str:
+        """Serialize to a single JSON line, keeping the body as text when it is UTF-8."""
+        record: dict[str, Any] = {
+            "started": self.started,
+            "elapsed": self.elapsed,
+            "method": self.method,
+            "url": self.url,
+            "status": self.status,
+            "request_headers": self.request_headers,
+            "response_headers": self.response_headers,
+            "error": self.error,
+        }
+        try:
+            record["body"] = self.body.decode()
+        except UnicodeDecodeError:
+            record["body_b64"] = base64.b64encode(self.body).decode()
+        return json.dumps(record, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, line: str | bytes) -> IntelliFireExchange:
+        """Parse a line written by :func:`to_json`."""
+        record = json.loads(line)
+        body = (
+            base64.b64decode(record.pop("body_b64"))
+            if "body_b64" in record
+            else record.pop("body").encode()
+        )
+        return cls(body=body, **record)
+
+
+def save_exchanges(
+    path: str | os.PathLike[str], exchanges: Iterable[IntelliFireExchange]
+) -> None:
+    """Write exchanges to a gzip compressed JSON lines file, replacing it."""
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        for exchange in exchanges:
+            file.write(exchange.to_json() + "\n")
+
+
+def load_exchanges(path: str | os.PathLike[str]) -> Iterator[IntelliFireExchange]:
+    """Read exchanges from a file written by the recorder or :func:`save_exchanges`."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield IntelliFireExchange.from_json(line)
+
+
+class _RecordingResponse(ClientResponse):
+    """Client response that reports itself to a recorder once its body is read or released."""
+
+    _recorder: IntelliFireTrafficRecorder
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Start timing when the request has been sent."""
+        super().__init__(*args, **kwargs)
+        self._record_started = (time.time(), time.perf_counter())
+        self._recorded = False
+
+    async def read(self) -> bytes:
+        """Read the body and record the exchange."""
+        body = await super().read()
+        self._record(body)
+        return body
+
+    def release(self) -> Any:
+        """Record an exchange whose body was never read."""
+        self._record(b"")
+        return super().release()
+
+    def _record(self, body: bytes) -> None:
+        """Hand the exchange to the recorder, once."""
+        if self._recorded:
+            return
+        self._recorded = True
+        started, counter = self._record_started
+        self._recorder._add(
+            IntelliFireExchange(
+                started=started,
+                elapsed=time.perf_counter() - counter,
+                method=self.method,
+                url=str(self.url),
+                status=self.status,
+                request_headers=self._recorder._headers(self.request_info.headers),
+                response_headers=self._recorder._headers(self.headers),
+                body=body,
+            )
+        )
+
+
+class IntelliFireTrafficRecorder:
+    """Capture the raw HTTP exchanges of the local and cloud APIs.
+
+    Pass a session from :func:`session` to :class:`IntelliFireAPILocal`, :class:`IntelliFireAPICloud`
+    or :class:`UnifiedFireplace`. Every request is then kept in an in-memory flight recorder ring of
+    the last `flight_size` exchanges and, if `path` is given, appended to a gzip compressed JSON lines
+    log. When a request fails or returns an error status (other than the `408` that ends an idle long
+    poll) the ring is written to `flight_path`, so the traffic leading up to a problem can be
+    inspected or replayed with :func:`replay_polls`.
+
+    Example:
+
+        .. code:: Python
+
+            recorder = IntelliFireTrafficRecorder("traffic.jsonl.gz", flight_path="flight.jsonl.gz")
+            api = IntelliFireAPILocal(fireplace_ip=ip, session=recorder.session())
+            ...
+            await api.close()
+            await recorder.close()
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        *,
+        flight_size: int = 256,
+        flight_path: str | os.PathLike[str] | None = None,
+        redact_headers: Iterable[str] = REDACTED_HEADERS,
+    ) -> None:
+        """Create a recorder.
+
+        Args:
+            path (str | os.PathLike, optional): Log every exchange to this file. Defaults to memory only.
+            flight_size (int): Number of recent exchanges kept in memory.
+            flight_path (str | os.PathLike, optional): Where the ring is written on errors.
+            redact_headers (Iterable[str]): Header names (case insensitive) left out of traces.
+        """
+        self._log = logging.getLogger(__name__)
+        self.flight: deque[IntelliFireExchange] = deque(maxlen=flight_size)
+        self.flight_path = None if flight_path is None else Path(flight_path)
+        self._redact = {name.lower() for name in redact_headers}
+        self._file: IO[str] | None = (
+            None if path is None else gzip.open(path, "at", encoding="utf-8")  # noqa: SIM115
+        )
+        self._response_class = type(
+            "_IntelliFireRecordingResponse", (_RecordingResponse,), {"_recorder": self}
+        )
+        self._sessions: list[ClientSession] = []
+
+    def trace_config(self) -> TraceConfig:
+        """Return a trace config recording requests that fail before a response arrives."""
+        trace_config = TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        return trace_config
+
+    def session(self, **kwargs: Any) -> ClientSession:
+        """Return a new recording :class:`aiohttp.ClientSession`, closed by :func:`close`.
+
+        Keyword arguments are passed on to the session.
+        """
+        session = aiohttp.ClientSession(
+            response_class=self._response_class,
+            trace_configs=[*kwargs.pop("trace_configs", []), self.trace_config()],
+            **kwargs,
+        )
+        self._sessions.append(session)
+        return session
+
+    async def close(self) -> None:
+        """Close the sessions created by :func:`session` and the log file."""
+        for session in self._sessions:
+            await session.close()
+        self._sessions.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def dump_flight(self, path: str | os.PathLike[str] | None = None) -> None:
+        """Write the flight recorder ring to `path`, defaulting to `flight_path`."""
+        target = path or self.flight_path
+        if target is not None:
+            save_exchanges(target, self.flight)
+
+    def _headers(self, headers: Mapping[str, str]) -> dict[str, str]:
+        """Return headers without redacted names."""
+        return {
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in self._redact
+        }
+
+    def _add(self, exchange: IntelliFireExchange) -> None:
+        """Keep an exchange, dumping the flight recorder if it failed."""
+        self.flight.append(exchange)
+        if self._file is not None:
+            self._file.write(exchange.to_json() + "\n")
+        # 408 is how iftapi.net ends an idle long poll, not a failure
+        if exchange.error is not None or (
+            exchange.status >= 400 and exchange.status != 408
+        ):
+            try:
+                self.dump_flight()
+            except OSError as error:
+                self._log.error("Unable to write flight recorder: %s", error)
+
+    async def _on_request_start(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        context.started = (time.time(), time.perf_counter())
+
+    async def _on_request_exception(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestExceptionParams,
+    ) -> None:
+        started, counter = context.started
+        self._add(
+            IntelliFireExchange(
+                started=started,
+                elapsed=time.perf_counter() - counter,
+                method=params.method,
+                url=str(params.url),
+                status=0,
+                request_headers=self._headers(params.headers),
+                error=repr(params.exception),
+            )
+        )
+
+
+def replay_polls(
+    provider: IntelliFireDataProvider, exchanges: Iterable[IntelliFireExchange]
+) -> tuple[int, int]:
+    """Feed recorded poll responses through a provider's parse and change detection path.
+
+    Responses are applied back to back, as fast as they can be parsed, exactly as a live poll would
+    apply them: unchanged bodies are skipped, listeners fire and history is recorded. Exchanges other
+    than successful polls are ignored.
+
+    Returns:
+        tuple[int, int]: Polls applied and polls that changed the data.
+    """
+    applied = changed = 0
+    for exchange in exchanges:
+        if exchange.is_poll:
+            applied += 1
+            if provider._apply_poll_payload(exchange.body):
+                changed += 1
+    return applied, changed
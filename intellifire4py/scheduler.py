@@ -0,0 +1,81 @@
+"""Per device request scheduling."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import IntEnum
+
+
+class RequestPriority(IntEnum):
+    """Order in which queued requests are granted - lower values go first."""
+
+    COMMAND = 0
+    POLL = 1
+
+
+class IntelliFireRequestScheduler:
+    """Serialize all requests to a single fireplace.
+
+    The embedded WiFi module copes badly with concurrent connections, so only one request is ever in
+    flight. Waiting requests are granted strictly by :class:`RequestPriority` and then in arrival order,
+    which means a queued command always goes out before a queued poll. Polling is therefore paused for
+    the duration of a command without cancelling the polling task.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an idle scheduler."""
+        self._busy = False
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def is_busy(self) -> bool:
+        """Return whether a request is currently in flight."""
+        return self._busy
+
+    @property
+    def pending(self) -> int:
+        """Return the number of requests waiting for their turn."""
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    @asynccontextmanager
+    async def slot(self, priority: RequestPriority) -> AsyncIterator[None]:
+        """Wait for exclusive access to the device and hold it for the duration of the block.
+
+        Args:
+            priority (RequestPriority): Priority of the request.
+        """
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: RequestPriority) -> None:
+        """Wait until this request is allowed to go out."""
+        if not self._busy and not self._waiters:
+            self._busy = True
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled - pass it on
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the device to the next waiting request, or mark it idle."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._busy = False
@@ -0,0 +1,217 @@
+"""Compact immutable poll data snapshots."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable, Mapping, Sequence
+from json import JSONDecodeError
+from typing import Any
+
+import pydantic_core
+
+from .model import IntelliFirePollData
+
+_TRUE_STRINGS = frozenset({"1", "true", "t", "yes", "y", "on"})
+
+
+def _to_bool(value: Any) -> bool:
+    """Coerce a firmware flag (usually `0`/`1`) to bool."""
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_STRINGS
+    return bool(value)
+
+
+def _to_str(value: Any) -> str:
+    """Coerce to str and intern it, so identical brands, versions and addresses share one object."""
+    return sys.intern(str(value))
+
+
+def _to_errors(value: Any) -> tuple[int, ...]:
+    """Coerce an error list to an immutable tuple."""
+    return tuple(int(code) for code in value)
+
+
+_CONVERTERS: dict[Any, Callable[[Any], Any]] = {
+    int: int,
+    bool: _to_bool,
+    str: _to_str,
+    list[int]: _to_errors,
+}
+
+# Every IntelliFirePollData field in declaration order, with its converter and converted default
+_FIELDS: tuple[str, ...] = tuple(IntelliFirePollData.model_fields)
+_CONVERT: tuple[Callable[[Any], Any], ...] = tuple(
+    _CONVERTERS[info.annotation] for info in IntelliFirePollData.model_fields.values()
+)
+_DEFAULTS: tuple[Any, ...] = tuple(
+    convert(info.get_default(call_default_factory=True))
+    for convert, info in zip(
+        _CONVERT, IntelliFirePollData.model_fields.values(), strict=True
+    )
+)
+# Raw JSON key (alias or field name) -> (field index, converter)
+_KEYS: dict[str, tuple[int, Callable[[Any], Any]]] = {}
+for _index, (_name, _info) in enumerate(IntelliFirePollData.model_fields.items()):
+    _KEYS[_name] = (_index, _CONVERT[_index])
+    if _info.alias:
+        _KEYS[_info.alias] = (_index, _CONVERT[_index])
+
+
+def _convert(raw: Mapping[str, Any]) -> list[Any]:
+    """Return every field value in declaration order, converting known keys of `raw`."""
+    values = list(_DEFAULTS)
+    for key, value in raw.items():
+        slot = _KEYS.get(key)
+        if slot is not None:
+            values[slot[0]] = slot[1](value)
+    return values
+
+
+class IntelliFireSnapshot:
+    """Immutable, slotted copy of :class:`IntelliFirePollData`.
+
+    A snapshot holds the same fields as the pydantic model, in a fraction of the memory: there is no
+    per-instance `__dict__` or validation state, `errors` is a tuple and strings such as `brand`,
+    `fw_version` or `ipv4_address` are interned so thousands of snapshots share one copy. Use it to
+    keep history or to track many fireplaces; convert back with :func:`to_poll_data` for the computed
+    properties.
+
+    Example:
+
+        .. code:: Python
+
+            snapshot = IntelliFireSnapshot.from_json(await response.read())
+            data = snapshot.to_poll_data()
+    """
+
+    __slots__ = tuple(_FIELDS)
+
+    battery: int
+    brand: str
+    connection_quality: int
+    downtime: int
+    ecm_latency: int
+    errors: tuple[int, ...]
+    fanspeed: int
+    flameheight: int
+    fw_ver_str: str
+    fw_version: str
+    has_fan: bool
+    has_light: bool
+    has_power_vent: bool
+    has_thermostat: bool
+    ipv4_address: str
+    is_hot: bool
+    is_on: bool
+    light_level: int
+    name: str
+    pilot_on: bool
+    prepurge: int
+    raw_thermostat_setpoint: int
+    serial: str
+    temperature_c: int
+    thermostat_on: bool
+    timer_on: bool
+    timeremaining_s: int
+    uptime: int
+
+    def __init__(self, **values: Any) -> None:
+        """Create a snapshot from field names or raw poll keys; missing fields take the model defaults.
+
+        Raises:
+            TypeError: If a key is neither a field nor an alias of :class:`IntelliFirePollData`.
+        """
+        unknown = values.keys() - _KEYS.keys()
+        if unknown:
+            raise TypeError(f"Unknown IntelliFirePollData field: {', '.join(unknown)}")
+        self.__setstate__(_convert(values))
+
+    @classmethod
+    def from_json(cls, payload: bytes | str) -> IntelliFireSnapshot:
+        """Build a snapshot straight from a raw poll response body, without a pydantic model.
+
+        Keys the model does not know are ignored, as they are by :func:`IntelliFirePollData.from_json`.
+
+        Raises:
+            JSONDecodeError: If the payload is not valid JSON.
+            ValueError: If the JSON is not an object, like the `ValidationError` (a `ValueError`) raised
+                by :func:`IntelliFirePollData.from_json`.
+        """
+        try:
+            raw = pydantic_core.from_json(payload)
+        except ValueError as error:
+            doc = (
+                payload.decode(errors="replace")
+                if isinstance(payload, bytes)
+                else payload
+            )
+            raise JSONDecodeError(str(error), doc, 0) from error
+        if not isinstance(raw, dict):
+            raise ValueError(
+                f"Poll payload is a JSON {type(raw).__name__}, not an object"
+            )
+        return cls.from_mapping(raw)
+
+    @classmethod
+    def from_mapping(cls, raw: Mapping[str, Any]) -> IntelliFireSnapshot:
+        """Build a snapshot from a decoded poll payload, ignoring unknown keys."""
+        snapshot = cls.__new__(cls)
+        snapshot.__setstate__(_convert(raw))
+        return snapshot
+
+    @classmethod
+    def from_poll_data(cls, data: IntelliFirePollData) -> IntelliFireSnapshot:
+        """Copy an :class:`IntelliFirePollData` into a snapshot."""
+        return cls(**{name: getattr(data, name) for name in _FIELDS})
+
+    def to_poll_data(self) -> IntelliFirePollData:
+        """Return an equivalent :class:`IntelliFirePollData`."""
+        return IntelliFirePollData.model_validate(self.as_dict())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fields by name, with `errors` as a list like the model."""
+        values = {name: getattr(self, name) for name in _FIELDS}
+        values["errors"] = list(self.errors)
+        return values
+
+    def replace(self, **changes: Any) -> IntelliFireSnapshot:
+        """Return a copy with some fields changed."""
+        return type(self)(**{**self.as_dict(), **changes})
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Reject assignment; snapshots are immutable."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        """Reject deletion; snapshots are immutable."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        """Pickle as a plain tuple of field values."""
+        return tuple(getattr(self, name) for name in _FIELDS)
+
+    def __setstate__(self, state: Sequence[Any]) -> None:
+        """Restore from :func:`__getstate__`."""
+        for set_slot, value in zip(_SLOT_SETTERS, state, strict=True):
+            set_slot(self, value)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare field by field."""
+        if not isinstance(other, IntelliFireSnapshot):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def __hash__(self) -> int:
+        """Hash the field values."""
+        return hash(self.__getstate__())
+
+    def __repr__(self) -> str:
+        """Show every field."""
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in _FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+# Slot descriptors bypass the immutable __setattr__ and the attribute lookup while building
+_SLOT_SETTERS: tuple[Callable[[IntelliFireSnapshot, Any], None], ...] = tuple(
+    IntelliFireSnapshot.__dict__[name].__set__ for name in _FIELDS
+)
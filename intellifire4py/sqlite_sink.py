@@ -0,0 +1,259 @@
+"""SQLite persistence of fireplace state changes."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
+
+from .model import IntelliFirePollData
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .unified_fireplace import UnifiedFireplace
+
+_T = TypeVar("_T")
+
+# Columns stored per state change, besides serial and timestamp
+SQLITE_COLUMNS: tuple[str, ...] = (
+    "is_on",
+    "pilot_on",
+    "temperature_c",
+    "flameheight",
+    "fanspeed",
+    "light_level",
+    "thermostat_on",
+    "raw_thermostat_setpoint",
+    "timer_on",
+    "timeremaining_s",
+    "error_mask",
+    "ecm_latency",
+    "connection_quality",
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS poll_history (
+    serial TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    {", ".join(f"{column} INTEGER NOT NULL" for column in SQLITE_COLUMNS)},
+    errors TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_poll_history_serial_timestamp
+    ON poll_history (serial, timestamp);
+"""
+# Built from the fixed column list above, never from user input
+_INSERT_COLUMNS = ", ".join(("serial", "timestamp", *SQLITE_COLUMNS, "errors"))
+_INSERT = "INSERT INTO poll_history ({}) VALUES ({})".format(  # noqa: S608
+    _INSERT_COLUMNS, ", ".join("?" * (len(SQLITE_COLUMNS) + 3))
+)
+# Rows where a column differs from the previous row of the same fireplace
+_TRANSITIONS = """
+SELECT timestamp, value FROM (
+    SELECT timestamp, {column} AS value, LAG({column}) OVER (ORDER BY timestamp) AS previous
+    FROM poll_history
+    WHERE serial = ? AND timestamp BETWEEN ? AND ?
+)
+WHERE previous IS NULL OR previous != value
+ORDER BY timestamp
+"""
+
+
+class IntelliFireErrorEpisode(NamedTuple):
+    """A span of time during which a fireplace reported an error code."""
+
+    code: int
+    start: float
+    end: float | None
+
+
+class IntelliFireSQLiteSink:
+    """Write fireplace state changes to SQLite and answer runtime and error questions from them.
+
+    The sink subscribes to a :class:`UnifiedFireplace` and stores one row per change that polling
+    already detected, so logging adds no device traffic. Rows are buffered and written in batches,
+    each in a single transaction, on a dedicated worker thread so the event loop never waits on disk.
+
+    Example:
+
+        .. code:: Python
+
+            sink = IntelliFireSQLiteSink("fireplaces.db")
+            sink.attach(fireplace)
+            ...
+            hours = await sink.runtime_hours(fireplace.serial, start=last_week)
+            await sink.close()
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        batch_size: int = 100,
+        flush_interval_seconds: float = 60.0,
+    ) -> None:
+        """Prepare a sink; the database is opened on the worker thread on first use.
+
+        Args:
+            path (str | os.PathLike): SQLite database file, created if missing.
+            batch_size (int): Buffered rows that trigger a write.
+            flush_interval_seconds (float): Write buffered rows on the next change once this much time
+                has passed since the last write, however few there are.
+        """
+        self._log = logging.getLogger(__name__)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._rows: list[tuple[Any, ...]] = []
+        self._last_flush = time.monotonic()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="intellifire-sqlite"
+        )
+        self._connection: sqlite3.Connection | None = None
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+
+    def attach(self, fireplace: UnifiedFireplace) -> Callable[[], None]:
+        """Record every change of a fireplace's data, returning a function that detaches it again."""
+        serial = fireplace.serial
+        return fireplace.add_listener(
+            lambda data, changes: self.record(
+                serial, data, datetime.now(timezone.utc).timestamp()
+            )
+        )
+
+    def record(self, serial: str, data: IntelliFirePollData, timestamp: float) -> None:
+        """Buffer a row and start a background write when the batch is full or due."""
+        self._rows.append(
+            (
+                serial,
+                timestamp,
+                *(int(getattr(data, column)) for column in SQLITE_COLUMNS),
+                ",".join(str(code) for code in data.errors),
+            )
+        )
+        if (
+            len(self._rows) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_interval_seconds
+        ):
+            try:
+                task = asyncio.get_running_loop().create_task(self.flush())
+            except RuntimeError:
+                return  # No loop to write from; the rows go out with the next flush
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self) -> None:
+        """Write all buffered rows in one transaction."""
+        rows, self._rows = self._rows, []
+        self._last_flush = time.monotonic()
+        if rows:
+            try:
+                await self._run(self._insert, rows)
+            except sqlite3.Error as error:
+                self._log.error("Failed to write %d rows: %s", len(rows), error)
+
+    async def close(self) -> None:
+        """Write pending rows, close the database and stop the worker thread."""
+        if self._flush_tasks:
+            await asyncio.wait(self._flush_tasks)
+        await self.flush()
+        await self._run(self._close_connection)
+        self._executor.shutdown()
+
+    async def _run(self, function: Callable[..., _T], *args: Any) -> _T:
+        """Run a database call on the worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, function, *args
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the worker thread's connection, creating the schema on first use."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+    def _insert(self, rows: list[tuple[Any, ...]]) -> None:
+        """Insert rows in a single transaction."""
+        connection = self._connect()
+        with connection:
+            connection.executemany(_INSERT, rows)
+
+    def _close_connection(self) -> None:
+        """Close the connection, if open."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _transitions(
+        self, column: str, serial: str, start: float, end: float
+    ) -> list[tuple[float, Any]]:
+        """Return `(timestamp, value)` for each row where `column` changed."""
+        return (
+            self._connect()
+            .execute(_TRANSITIONS.format(column=column), (serial, start, end))
+            .fetchall()
+        )
+
+    async def flame_on_intervals(
+        self, serial: str, start: float = 0.0, end: float | None = None
+    ) -> list[tuple[float, float]]:
+        """Return the `(on, off)` timestamps of each period the flame was on.
+
+        Args:
+            serial (str): Fireplace serial.
+            start (float): Only consider rows from this timestamp. Defaults to all history.
+            end (float, optional): Only consider rows up to this timestamp, which also closes a period
+                still running. Defaults to now.
+        """
+        until = datetime.now(timezone.utc).timestamp() if end is None else end
+        intervals = []
+        on_since = None
+        for timestamp, is_on in await self._run(
+            self._transitions, "is_on", serial, start, until
+        ):
+            if is_on:
+                on_since = timestamp
+            elif on_since is not None:
+                intervals.append((on_since, timestamp))
+                on_since = None
+        if on_since is not None:
+            intervals.append((on_since, until))
+        return intervals
+
+    async def runtime_hours(
+        self, serial: str, start: float = 0.0, end: float | None = None
+    ) -> float:
+        """Return the total hours the flame was on, see :func:`flame_on_intervals`."""
+        intervals = await self.flame_on_intervals(serial, start, end)
+        return sum(off - on for on, off in intervals) / 3600
+
+    async def error_episodes(
+        self, serial: str, start: float = 0.0, end: float | None = None
+    ) -> list[IntelliFireErrorEpisode]:
+        """Return each period an error code was reported, ordered by start.
+
+        Codes are the raw firmware values, including ones :class:`IntelliFireErrorCode` does not know.
+        Episodes still open at `end` have `end=None`.
+        """
+        until = datetime.now(timezone.utc).timestamp() if end is None else end
+        episodes = []
+        open_since: dict[int, float] = {}
+        for timestamp, errors in await self._run(
+            self._transitions, "errors", serial, start, until
+        ):
+            codes = {int(code) for code in errors.split(",") if code}
+            for code in codes - open_since.keys():
+                open_since[code] = timestamp
+            for code in open_since.keys() - codes:
+                episodes.append(
+                    IntelliFireErrorEpisode(code, open_since.pop(code), timestamp)
+                )
+        episodes.extend(
+            IntelliFireErrorEpisode(code, since, None)
+            for code, since in open_since.items()
+        )
+        return sorted(episodes, key=lambda episode: (episode.start, episode.code))
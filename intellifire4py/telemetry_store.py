@@ -0,0 +1,334 @@
+"""Compressed append-only on-disk telemetry storage."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Sequence
+from itertools import accumulate
+from pathlib import Path
+from types import TracebackType
+from typing import NamedTuple
+
+from .history import HISTORY_FIELDS
+from .model import IntelliFirePollData
+
+_MAGIC = b"IFTS"
+_VERSION = 1
+# magic, version, header length
+_FILE_HEADER = struct.Struct("<4sBH")
+# payload length, sample count, first and last timestamp in milliseconds
+_BLOCK_HEADER = struct.Struct("<IIqq")
+
+
+class _Block(NamedTuple):
+    """Location and time range of a block in the file."""
+
+    offset: int
+    length: int
+    samples: int
+    first: int
+    last: int
+
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    """Append an unsigned LEB128 varint."""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _encode_column(values: Sequence[int], order: int, out: bytearray) -> None:
+    """Append `values` as run-length encoded, zigzagged differences of the given order.
+
+    Telemetry fields rarely change, so first order differences are mostly runs of zeros; poll
+    timestamps are nearly periodic, so their second order differences (delta-of-delta) are too.
+    Each run is written as two varints: the zigzagged difference and the run length.
+    """
+    diffs = list(values)
+    for _ in range(order):
+        diffs = [diffs[0]] + [b - a for a, b in zip(diffs, diffs[1:], strict=False)]
+    index = 0
+    while index < len(diffs):
+        value = diffs[index]
+        end = index + 1
+        while end < len(diffs) and diffs[end] == value:
+            end += 1
+        _encode_varint(value << 1 if value >= 0 else (-value << 1) - 1, out)
+        _encode_varint(end - index, out)
+        index = end
+
+
+def _decode_column(
+    data: bytes | mmap.mmap, position: int, count: int, order: int
+) -> tuple[list[int], int]:
+    """Decode a column written by :func:`_encode_column`, returning the values and the next position."""
+    diffs: list[int] = []
+    numbers = [0, 0]
+    while len(diffs) < count:
+        for slot in (0, 1):
+            shift = result = 0
+            while True:
+                byte = data[position]
+                position += 1
+                result |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            numbers[slot] = result
+        zigzag, run = numbers
+        diffs.extend([(zigzag >> 1) ^ -(zigzag & 1)] * run)
+    for _ in range(order):
+        diffs = list(accumulate(diffs))
+    return diffs, position
+
+
+class IntelliFireTelemetryStore:
+    """Append-only, block compressed file of poll telemetry for long term retention.
+
+    Samples are buffered in memory and written `block_size` at a time. Each block stores its
+    timestamps as delta-of-delta and every field as run-length encoded deltas, all as varints, so a
+    fireplace polled every 15 seconds whose state rarely changes costs a few bytes per sample. Blocks
+    are only ever appended; a block left incomplete by a crash is truncated on the next open. Reads
+    memory-map the file and decode only the blocks overlapping the requested time range.
+
+    File access is blocking, so call it from an executor if blocks are large or the disk is slow.
+
+    Example:
+
+        .. code:: Python
+
+            store = IntelliFireTelemetryStore("living_room.ifts")
+            fireplace.add_listener(lambda data, changes: store.record(data, time.time()))
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        fields: Iterable[str] = HISTORY_FIELDS,
+        block_size: int = 1024,
+    ) -> None:
+        """Open or create a store.
+
+        Args:
+            path (str | os.PathLike): File to append to.
+            fields (Iterable[str]): Fields to store, from :data:`HISTORY_FIELDS`. Must match the fields
+                of an existing file.
+            block_size (int): Samples buffered before a block is written.
+
+        Raises:
+            ValueError: If the file is not a telemetry store or was written with other fields.
+        """
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.path = Path(path)
+        self.fields = tuple(fields)
+        unknown = set(self.fields) - set(HISTORY_FIELDS)
+        if unknown:
+            raise ValueError(f"Unsupported fields: {', '.join(sorted(unknown))}")
+        self.block_size = block_size
+        self._pending_timestamps: list[int] = []
+        self._pending_values: list[list[int]] = [[] for _ in self.fields]
+        self._blocks: list[_Block] = []
+        self._map: mmap.mmap | None = None
+
+        if self.path.exists() and self.path.stat().st_size:
+            self._data_start = self._read_header()
+            self._scan_blocks()
+        else:
+            header = "\n".join(self.fields).encode()
+            with open(self.path, "wb") as file:
+                file.write(_FILE_HEADER.pack(_MAGIC, _VERSION, len(header)) + header)
+            self._data_start = _FILE_HEADER.size + len(header)
+        self._file = open(self.path, "ab")  # noqa: SIM115
+
+    def __enter__(self) -> IntelliFireTelemetryStore:
+        """Return the store."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Flush and close the store."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of samples, including buffered ones."""
+        return sum(block.samples for block in self._blocks) + len(
+            self._pending_timestamps
+        )
+
+    def _read_header(self) -> int:
+        """Validate the file header and return where the blocks start."""
+        with open(self.path, "rb") as file:
+            magic, version, length = _FILE_HEADER.unpack(file.read(_FILE_HEADER.size))
+            fields = tuple(file.read(length).decode().split("\n"))
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{self.path} is not an IntelliFire telemetry store")
+        if fields != self.fields:
+            raise ValueError(
+                f"{self.path} stores {', '.join(fields)}, not {', '.join(self.fields)}"
+            )
+        return _FILE_HEADER.size + length
+
+    def _scan_blocks(self) -> None:
+        """Index the block headers, truncating a trailing partial block."""
+        size = self.path.stat().st_size
+        offset = self._data_start
+        with open(self.path, "rb") as file:
+            while offset + _BLOCK_HEADER.size <= size:
+                file.seek(offset)
+                length, count, first, last = _BLOCK_HEADER.unpack(
+                    file.read(_BLOCK_HEADER.size)
+                )
+                if offset + _BLOCK_HEADER.size + length > size:
+                    break
+                self._blocks.append(
+                    _Block(offset + _BLOCK_HEADER.size, length, count, first, last)
+                )
+                offset += _BLOCK_HEADER.size + length
+        if offset != size:
+            os.truncate(self.path, offset)
+
+    def record(self, data: IntelliFirePollData, timestamp: float) -> None:
+        """Append the stored fields of a poll, stamped with `timestamp` in seconds since the epoch."""
+        self.append(timestamp, [int(getattr(data, field)) for field in self.fields])
+
+    def append(self, timestamp: float, values: Sequence[int]) -> None:
+        """Append one sample of raw field values, in :attr:`fields` order.
+
+        Timestamps are stored with millisecond precision; one older than the previous sample is
+        clamped to it so blocks stay ordered.
+        """
+        millis = round(timestamp * 1000)
+        if self._pending_timestamps:
+            millis = max(millis, self._pending_timestamps[-1])
+        elif self._blocks:
+            millis = max(millis, self._blocks[-1].last)
+        self._pending_timestamps.append(millis)
+        for column, value in zip(self._pending_values, values, strict=True):
+            column.append(value)
+        if len(self._pending_timestamps) >= self.block_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered samples as a new block."""
+        if not self._pending_timestamps:
+            return
+        payload = bytearray()
+        _encode_column(self._pending_timestamps, 2, payload)
+        for column in self._pending_values:
+            _encode_column(column, 1, payload)
+        header = _BLOCK_HEADER.pack(
+            len(payload),
+            len(self._pending_timestamps),
+            self._pending_timestamps[0],
+            self._pending_timestamps[-1],
+        )
+        offset = self._file.tell()
+        self._file.write(header + payload)
+        self._file.flush()
+        self._blocks.append(
+            _Block(
+                offset + _BLOCK_HEADER.size,
+                len(payload),
+                len(self._pending_timestamps),
+                self._pending_timestamps[0],
+                self._pending_timestamps[-1],
+            )
+        )
+        self._pending_timestamps = []
+        self._pending_values = [[] for _ in self.fields]
+
+    def close(self) -> None:
+        """Flush buffered samples and release the file."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _mapped(self) -> mmap.mmap:
+        """Return a read-only memory map covering every written block."""
+        end = self._blocks[-1].offset + self._blocks[-1].length
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+            with open(self.path, "rb") as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def query(
+        self,
+        fields: Iterable[str] | None = None,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> dict[str, array]:
+        """Return the samples between `start` and `end` (inclusive), oldest first.
+
+        Args:
+            fields (Iterable[str], optional): Fields to return. Defaults to every stored field.
+            start (float, optional): Earliest timestamp in seconds. Defaults to the first sample.
+            end (float, optional): Latest timestamp in seconds. Defaults to the newest sample.
+
+        Returns:
+            dict[str, array]: A `timestamp` array in seconds plus one array per field, all the same
+            length, in the same shape as :func:`IntelliFireHistory.query`.
+        """
+        wanted = self.fields if fields is None else tuple(fields)
+        columns = [self.fields.index(field) for field in wanted]
+        low = None if start is None else round(start * 1000)
+        high = None if end is None else round(end * 1000)
+
+        timestamps: list[int] = []
+        values: list[list[int]] = [[] for _ in wanted]
+        chunks = [
+            self._decode_block(block, columns)
+            for block in self._blocks
+            if (low is None or block.last >= low)
+            and (high is None or block.first <= high)
+        ]
+        if self._pending_timestamps:
+            chunks.append(
+                (
+                    self._pending_timestamps,
+                    [self._pending_values[column] for column in columns],
+                )
+            )
+        for chunk_timestamps, chunk_values in chunks:
+            first = 0 if low is None else bisect_left(chunk_timestamps, low)
+            last = (
+                len(chunk_timestamps)
+                if high is None
+                else bisect_right(chunk_timestamps, high)
+            )
+            timestamps.extend(chunk_timestamps[first:last])
+            for target, source in zip(values, chunk_values, strict=True):
+                target.extend(source[first:last])
+
+        result: dict[str, array] = {
+            "timestamp": array("d", [millis / 1000 for millis in timestamps])
+        }
+        for field, column_values in zip(wanted, values, strict=True):
+            result[field] = array("q", column_values)
+        return result
+
+    def _decode_block(
+        self, block: _Block, columns: list[int]
+    ) -> tuple[list[int], list[list[int]]]:
+        """Decode the timestamps and requested columns of a block."""
+        data = self._mapped()
+        timestamps, position = _decode_column(data, block.offset, block.samples, 2)
+        decoded = {}
+        for column in range(max(columns, default=-1) + 1):
+            decoded[column], position = _decode_column(data, position, block.samples, 1)
+        return timestamps, [decoded[column] for column in columns]
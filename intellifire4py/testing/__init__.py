@@ -0,0 +1,22 @@
+"""Simulated IntelliFire devices for tests and benchmarks.
+
+These run real `aiohttp.web` servers, so they are kept out of the package root and only loaded when
+imported from here.
+"""
+
+from __future__ import annotations
+
+from .cloud_simulator import IntelliFireCloudAccount  # noqa: F401
+from .cloud_simulator import IntelliFireCloudFaults  # noqa: F401
+from .cloud_simulator import IntelliFireCloudSimulator  # noqa: F401
+from .local_simulator import IntelliFireLocalSimulator  # noqa: F401
+from .local_simulator import IntelliFireVirtualFireplace  # noqa: F401
+
+
+__all__ = [
+    "IntelliFireCloudAccount",
+    "IntelliFireCloudFaults",
+    "IntelliFireCloudSimulator",
+    "IntelliFireLocalSimulator",
+    "IntelliFireVirtualFireplace",
+]
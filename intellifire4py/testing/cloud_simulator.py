@@ -0,0 +1,551 @@
+"""Simulated iftapi.net cloud service."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import secrets
+import socket
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import TracebackType
+from typing import Any
+from urllib.parse import parse_qsl
+
+import aiohttp
+from aiohttp import ClientSession, web
+from aiohttp.abc import AbstractResolver, ResolveResult
+
+from ..const import (
+    CLOUD_LONG_POLL_QUEUE_SECONDS,
+    CLOUD_LONG_POLL_SERVER_TIMEOUT_SECONDS,
+    IntelliFireCommand,
+)
+from .local_simulator import IntelliFireVirtualFireplace
+
+CLOUD_HOST = "iftapi.net"
+# Cloud command name -> local command name and allowed range
+_CLOUD_COMMANDS: dict[str, tuple[str, int, int]] = {
+    command.value["cloud_command"]: (  # type: ignore
+        command.value["local_command"],
+        command.value["min"],
+        command.value["max"],
+    )
+    for command in IntelliFireCommand
+}
+# Local poll payload keys that iftapi.net reports under another name
+_CLOUD_KEYS = {
+    "connection_quality": "remote_connection_quality",
+    "downtime": "remote_downtime",
+    "uptime": "remote_uptime",
+    "fw_ver_str": "firmware_version_string",
+    "fw_version": "firmware_version",
+}
+# Keys whose changes alone do not produce a long poll update
+_IGNORED_CHANGES = frozenset({"timeremaining"})
+
+
+@dataclass
+class IntelliFireCloudAccount:
+    """Credentials, cookies and fireplaces of one simulated cloud user.
+
+    Attributes:
+        username: Login name.
+        password: Login password.
+        user_id: Value of the `user` cookie, also the user id local commands are signed for.
+        auth_cookie: Value of the `auth_cookie` cookie.
+        web_client_id: Value of the `web_client_id` cookie.
+        locations: Location id to location name.
+        fireplaces: Fireplace serial to location id.
+    """
+
+    username: str
+    password: str
+    user_id: str
+    auth_cookie: str
+    web_client_id: str
+    locations: dict[str, str] = field(default_factory=dict)
+    fireplaces: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class IntelliFireCloudFaults:
+    """Network conditions applied to every request the simulated cloud receives.
+
+    Attributes:
+        latency: Seconds added before each request is handled.
+        jitter: Up to this many random extra seconds per request.
+        error_rate: Fraction of requests answered with `error_status` instead.
+        error_status: Status of injected errors.
+        drop_rate: Fraction of requests whose connection is dropped without a response.
+        outage: Answer every request with `error_status`, as during a service outage.
+        endpoints: Endpoint names (e.g. `apppoll`) the faults apply to. Defaults to all of them.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    drop_rate: float = 0.0
+    outage: bool = False
+    endpoints: frozenset[str] | None = None
+
+
+class _CloudFireplace:
+    """A fireplace registered with the cloud and its long poll status queue."""
+
+    def __init__(
+        self,
+        fireplace: IntelliFireVirtualFireplace,
+        account: IntelliFireCloudAccount,
+        brand: str,
+    ) -> None:
+        self.fireplace = fireplace
+        self.account = account
+        self.brand = brand
+        self.version = 0
+        self.updated = datetime.now(timezone.utc)
+        # (version, loop time, body) of each status update still queued
+        self.queue: deque[tuple[int, float, bytes]] = deque()
+        self.changed = asyncio.Event()
+        self._significant = self._significant_state()
+
+    def _significant_state(self) -> dict[str, Any]:
+        """Return the state without keys whose changes are not reported."""
+        return {
+            key: value
+            for key, value in self.fireplace.state.items()
+            if key not in _IGNORED_CHANGES
+        }
+
+    def payload(self) -> bytes:
+        """Return the status as iftapi.net formats it: values as strings and remote_* keys."""
+        status: dict[str, Any] = {"brand": self.brand}
+        for key, value in self.fireplace.state.items():
+            if key != "serial":
+                status[_CLOUD_KEYS.get(key, key)] = (
+                    value if key == "errors" else str(value)
+                )
+        # The address the device reports, reachable through the local simulator if it serves it
+        status["ipv4_address"] = (
+            self.fireplace.address or self.fireplace.state["ipv4_address"]
+        )
+        status["schedule_enable"] = "0"
+        status["timestamp"] = int(self.updated.timestamp())
+        return json.dumps(status).encode()
+
+    def push(self, now: float, queue_seconds: float) -> None:
+        """Queue the current status if it changed in more than the time remaining."""
+        significant = self._significant_state()
+        if significant == self._significant:
+            return
+        self._significant = significant
+        self.version += 1
+        self.updated = datetime.now(timezone.utc)
+        self.queue.append((self.version, now, self.payload()))
+        self.expire(now, queue_seconds)
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def expire(self, now: float, queue_seconds: float) -> None:
+        """Drop updates older than the queue window."""
+        while self.queue and now - self.queue[0][1] > queue_seconds:
+            self.queue.popleft()
+
+    def next_update(self, seen: int) -> tuple[int, float, bytes] | None:
+        """Return the oldest queued update newer than version `seen`."""
+        for update in self.queue:
+            if update[0] > seen:
+                return update
+        return None
+
+
+class _SimulatorResolver(AbstractResolver):
+    """Resolve iftapi.net to the simulator and every other host normally."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self._host = host
+        self._port = port
+        self._fallback: aiohttp.ThreadedResolver | None = None
+
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> list[ResolveResult]:
+        if host != CLOUD_HOST:
+            if self._fallback is None:
+                self._fallback = aiohttp.ThreadedResolver()
+            return await self._fallback.resolve(host, port, family)
+        return [
+            {
+                "hostname": host,
+                "host": self._host,
+                "port": self._port,
+                "family": socket.AF_INET,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST,
+            }
+        ]
+
+    async def close(self) -> None:
+        if self._fallback is not None:
+            await self._fallback.close()
+
+
+class IntelliFireCloudSimulator:
+    """Serve the iftapi.net endpoints used by this library for any number of accounts and fireplaces.
+
+    Implements `login` (setting the `user`, `auth_cookie` and `web_client_id` cookies),
+    `enumlocations`, `enumfireplaces`, `apppoll`, `apppost` and `applongpoll`. Long polls follow the
+    documented queue semantics: status changes other than the time remaining counting down are
+    queued for 30 seconds under an increasing Etag, a request returns the first update newer than
+    its `If-None-Match` (or newer than the requester's last `apppoll`) and `408` after 57 seconds
+    without one. Both durations are multiplied by `time_scale` so tests need not wait for them.
+
+    Fireplaces are :class:`IntelliFireVirtualFireplace` objects, so one registered here can also be
+    served by an :class:`IntelliFireLocalSimulator`: the cloud then reports its local address, and
+    commands sent either way change the same state and wake pending long polls. Use
+    :func:`session` to reach the simulator as `iftapi.net`, together with `use_http=True`.
+
+    Example:
+
+        .. code:: Python
+
+            async with IntelliFireCloudSimulator() as cloud:
+                account = cloud.add_account("user@example.com", "secret")
+                cloud.add_fireplace(account)
+                async with IntelliFireCloudInterface(
+                    use_http=True, session=cloud.session()
+                ) as interface:
+                    await interface.login_with_credentials(
+                        username="user@example.com", password="secret"
+                    )
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        time_scale: float = 1.0,
+        seed: int | None = None,
+    ) -> None:
+        """Create a stopped simulator.
+
+        Args:
+            host (str): Address to listen on.
+            time_scale (float): Multiplier for the long poll timeout and queue window.
+            seed (int, optional): Seed for latency jitter and injected faults, for repeatable runs.
+        """
+        self._log = logging.getLogger(__name__)
+        self.host = host
+        self.port = 0
+        self.time_scale = time_scale
+        self.faults = IntelliFireCloudFaults()
+        self.stats: Counter[str] = Counter()
+        self.accounts: dict[str, IntelliFireCloudAccount] = {}
+        self._by_cookie: dict[str, IntelliFireCloudAccount] = {}
+        self._fireplaces: dict[str, _CloudFireplace] = {}
+        # Queue position of each (auth cookie, serial) as of its last apppoll
+        self._synced: dict[tuple[str, str], int] = {}
+        self._random = random.Random(seed)  # noqa: S311
+        self._sessions: list[ClientSession] = []
+        app = web.Application(middlewares=[self._apply_faults])
+        app.router.add_post("/a/login", self._handle_login)
+        app.router.add_get("/a/enumlocations", self._handle_locations)
+        app.router.add_get("/a/enumfireplaces", self._handle_fireplaces)
+        for path in ("/a/{serial}/apppoll", "/a/{serial}//apppoll"):
+            app.router.add_get(path, self._handle_poll)
+        app.router.add_get("/a/{serial}/applongpoll", self._handle_long_poll)
+        for path in ("/a/{serial}/apppost", "/a/{serial}//apppost"):
+            app.router.add_post(path, self._handle_post)
+        self._runner = web.AppRunner(app, access_log=None)
+        self._started = False
+
+    async def __aenter__(self) -> IntelliFireCloudSimulator:
+        """Start serving."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Stop serving."""
+        await self.stop()
+
+    async def start(self) -> None:
+        """Start listening on a free port of :attr:`host`."""
+        if self._started:
+            return
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        self._started = True
+
+    async def stop(self) -> None:
+        """Close the sessions created by :func:`session` and stop serving."""
+        for session in self._sessions:
+            await session.close()
+        self._sessions.clear()
+        if self._started:
+            await self._runner.cleanup()
+            self._started = False
+
+    def resolver(self) -> AbstractResolver:
+        """Return a resolver directing `iftapi.net` to the running simulator."""
+        return _SimulatorResolver(self.host, self.port)
+
+    def session(self, **kwargs: Any) -> ClientSession:
+        """Return a :class:`aiohttp.ClientSession` reaching the simulator as `iftapi.net`.
+
+        The session is closed by :func:`stop`; keyword arguments are passed on to it.
+        """
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(resolver=self.resolver()), **kwargs
+        )
+        self._sessions.append(session)
+        return session
+
+    def add_account(
+        self,
+        username: str | None = None,
+        password: str = "password",  # noqa: S107
+        *,
+        user_id: str | None = None,
+    ) -> IntelliFireCloudAccount:
+        """Register a user; missing usernames and user ids are generated."""
+        account = IntelliFireCloudAccount(
+            username=username or f"{secrets.token_hex(6)}@example.com",
+            password=password,
+            user_id=user_id or secrets.token_hex(16).upper(),
+            auth_cookie=secrets.token_hex(16).upper(),
+            web_client_id=secrets.token_hex(16).upper(),
+        )
+        self.accounts[account.username] = account
+        self._by_cookie[account.auth_cookie] = account
+        return account
+
+    def add_fireplace(
+        self,
+        account: IntelliFireCloudAccount,
+        fireplace: IntelliFireVirtualFireplace | None = None,
+        *,
+        location: str = "Home",
+        brand: str = "H&G",
+        **kwargs: Any,
+    ) -> IntelliFireVirtualFireplace:
+        """Register a fireplace with an account.
+
+        Args:
+            account (IntelliFireCloudAccount): Owner, from :func:`add_account`.
+            fireplace (IntelliFireVirtualFireplace, optional): An existing fireplace, e.g. one served by
+                an :class:`IntelliFireLocalSimulator`. Its user id is set to the account's, as a real
+                fireplace accepts local commands from the user it is registered to. Created if omitted,
+                with the remaining keyword arguments.
+            location (str): Name of the location to list it under, created if the account lacks it.
+            brand (str): Brand reported by `enumfireplaces` and `apppoll`.
+            **kwargs: Passed to :class:`IntelliFireVirtualFireplace` when one is created.
+
+        Returns:
+            IntelliFireVirtualFireplace: The registered fireplace.
+        """
+        if fireplace is None:
+            fireplace = IntelliFireVirtualFireplace(
+                kwargs.pop("serial", None) or secrets.token_hex(16).upper(),
+                api_key=kwargs.pop("api_key", None) or secrets.token_hex(16),
+                user_id=account.user_id,
+                **kwargs,
+            )
+        fireplace.user_id = account.user_id
+        location_id = next(
+            (key for key, name in account.locations.items() if name == location),
+            None,
+        )
+        if location_id is None:
+            location_id = secrets.token_hex(16).upper()
+            account.locations[location_id] = location
+        account.fireplaces[fireplace.serial] = location_id
+
+        record = _CloudFireplace(fireplace, account, brand)
+        self._fireplaces[fireplace.serial] = record
+        fireplace.add_listener(
+            lambda: record.push(
+                self._now(), CLOUD_LONG_POLL_QUEUE_SECONDS * self.time_scale
+            )
+        )
+        return fireplace
+
+    def _now(self) -> float:
+        """Return the event loop clock."""
+        return asyncio.get_running_loop().time()
+
+    def _account(self, request: web.Request) -> IntelliFireCloudAccount:
+        """Return the account whose cookies the request carries.
+
+        Raises:
+            web.HTTPForbidden: If the cookies are missing or unknown.
+        """
+        account = self._by_cookie.get(request.cookies.get("auth_cookie", ""))
+        if account is None or request.cookies.get("user") != account.user_id:
+            raise web.HTTPForbidden()
+        return account
+
+    def _fireplace(self, request: web.Request) -> _CloudFireplace:
+        """Return the requested fireplace of the requesting account.
+
+        Raises:
+            web.HTTPForbidden: For missing or unknown cookies, or a fireplace of another account.
+            web.HTTPNotFound: For an unknown serial.
+        """
+        account = self._account(request)
+        record = self._fireplaces.get(request.match_info["serial"])
+        if record is None:
+            raise web.HTTPNotFound()
+        if record.account is not account:
+            raise web.HTTPForbidden()
+        return record
+
+    @web.middleware
+    async def _apply_faults(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """Count the request and apply :attr:`faults` to it."""
+        endpoint = request.path.rsplit("/", 1)[-1]
+        self.stats[endpoint] += 1
+        faults = self.faults
+        if faults.endpoints is not None and endpoint not in faults.endpoints:
+            return await handler(request)
+        delay = faults.latency + self._random.random() * faults.jitter
+        if delay:
+            await asyncio.sleep(delay)
+        if faults.drop_rate and self._random.random() < faults.drop_rate:
+            self.stats["dropped"] += 1
+            if request.transport is not None:
+                request.transport.close()
+            return web.Response()
+        if faults.outage or (
+            faults.error_rate and self._random.random() < faults.error_rate
+        ):
+            self.stats["error"] += 1
+            return web.Response(status=faults.error_status)
+        return await handler(request)
+
+    async def _handle_login(self, request: web.Request) -> web.StreamResponse:
+        """Check credentials and set the session cookies."""
+        form = await request.post()
+        account = self.accounts.get(str(form.get("username", "")))
+        if account is None or not secrets.compare_digest(
+            str(form.get("password", "")), account.password
+        ):
+            return web.Response(status=403)
+        response = web.Response(status=204)
+        response.set_cookie("user", account.user_id)
+        response.set_cookie("auth_cookie", account.auth_cookie)
+        response.set_cookie("web_client_id", account.web_client_id)
+        return response
+
+    async def _handle_locations(self, request: web.Request) -> web.StreamResponse:
+        """List the account's locations."""
+        account = self._account(request)
+        return web.json_response(
+            {
+                "locations": [
+                    {
+                        "location_id": location_id,
+                        "location_name": name,
+                        "wifi_essid": "",
+                        "wifi_password": "",
+                        "postal_code": "",
+                        "user_class": 3,
+                    }
+                    for location_id, name in account.locations.items()
+                ],
+                "email_notifications_enabled": 0,
+            }
+        )
+
+    async def _handle_fireplaces(self, request: web.Request) -> web.StreamResponse:
+        """List the fireplaces of one of the account's locations."""
+        account = self._account(request)
+        location_id = request.query.get("location_id", "")
+        if location_id not in account.locations:
+            raise web.HTTPNotFound()
+        return web.json_response(
+            {
+                "location_name": account.locations[location_id],
+                "fireplaces": [
+                    {
+                        "serial": serial,
+                        "brand": self._fireplaces[serial].brand,
+                        "name": self._fireplaces[serial].fireplace.state["name"],
+                        "apikey": self._fireplaces[serial].fireplace.api_key,
+                        "power": str(self._fireplaces[serial].fireplace.state["power"]),
+                    }
+                    for serial, location in account.fireplaces.items()
+                    if location == location_id
+                ],
+            }
+        )
+
+    async def _handle_poll(self, request: web.Request) -> web.StreamResponse:
+        """Return the current status and mark the long poll queue position."""
+        record = self._fireplace(request)
+        self._synced[(record.account.auth_cookie, record.fireplace.serial)] = (
+            record.version
+        )
+        return web.Response(body=record.payload(), content_type="text/html")
+
+    async def _handle_long_poll(self, request: web.Request) -> web.StreamResponse:
+        """Return the next queued status update, or `408` once none arrived in time."""
+        record = self._fireplace(request)
+        key = (record.account.auth_cookie, record.fireplace.serial)
+        try:
+            seen = int(request.headers["If-None-Match"])
+        except (KeyError, ValueError):
+            seen = self._synced.get(key, record.version)
+        deadline = (
+            self._now() + CLOUD_LONG_POLL_SERVER_TIMEOUT_SECONDS * self.time_scale
+        )
+        while True:
+            record.expire(self._now(), CLOUD_LONG_POLL_QUEUE_SECONDS * self.time_scale)
+            update = record.next_update(seen)
+            if update is not None:
+                self._synced.pop(key, None)
+                return web.Response(
+                    body=update[2],
+                    content_type="text/html",
+                    headers={"Etag": str(update[0])},
+                )
+            remaining = deadline - self._now()
+            if remaining <= 0:
+                return web.Response(status=408, headers={"Etag": str(seen)})
+            try:
+                await asyncio.wait_for(record.changed.wait(), remaining)
+            except TimeoutError:
+                pass
+
+    async def _handle_post(self, request: web.Request) -> web.StreamResponse:
+        """Apply a command such as `power=1`."""
+        record = self._fireplace(request)
+        form = dict(parse_qsl(await request.text()))
+        if len(form) != 1:
+            return web.Response(status=422)
+        ((command, raw_value),) = form.items()
+        if command not in _CLOUD_COMMANDS:
+            return web.Response(status=422)
+        local_command, low, high = _CLOUD_COMMANDS[command]
+        try:
+            value = int(raw_value)
+        except ValueError:
+            return web.Response(status=422)
+        if not low <= value <= high:
+            return web.Response(status=422)
+        record.fireplace.apply_command(local_command, value)
+        return web.Response(status=204)
@@ -0,0 +1,354 @@
+"""Simulated fireplaces serving the local HTTP interface."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import secrets
+import socket
+from collections import Counter
+from collections.abc import Callable
+from hashlib import sha256
+from types import TracebackType
+from typing import Any
+
+from aiohttp import web
+
+from ..const import IntelliFireCommand
+from ..local_api import IntelliFireAPILocal
+
+# Local command name -> poll payload key it changes
+_COMMAND_KEYS = {
+    command.value["local_command"]: key
+    for command, key in (
+        (IntelliFireCommand.POWER, "power"),
+        (IntelliFireCommand.PILOT, "pilot"),
+        (IntelliFireCommand.LIGHT, "light"),
+        (IntelliFireCommand.FLAME_HEIGHT, "height"),
+        (IntelliFireCommand.FAN_SPEED, "fanspeed"),
+        (IntelliFireCommand.THERMOSTAT_SETPOINT, "setpoint"),
+        (IntelliFireCommand.TIME_REMAINING, "timeremaining"),
+        (IntelliFireCommand.BEEP, None),
+        (IntelliFireCommand.SOFT_RESET, None),
+    )
+}
+_COMMAND_RANGES: dict[str, tuple[int, int]] = {
+    command.value["local_command"]: (command.value["min"], command.value["max"])  # type: ignore
+    for command in IntelliFireCommand
+}
+
+
+def sign_command(api_key: str, challenge: str, command: str, value: int) -> str:
+    """Return the `response` a fireplace expects for a command, see `IntelliFireAPILocal._construct_payload`."""
+    key = bytes.fromhex(api_key)
+    payload = f"post:command={command}&value={value}".encode()
+    inner = sha256(key + bytes.fromhex(challenge) + payload).digest()
+    return sha256(key + inner).hexdigest()
+
+
+class IntelliFireVirtualFireplace:
+    """State, credentials and network conditions of one simulated fireplace.
+
+    The state is the raw local `/poll` payload and is changed by valid `/post` commands, or through
+    :func:`update` to simulate events such as errors. Both notify the listeners added with
+    :func:`add_listener`; assigning to :attr:`state` directly changes the payload silently.
+    """
+
+    def __init__(
+        self,
+        serial: str,
+        *,
+        api_key: str,
+        user_id: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        max_concurrent: int = 1,
+        challenge_ttl: float = 10.0,
+        state: dict[str, Any] | None = None,
+    ) -> None:
+        """Create a fireplace.
+
+        Args:
+            serial (str): Serial number.
+            api_key (str): Hex api key that commands must be signed with.
+            user_id (str): User id that commands must carry.
+            latency (float): Seconds added to every response.
+            jitter (float): Up to this many random extra seconds per response.
+            drop_rate (float): Fraction of requests whose connection is dropped without a response.
+            max_concurrent (int): Requests handled at once; further requests wait, like the single
+                connection WiFi module of a real unit.
+            challenge_ttl (float): Seconds a challenge stays valid.
+            state (dict, optional): Poll payload keys overriding the defaults.
+        """
+        self.serial = serial
+        self.api_key = api_key
+        self.user_id = user_id
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.challenge_ttl = challenge_ttl
+        self.address = ""
+        self.stats: Counter[str] = Counter()
+        self.state: dict[str, Any] = {
+            "battery": 0,
+            "connection_quality": 995871,
+            "downtime": 0,
+            "ecm_latency": 0,
+            "errors": [],
+            "fanspeed": 0,
+            "feature_fan": 1,
+            "feature_light": 1,
+            "feature_thermostat": 1,
+            "fw_ver_str": "1.3.0",
+            "fw_version": "0x01030000",
+            "height": 0,
+            "hot": 0,
+            "ipv4_address": "127.0.0.1",
+            "light": 0,
+            "name": "",
+            "pilot": 0,
+            "power": 0,
+            "power_vent": 0,
+            "prepurge": 0,
+            "serial": serial,
+            "setpoint": 0,
+            "temperature": 20,
+            "thermostat": 0,
+            "timer": 0,
+            "timeremaining": 0,
+            "uptime": 0,
+            **(state or {}),
+        }
+        self._challenge: tuple[str, float] | None = None
+        self._listeners: list[Callable[[], None]] = []
+        self._slots = asyncio.Semaphore(max_concurrent)
+
+    def add_listener(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Call `callback` after every change of the state, returning a function that removes it."""
+        self._listeners.append(callback)
+        return lambda: self._listeners.remove(callback)
+
+    def update(self, **values: Any) -> None:
+        """Change poll payload keys and notify the listeners."""
+        self.state.update(values)
+        self._notify()
+
+    def _notify(self) -> None:
+        """Call every listener."""
+        for callback in list(self._listeners):
+            callback()
+
+    def issue_challenge(self, now: float) -> str:
+        """Return a new challenge, replacing the previous one."""
+        challenge = secrets.token_hex(16).upper()
+        self._challenge = (challenge, now)
+        return challenge
+
+    def post(self, form: dict[str, str], now: float) -> int:
+        """Validate and apply a signed command, returning the HTTP status of the response.
+
+        Returns:
+            int: `204` if applied, `403` for a missing, expired or wrong signature or user, `404`
+            for an unknown command and `422` for an out of range value.
+        """
+        command = form.get("command", "")
+        try:
+            value = int(form.get("value", ""))
+        except ValueError:
+            return 422
+        if self._challenge is None or now - self._challenge[1] > self.challenge_ttl:
+            return 403
+        if command not in _COMMAND_RANGES:
+            return 404
+        expected = sign_command(self.api_key, self._challenge[0], command, value)
+        if form.get("user") != self.user_id or not secrets.compare_digest(
+            form.get("response", ""), expected
+        ):
+            return 403
+        self._challenge = None
+        low, high = _COMMAND_RANGES[command]
+        if not low <= value <= high:
+            return 422
+        self.apply_command(command, value)
+        return 204
+
+    def apply_command(self, command: str, value: int) -> None:
+        """Change the state the way the fireplace would for a local command."""
+        key = _COMMAND_KEYS[command]
+        if key is None:
+            return
+        self.state[key] = value
+        if key == "setpoint":
+            self.state["thermostat"] = int(value > 0)
+        elif key == "timeremaining":
+            self.state["timer"] = int(value > 0)
+        elif key == "power":
+            self.state["hot"] = value
+        self._notify()
+
+    def api(self, **kwargs: Any) -> IntelliFireAPILocal:
+        """Return an :class:`IntelliFireAPILocal` for this fireplace; keyword arguments are passed on."""
+        return IntelliFireAPILocal(
+            fireplace_ip=self.address,
+            user_id=self.user_id,
+            api_key=self.api_key,
+            **kwargs,
+        )
+
+
+class IntelliFireLocalSimulator:
+    """Serve `/poll`, `/get_challenge` and `/post` for any number of simulated fireplaces.
+
+    Each fireplace listens on its own port of `host` and is reached through its :attr:`address`,
+    so thousands of fireplaces fit on one machine (the open file limit is usually what runs out
+    first). Commands are only accepted when signed with a current challenge, exactly as
+    :class:`IntelliFireAPILocal` signs them, and every fireplace honours its own latency, jitter,
+    drop rate and concurrency limit.
+
+    Example:
+
+        .. code:: Python
+
+            async with IntelliFireLocalSimulator() as simulator:
+                fireplace = await simulator.add_fireplace(latency=0.05)
+                api = fireplace.api()
+                await api.poll()
+                await api.flame_on()
+    """
+
+    def __init__(self, host: str = "127.0.0.1", seed: int | None = None) -> None:
+        """Create a stopped simulator.
+
+        Args:
+            host (str): Address to listen on.
+            seed (int, optional): Seed for latency jitter and drops, for repeatable runs.
+        """
+        self._log = logging.getLogger(__name__)
+        self.host = host
+        self.fireplaces: dict[str, IntelliFireVirtualFireplace] = {}
+        self._by_port: dict[int, IntelliFireVirtualFireplace] = {}
+        self._random = random.Random(seed)  # noqa: S311
+        app = web.Application()
+        app.router.add_get("/poll", self._handle_poll)
+        app.router.add_get("/get_challenge", self._handle_challenge)
+        app.router.add_post("/post", self._handle_post)
+        self._runner = web.AppRunner(app, access_log=None)
+        self._started = False
+
+    async def __aenter__(self) -> IntelliFireLocalSimulator:
+        """Start serving."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Stop serving."""
+        await self.stop()
+
+    async def start(self) -> None:
+        """Start serving the fireplaces added so far."""
+        if self._started:
+            return
+        await self._runner.setup()
+        self._started = True
+        for fireplace in self.fireplaces.values():
+            await self._listen(fireplace)
+
+    async def stop(self) -> None:
+        """Stop serving and close every port."""
+        if self._started:
+            await self._runner.cleanup()
+            self._started = False
+            self._by_port.clear()
+
+    async def add_fireplace(
+        self,
+        serial: str | None = None,
+        *,
+        api_key: str | None = None,
+        user_id: str = "simulated_user",
+        **kwargs: Any,
+    ) -> IntelliFireVirtualFireplace:
+        """Add a fireplace, listening immediately if the simulator is running.
+
+        Missing serials and api keys are generated; other keyword arguments go to
+        :class:`IntelliFireVirtualFireplace`.
+        """
+        fireplace = IntelliFireVirtualFireplace(
+            serial or secrets.token_hex(16).upper(),
+            api_key=api_key or secrets.token_hex(16),
+            user_id=user_id,
+            **kwargs,
+        )
+        self.fireplaces[fireplace.serial] = fireplace
+        if self._started:
+            await self._listen(fireplace)
+        return fireplace
+
+    async def _listen(self, fireplace: IntelliFireVirtualFireplace) -> None:
+        """Open a port for a fireplace."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, 0))
+        port = sock.getsockname()[1]
+        await web.SockSite(self._runner, sock).start()
+        self._by_port[port] = fireplace
+        fireplace.address = f"{self.host}:{port}"
+
+    def _fireplace(self, request: web.Request) -> IntelliFireVirtualFireplace:
+        """Return the fireplace whose port received the request."""
+        transport = request.transport
+        if transport is None:  # pragma: no cover
+            raise web.HTTPServiceUnavailable()
+        return self._by_port[transport.get_extra_info("sockname")[1]]
+
+    async def _delay_or_drop(
+        self, request: web.Request, fireplace: IntelliFireVirtualFireplace
+    ) -> bool:
+        """Apply the fireplace's latency and jitter, then return False if the request is dropped."""
+        delay = fireplace.latency + self._random.random() * fireplace.jitter
+        if delay:
+            await asyncio.sleep(delay)
+        if fireplace.drop_rate and self._random.random() < fireplace.drop_rate:
+            fireplace.stats["dropped"] += 1
+            if request.transport is not None:
+                request.transport.close()
+            return False
+        return True
+
+    async def _handle_poll(self, request: web.Request) -> web.StreamResponse:
+        """Return the poll payload."""
+        fireplace = self._fireplace(request)
+        async with fireplace._slots:
+            if not await self._delay_or_drop(request, fireplace):
+                return web.Response()
+            fireplace.stats["poll"] += 1
+            return web.json_response(fireplace.state)
+
+    async def _handle_challenge(self, request: web.Request) -> web.StreamResponse:
+        """Issue a challenge."""
+        fireplace = self._fireplace(request)
+        async with fireplace._slots:
+            if not await self._delay_or_drop(request, fireplace):
+                return web.Response()
+            fireplace.stats["get_challenge"] += 1
+            return web.Response(
+                text=fireplace.issue_challenge(asyncio.get_running_loop().time())
+            )
+
+    async def _handle_post(self, request: web.Request) -> web.StreamResponse:
+        """Apply a signed command."""
+        fireplace = self._fireplace(request)
+        async with fireplace._slots:
+            form = {key: str(value) for key, value in (await request.post()).items()}
+            if not await self._delay_or_drop(request, fireplace):
+                return web.Response()
+            status = fireplace.post(form, asyncio.get_running_loop().time())
+            fireplace.stats[f"post_{status}"] += 1
+            return web.Response(status=status)
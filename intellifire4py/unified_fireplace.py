@@ -5,23 +5,30 @@ from __future__ import annotations
 import asyncio
 
 import aiohttp
-from aiohttp import ClientConnectionError, ClientResponseError
+from aiohttp import ClientConnectionError, ClientResponseError, ClientSession
 
 from intellifire4py import IntelliFireAPILocal, IntelliFireAPICloud
-from intellifire4py.const import IntelliFireApiMode
+from intellifire4py.const import IntelliFireApiMode, IntelliFireCommand
 from intellifire4py.control import IntelliFireController
 from intellifire4py.model import (
+    IntelliFireCommandResult,
     IntelliFireCommonFireplaceData,
     IntelliFirePollData,
     IntelliFireUserData,
 )
 from rich import inspect
 
+from intellifire4py.history import IntelliFireHistory
+from intellifire4py.listeners import (
+    IntelliFireChanges,
+    IntelliFireListener,
+    IntelliFireListenerRegistry,
+)
 from intellifire4py.read import IntelliFireDataProvider
 
 from typing import cast
 from typing import Any
-from collections.abc import Coroutine
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable
 
 import logging
 
@@ -59,6 +66,7 @@ class UnifiedFireplace:
         use_http: bool = False,
         verify_ssl: bool = True,
         polling_enabled: bool = True,
+        session: ClientSession | None = None,
     ):
         """Initializes a new instance of the UnifiedFireplace class, configuring it for both local and cloud interactions with an IntelliFire fireplace.
 
@@ -71,6 +79,7 @@ class UnifiedFireplace:
             use_http (bool, optional): Indicates whether to use HTTP (True) or HTTPS (False) for communication. Defaults to False (HTTPS).
             verify_ssl (bool, optional): Toggles SSL certificate verification. Defaults to True (verification enabled).
             polling_enabled (bool, optional): Whether to enable background polling. When False, the caller is responsible for calling perform_poll() to update state. Defaults to True.
+            session (ClientSession, optional): An externally owned `aiohttp.ClientSession` shared by the local and cloud APIs (and typically by every fireplace in a fleet). The caller remains responsible for closing it. When omitted each API creates and owns one long-lived session, released by :func:`close`.
 
         The constructor prepares two API interfaces:
             - _local_api (IntelliFireAPILocal): Configured for direct local network communication, using the IP address, user ID, and API key from the fireplace_data.
@@ -88,7 +97,10 @@ class UnifiedFireplace:
         self._use_http = use_http
 
         self._local_api: IntelliFireAPILocal = IntelliFireAPILocal(
-            fireplace_ip=self.ip_address, user_id=self.user_id, api_key=self.api_key
+            fireplace_ip=self.ip_address,
+            user_id=self.user_id,
+            api_key=self.api_key,
+            session=session,
         )
 
         self._cloud_api = IntelliFireAPICloud(
@@ -96,8 +108,35 @@ class UnifiedFireplace:
             cookie_jar=self._fireplace_data.cookie_jar,
             verify_ssl=verify_ssl,
             use_http=use_http,
+            session=session,
         )
 
+        # Forward changes from whichever API is currently the read API
+        self._listeners = IntelliFireListenerRegistry()
+        self._local_api.add_listener(self._forward_local_changes)
+        self._cloud_api.add_listener(self._forward_cloud_changes)
+
+    async def __aenter__(self) -> UnifiedFireplace:
+        """Asynchronous context manager entry."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type | None,
+        exc_val: Exception | None,
+        exc_tb: object | None,
+    ) -> None:
+        """Asynchronous context manager exit."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Stop all background polling and release any sessions owned by the underlying APIs.
+
+        An externally supplied session is left open for its owner to close.
+        """
+        await self._local_api.close()
+        await self._cloud_api.close()
+
     async def perform_cloud_poll(self, timeout_seconds: float = 10.0) -> None:
         """Perform a Cloud Poll - this should be used to validate the stored credentials.
 
@@ -339,6 +378,58 @@ class UnifiedFireplace:
         self._control_mode = mode
         self._fireplace_data.control_mode = mode
 
+    def add_listener(
+        self,
+        callback: IntelliFireListener,
+        fields: Iterable[str] | None = None,
+    ) -> Callable[[], None]:
+        """Call `callback(data, changes)` whenever the current :attr:`read_api` reports changed data.
+
+        Args:
+            callback (IntelliFireListener): Receives the new data and `{field: (old, new)}` of the changes.
+            fields (Iterable[str], optional): Only call back when one of these fields (or computed
+                properties such as `error_codes`) changes. Defaults to any change.
+
+        Returns:
+            Callable[[], None]: Function that removes the listener again.
+        """
+        return self._listeners.add_listener(callback, fields)
+
+    def stream(
+        self, fields: Iterable[str] | None = None
+    ) -> AsyncIterator[IntelliFirePollData]:
+        """Iterate over snapshots from the current :attr:`read_api`, keeping only the latest for slow consumers.
+
+        Args:
+            fields (Iterable[str], optional): Only yield when one of these fields changes. Defaults to any change.
+        """
+        return self._listeners.stream(fields)
+
+    def _forward_local_changes(
+        self, data: IntelliFirePollData, changes: IntelliFireChanges
+    ) -> None:
+        if self._read_mode == IntelliFireApiMode.LOCAL:
+            self._listeners.dispatch(data, changes)
+
+    def _forward_cloud_changes(
+        self, data: IntelliFirePollData, changes: IntelliFireChanges
+    ) -> None:
+        if self._read_mode == IntelliFireApiMode.CLOUD:
+            self._listeners.dispatch(data, changes)
+
+    async def send_commands(
+        self, commands: Iterable[tuple[IntelliFireCommand, int]]
+    ) -> list[IntelliFireCommandResult]:
+        """Send a batch of commands through the current :attr:`control_api`.
+
+        Args:
+            commands (Iterable[tuple[IntelliFireCommand, int]]): `(command, value)` pairs, sent in order.
+
+        Returns:
+            list[IntelliFireCommandResult]: One result per command, in the same order.
+        """
+        return await self.control_api.send_commands(commands)
+
     @property
     def _cloud_data(self) -> IntelliFirePollData:
         """Provides access to the cloud data associated with the fireplace.
@@ -384,6 +475,24 @@ class UnifiedFireplace:
         else:
             return self._cloud_data
 
+    @property
+    def history(self) -> IntelliFireHistory | None:
+        """Telemetry history of the current :attr:`read_api`.
+
+        The local and cloud APIs each record their own polls, so switching the read mode switches history.
+        `None` until :func:`enable_history` is called.
+        """
+        return self.read_api.history
+
+    def enable_history(self, capacity: int = 2880) -> None:
+        """Start recording telemetry history on both the local and the cloud API.
+
+        Args:
+            capacity (int): Number of samples kept per API. Defaults to 2880, 12 hours at 15 second polls.
+        """
+        self._local_api.enable_history(capacity)
+        self._cloud_api.enable_history(capacity)
+
     @classmethod
     async def _create_async_instance(
         cls,
@@ -393,6 +502,7 @@ class UnifiedFireplace:
         use_http: bool = False,
         verify_ssl: bool = True,
         polling_enabled: bool = True,
+        session: ClientSession | None = None,
     ) -> UnifiedFireplace:
         """Asynchronously creates an instance of the class with specified fireplace data and operating modes.
 
@@ -411,6 +521,7 @@ class UnifiedFireplace:
             use_http (bool, optional): Indicates whether to use HTTP (True) or HTTPS (False) for communication.
             verify_ssl (bool, optional): Toggles SSL certificate verification.
             polling_enabled (bool, optional): Whether to enable background polling. Defaults to True.
+            session (ClientSession, optional): An externally owned session shared by the created fireplace(s).
 
         Returns:
             [cls]: An initialized instance of the class with the specified configuration.
@@ -428,6 +539,7 @@ class UnifiedFireplace:
             verify_ssl=verify_ssl,
             use_http=use_http,
             polling_enabled=polling_enabled,
+            session=session,
         )
         local_connect, cloud_connect = await instance.async_validate_connectivity(
             timeout=30
@@ -471,6 +583,7 @@ class UnifiedFireplace:
         use_http: bool = False,
         verify_ssl: bool = True,
         polling_enabled: bool = True,
+        session: ClientSession | None = None,
     ) -> UnifiedFireplace:
         """Asynchronously constructs a UnifiedFireplace instance from a given IntelliFireCommonFireplaceData object, including network security settings.
 
@@ -481,6 +594,7 @@ class UnifiedFireplace:
             use_http (bool, optional): Indicates whether to use HTTP or HTTPS for communication.
             verify_ssl (bool, optional): Determines whether SSL certificate verification is enabled.
             polling_enabled (bool, optional): Whether to enable background polling. Defaults to True.
+            session (ClientSession, optional): An externally owned session shared by the created fireplace(s).
 
         Returns:
             UnifiedFireplace: A fully initialized instance of UnifiedFireplace.
@@ -492,6 +606,7 @@ class UnifiedFireplace:
             desired_read_mode=common_data.read_mode,
             desired_control_mode=common_data.control_mode,
             polling_enabled=polling_enabled,
+            session=session,
         )
 
     @classmethod
@@ -503,6 +618,7 @@ class UnifiedFireplace:
         use_http: bool = False,
         verify_ssl: bool = True,
         polling_enabled: bool = True,
+        session: ClientSession | None = None,
     ) -> list[UnifiedFireplace]:
         """Builds a list of UnifiedFireplace instances from IntelliFireUserData.
 
@@ -518,6 +634,7 @@ class UnifiedFireplace:
             use_http (bool, optional): Indicates whether to use HTTP or HTTPS for communication.
             verify_ssl (bool, optional): Determines whether SSL certificate verification is enabled.
             polling_enabled (bool, optional): Whether to enable background polling. Defaults to True.
+            session (ClientSession, optional): An externally owned session shared by the created fireplace(s).
 
         Returns:
             list[UnifiedFireplace]: A list of UnifiedFireplace instances.
@@ -531,6 +648,7 @@ class UnifiedFireplace:
                 verify_ssl=verify_ssl,
                 use_http=use_http,
                 polling_enabled=polling_enabled,
+                session=session,
             )
             for fp in user_data.fireplaces
         ]
@@ -550,6 +668,7 @@ class UnifiedFireplace:
         use_http: bool = False,
         verify_ssl: bool = True,
         polling_enabled: bool = True,
+        session: ClientSession | None = None,
     ) -> UnifiedFireplace:
         """Asynchronously constructs a UnifiedFireplace instance with direct input parameters.
 
@@ -573,6 +692,7 @@ class UnifiedFireplace:
             use_http (bool, optional): Indicates whether to use HTTP or HTTPS for communication.
             verify_ssl (bool, optional): Determines whether SSL certificate verification is enabled.
             polling_enabled (bool, optional): Whether to enable background polling. Defaults to True.
+            session (ClientSession, optional): An externally owned session shared by the created fireplace(s).
 
         Returns:
             UnifiedFireplace: An instance of the UnifiedFireplace class initialized with the provided data.
@@ -594,6 +714,7 @@ class UnifiedFireplace:
             use_http=use_http,
             verify_ssl=verify_ssl,
             polling_enabled=polling_enabled,
+            session=session,
         )
 
     @classmethod
@@ -603,6 +724,7 @@ class UnifiedFireplace:
         use_http: bool = False,
         verify_ssl: bool = True,
         polling_enabled: bool = True,
+        session: ClientSession | None = None,
     ) -> UnifiedFireplace:
         """Asynchronously creates a UnifiedFireplace instance from a common fireplace data structure.
 
@@ -617,6 +739,7 @@ class UnifiedFireplace:
             use_http (bool, optional): Indicates whether to use HTTP or HTTPS for communication.
             verify_ssl (bool, optional): Determines whether SSL certificate verification is enabled.
             polling_enabled (bool, optional): Whether to enable background polling. Defaults to True.
+            session (ClientSession, optional): An externally owned session shared by the created fireplace(s).
 
         Returns:
             UnifiedFireplace: An instance of the UnifiedFireplace class initialized with the given common fireplace data.
@@ -629,6 +752,7 @@ class UnifiedFireplace:
             desired_read_mode=common_fireplace.read_mode,
             desired_control_mode=common_fireplace.control_mode,
             polling_enabled=polling_enabled,
+            session=session,
         )
 
     def debug(self) -> None:
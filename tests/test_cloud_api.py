@@ -40,6 +40,7 @@ async def test_cloud_login(
         assert fireplace.data.pilot_on is True
 
         assert cloud_interface.user_data.user_id == user_id
+        await fireplace.close()
 
 
 @pytest.mark.asyncio
@@ -89,6 +90,7 @@ async def test_control(
         assert fp.read_api.is_polling_in_background is True
         assert fp.read_api.data.name == "Living Room"
         await fp.read_api.stop_background_polling()
+        await fp.close()
 
 
 @pytest.mark.asyncio
@@ -120,7 +122,8 @@ async def test_bad_command_param(mock_cloud_login_flow_no_local) -> None:
             desired_control_mode=IntelliFireApiMode.CLOUD,
             desired_read_mode=IntelliFireApiMode.CLOUD,
         )
-        fireplace = fireplaces[0]  # noqa: F841
+        fireplace = fireplaces[0]
+        await fireplace.close()
 
 
 #
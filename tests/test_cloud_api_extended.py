@@ -1,11 +1,15 @@
 """Extended tests for cloud_api.py to improve coverage."""
 
-import pytest
+import asyncio
 import json
+import time
+
+import pytest
 import pytest_asyncio
 from aiohttp import CookieJar, ClientResponseError, RequestInfo
 from aioresponses import aioresponses
 from multidict import CIMultiDict, CIMultiDictProxy
+from pydantic import ValidationError
 from yarl import URL
 
 from intellifire4py.cloud_api import IntelliFireAPICloud
@@ -30,7 +34,8 @@ async def cloud_api():
         verify_ssl=True,
         cookie_jar=cookie_jar,
     )
-    return api
+    yield api
+    await api.close()
 
 
 @pytest.mark.asyncio
@@ -69,6 +74,69 @@ async def test_long_poll_408_no_change(cloud_api):
         assert result is False
 
 
+@pytest.mark.asyncio
+async def test_long_poll_echoes_etag(cloud_api, cloud_poll_json):
+    """Test long_poll sends the previous Etag back in If-None-Match."""
+    url = "https://iftapi.net/a/TEST123/applongpoll"
+    with aioresponses() as m:
+        m.get(url, status=200, body=cloud_poll_json, headers={"Etag": "42"})
+        m.get(url, status=408, headers={"Etag": "43"})
+        m.get(url, status=408)
+
+        assert await cloud_api.long_poll() is True
+        assert await cloud_api.long_poll() is False
+        assert await cloud_api.long_poll() is False
+
+        calls = m.requests[("GET", URL(url))]
+        assert "If-None-Match" not in (calls[0].kwargs.get("headers") or {})
+        assert calls[1].kwargs["headers"]["If-None-Match"] == "42"
+        assert calls[2].kwargs["headers"]["If-None-Match"] == "43"
+
+
+@pytest.mark.asyncio
+async def test_long_poll_resyncs_after_queue_window(cloud_api, cloud_poll_json):
+    """Test long_poll falls back to apppoll once the 30 second queue window has passed."""
+    with aioresponses() as m:
+        m.get("https://iftapi.net/a/TEST123//apppoll", body=cloud_poll_json)
+        m.get(
+            "https://iftapi.net/a/TEST123/applongpoll",
+            status=408,
+            headers={"Etag": "7"},
+            repeat=True,
+        )
+
+        await cloud_api.long_poll()
+        assert cloud_api.long_poll_window_exceeded is False
+
+        cloud_api._last_sync -= 31
+        assert cloud_api.long_poll_window_exceeded is True
+        await cloud_api.long_poll()
+
+        assert (
+            len(m.requests[("GET", URL("https://iftapi.net/a/TEST123//apppoll"))]) == 1
+        )
+        # The resync restarts the queue, so no Etag is sent on the following long poll
+        last = m.requests[("GET", URL("https://iftapi.net/a/TEST123/applongpoll"))][-1]
+        assert "If-None-Match" not in (last.kwargs.get("headers") or {})
+
+
+@pytest.mark.asyncio
+async def test_long_poll_connection_drop_clears_etag(cloud_api):
+    """Test a dropped long poll connection forgets the queue position."""
+    cloud_api._etag = "42"
+    cloud_api._last_sync = time.monotonic()
+    with aioresponses() as m:
+        m.get(
+            "https://iftapi.net/a/TEST123/applongpoll",
+            exception=asyncio.TimeoutError(),
+        )
+        with pytest.raises(asyncio.TimeoutError):
+            await cloud_api.long_poll()
+
+    assert cloud_api._etag is None
+    assert cloud_api._last_sync is None
+
+
 @pytest.mark.asyncio
 async def test_long_poll_403_not_authorized(cloud_api):
     """Test long_poll with 403 status code (not authorized)."""
@@ -173,6 +241,21 @@ async def test_poll_403_not_authorized(cloud_api):
             await cloud_api.poll()
 
 
+@pytest.mark.asyncio
+async def test_poll_invalid_data(cloud_api, caplog):
+    """Test poll with valid JSON that is not poll data."""
+    with aioresponses() as m:
+        m.get(
+            "https://iftapi.net/a/TEST123//apppoll",
+            status=200,
+            body='{"temperature": "hot"}',
+        )
+
+        with pytest.raises(ValidationError):
+            await cloud_api.poll()
+    assert "Invalid poll data" in caplog.text
+
+
 @pytest.mark.asyncio
 async def test_poll_404_not_found(cloud_api):
     """Test poll with 404 status code."""
@@ -262,6 +345,34 @@ async def test_background_poll_exception_handling(cloud_api):
         await cloud_api.stop_background_polling()
 
 
+@pytest.mark.asyncio
+async def test_close_waits_for_background_poll(cloud_api):
+    """close() only closes the owned session once the poll task has finished."""
+    cloud_api.set_poll_mode(IntelliFireCloudPollType.SHORT)
+
+    with aioresponses() as m:
+        m.get(
+            "https://iftapi.net/a/TEST123//apppoll",
+            status=200,
+            payload={"serial": "TEST123"},
+            repeat=True,
+        )
+        await cloud_api.start_background_polling(minimum_wait_in_seconds=1)
+        task = cloud_api._bg_task
+        session = cloud_api._session
+        close_session = session.close
+        task_done_at_close = []
+
+        async def close():
+            task_done_at_close.append(task.done())
+            await close_session()
+
+        session.close = close
+        await cloud_api.close()
+
+    assert task_done_at_close == [True]
+
+
 @pytest.mark.asyncio
 async def test_stop_background_polling_when_not_running(cloud_api):
     """Test stop_background_polling when not running."""
@@ -283,3 +394,38 @@ def test_set_poll_mode(cloud_api):
 
     cloud_api.set_poll_mode(IntelliFireCloudPollType.LONG)
     assert cloud_api._poll_mode == IntelliFireCloudPollType.LONG
+
+
+@pytest.mark.asyncio
+async def test_send_commands_reports_each_result(cloud_api):
+    """A failing command in a batch does not stop the rest and is reported."""
+    cloud_api._cookie_jar.update_cookies({"user": "abc"}, URL("https://iftapi.net"))
+    url = "https://iftapi.net/a/TEST123//apppost"
+    with aioresponses() as m:
+        m.post(url, status=204)
+        m.post(url, status=500)
+        m.post(url, status=204)
+
+        results = await cloud_api.send_commands(
+            [
+                (IntelliFireCommand.POWER, 1),
+                (IntelliFireCommand.FLAME_HEIGHT, 3),
+                (IntelliFireCommand.LIGHT, 1),
+            ]
+        )
+
+        bodies = [r.kwargs["data"] for r in m.requests[("POST", URL(url))]]
+
+    assert [r.success for r in results] == [True, False, True]
+    assert results[1].command == IntelliFireCommand.FLAME_HEIGHT
+    assert results[1].error is not None
+    assert bodies == [b"power=1", b"height=3", b"light=1"]
+    await cloud_api.close()
+
+
+@pytest.mark.asyncio
+async def test_send_commands_without_cookies(cloud_api):
+    """Without authentication nothing is sent and every command fails."""
+    with aioresponses():
+        results = await cloud_api.send_commands([(IntelliFireCommand.POWER, 1)])
+    assert results[0].success is False
@@ -1,7 +1,7 @@
 """Extended tests for cloud_interface.py to improve coverage."""
 
 import pytest
-from aiohttp import ClientError
+from aiohttp import ClientError, ClientSession
 from aioresponses import aioresponses
 
 from intellifire4py.cloud_interface import IntelliFireCloudInterface
@@ -69,3 +69,19 @@ async def test_context_manager_usage():
         RuntimeError, match="must be called within an 'async with' context"
     ):
         await cloud_interface.login_with_credentials(username="user", password="pass")
+
+
+@pytest.mark.asyncio
+async def test_cloud_fireplaces_share_only_an_injected_session():
+    """APIs borrow an injected session but never one the interface owns and closes."""
+    json_str = '{"auth_cookie": "cookie", "user_id": "123", "web_client_id": "456", "fireplaces": [{"serial": "ABC"}]}'
+
+    owned = IntelliFireCloudInterface()
+    async with owned:
+        owned.load_user_data(json_str)
+        assert [api._session for api in owned.cloud_fireplaces] == [None]
+
+    async with ClientSession() as session:
+        injected = IntelliFireCloudInterface(session=session)
+        injected.load_user_data(json_str)
+        assert [api._session for api in injected.cloud_fireplaces] == [session]
@@ -0,0 +1,254 @@
+"""Test the iftapi.net cloud simulator."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+
+from intellifire4py import IntelliFireAPICloud
+from intellifire4py.cloud_interface import IntelliFireCloudInterface
+from intellifire4py.testing.cloud_simulator import IntelliFireCloudSimulator
+from intellifire4py.exceptions import LoginError
+from intellifire4py.testing.local_simulator import IntelliFireLocalSimulator
+from intellifire4py.long_poll import IntelliFireLongPollEngine
+from intellifire4py.unified_fireplace import UnifiedFireplace
+
+
+async def _login(cloud, username, password="password"):  # noqa: S107
+    interface = IntelliFireCloudInterface(use_http=True, session=cloud.session())
+    async with interface:
+        await interface.login_with_credentials(username=username, password=password)
+    return interface.user_data
+
+
+def _api(cloud, user_data, serial):
+    return IntelliFireAPICloud(
+        serial=serial,
+        use_http=True,
+        cookie_jar=user_data.cookie_jar,
+        session=cloud.session(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_login_and_enumeration():
+    """Each account sees its own fireplaces, grouped by location."""
+    async with IntelliFireCloudSimulator() as cloud:
+        first = cloud.add_account("first@example.com")
+        cabin = cloud.add_fireplace(first, location="Cabin", state={"temperature": 21})
+        home = cloud.add_fireplace(first)
+        second = cloud.add_account("second@example.com")
+        other = cloud.add_fireplace(second)
+        assert len(first.locations) == 2
+
+        user_data = await _login(cloud, "first@example.com")
+        assert user_data.user_id == first.user_id
+        assert user_data.auth_cookie == first.auth_cookie
+        assert {fireplace.serial for fireplace in user_data.fireplaces} == {
+            cabin.serial,
+            home.serial,
+        }
+        assert {fireplace.api_key for fireplace in user_data.fireplaces} == {
+            cabin.api_key,
+            home.api_key,
+        }
+        assert cabin.user_id == home.user_id == first.user_id
+
+        user_data = await _login(cloud, "second@example.com")
+        assert [fireplace.serial for fireplace in user_data.fireplaces] == [
+            other.serial
+        ]
+
+        with pytest.raises(LoginError):
+            await _login(cloud, "first@example.com", "wrong")
+        assert cloud.stats["login"] == 3
+
+
+@pytest.mark.asyncio
+async def test_accounts_share_a_session_without_cookie_jar():
+    """Cookies are sent per request, so accounts can share a session that stores none."""
+    async with IntelliFireCloudSimulator() as cloud:
+        session = cloud.session(cookie_jar=aiohttp.DummyCookieJar())
+        for username in ("first@example.com", "second@example.com"):
+            account = cloud.add_account(username)
+            fireplace = cloud.add_fireplace(account, state={"temperature": 21})
+            interface = IntelliFireCloudInterface(use_http=True, session=session)
+            async with interface:
+                await interface.login_with_credentials(
+                    username=username, password="password"
+                )
+            (api,) = interface.cloud_fireplaces
+            assert api._serial == fireplace.serial
+            assert api._session is session
+            await api.poll()
+            assert api.data.temperature_c == 21
+        assert cloud.stats["enumfireplaces"] == 2
+
+
+@pytest.mark.asyncio
+async def test_poll_uses_cloud_format():
+    """Polls return string values and remote_* keys that parse into the model."""
+    async with IntelliFireCloudSimulator() as cloud:
+        account = cloud.add_account("user@example.com")
+        fireplace = cloud.add_fireplace(
+            account, state={"temperature": 23, "connection_quality": 5, "errors": [6]}
+        )
+        user_data = await _login(cloud, account.username)
+        api = _api(cloud, user_data, fireplace.serial)
+        await api.poll()
+        assert api.data.temperature_c == 23
+        assert api.data.connection_quality == 5
+        assert api.data.errors == [6]
+        assert api.data.brand == "H&G"
+
+
+@pytest.mark.asyncio
+async def test_post_statuses():
+    """Commands are applied, and bad cookies, serials and values are refused."""
+    async with IntelliFireCloudSimulator() as cloud:
+        account = cloud.add_account("user@example.com")
+        fireplace = cloud.add_fireplace(account)
+        foreign = cloud.add_fireplace(cloud.add_account())
+        user_data = await _login(cloud, account.username)
+        cookies = {morsel.key: morsel.value for morsel in user_data.cookie_jar}
+        session = cloud.session()
+        base = "http://iftapi.net/a"
+
+        async def post(serial, body, cookies=cookies):
+            async with session.post(
+                f"{base}/{serial}//apppost", data=body.encode(), cookies=cookies
+            ) as response:
+                return response.status
+
+        assert await post(fireplace.serial, "height=3") == 204
+        assert fireplace.state["height"] == 3
+        assert await post(fireplace.serial, "power=1", cookies={}) == 403
+        assert await post(foreign.serial, "power=1") == 403
+        assert await post("MISSING", "power=1") == 404
+        assert await post(fireplace.serial, "height=9") == 422
+        assert await post(fireplace.serial, "warp=1") == 422
+        assert fireplace.state["power"] == 0
+
+        api = _api(cloud, user_data, fireplace.serial)
+        await api.set_fan_speed(speed=2)
+        assert fireplace.state["fanspeed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_long_poll_queue():
+    """Long polls deliver queued updates in order and time out with 408."""
+    async with IntelliFireCloudSimulator(time_scale=0.005) as cloud:
+        account = cloud.add_account("user@example.com")
+        fireplace = cloud.add_fireplace(account)
+        user_data = await _login(cloud, account.username)
+        api = _api(cloud, user_data, fireplace.serial)
+        await api.poll()
+
+        # Changes after the poll are queued, so none are lost between requests
+        fireplace.update(temperature=30)
+        fireplace.update(temperature=31)
+        assert await api.long_poll() is True
+        assert api.data.temperature_c == 30
+        assert await api.long_poll() is True
+        assert api.data.temperature_c == 31
+
+        # Only the time remaining counting down is not an update
+        fireplace.update(timeremaining=100)
+        started = time.monotonic()
+        assert await api.long_poll() is False
+        assert time.monotonic() - started >= 57 * 0.005 * 0.9
+
+        # A pending long poll wakes as soon as the state changes
+        pending = asyncio.create_task(api.long_poll())
+        await asyncio.sleep(0.05)
+        fireplace.update(light=2)
+        assert await pending is True
+        assert api.data.light_level == 2
+
+
+@pytest.mark.asyncio
+async def test_fault_injection():
+    """Outages, errors and drops can be limited to some endpoints."""
+    async with IntelliFireCloudSimulator(seed=1) as cloud:
+        account = cloud.add_account("user@example.com")
+        fireplace = cloud.add_fireplace(account)
+        user_data = await _login(cloud, account.username)
+        api = _api(cloud, user_data, fireplace.serial)
+
+        cloud.faults.outage = True
+        cloud.faults.endpoints = frozenset({"apppoll"})
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await api.poll()
+        assert error.value.status == 503
+        await api.flame_on()
+        assert fireplace.state["power"] == 1
+
+        cloud.faults.outage = False
+        cloud.faults.drop_rate = 1.0
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await api.poll()
+        assert cloud.stats["error"] == 1
+        assert cloud.stats["dropped"] >= 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [403, 500])
+async def test_long_poll_error_status_backs_off(status):
+    """An error status from applongpoll backs the engine off instead of re-arming at once."""
+    async with IntelliFireCloudSimulator() as cloud:
+        account = cloud.add_account("user@example.com")
+        fireplace = cloud.add_fireplace(account)
+        user_data = await _login(cloud, account.username)
+        api = _api(cloud, user_data, fireplace.serial)
+        cloud.faults.outage = True
+        cloud.faults.error_status = status
+        cloud.faults.endpoints = frozenset({"applongpoll"})
+
+        engine = IntelliFireLongPollEngine(api)
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+            if len(delays) == 3:
+                engine.stop()
+
+        with patch("intellifire4py.long_poll.asyncio.sleep", side_effect=sleep):
+            await engine.run()
+
+        assert delays == [1, 2, 4]
+        assert engine.errors == 3
+        assert engine.timeouts == 0
+        assert cloud.stats["applongpoll"] == 3
+
+
+@pytest.mark.asyncio
+async def test_shared_fireplace_with_local_simulator():
+    """A fireplace served locally and by the cloud is one device to UnifiedFireplace."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFireCloudSimulator(time_scale=0.01) as cloud,
+    ):
+        account = cloud.add_account("user@example.com")
+        fireplace = cloud.add_fireplace(account, await local.add_fireplace())
+        user_data = await _login(cloud, account.username)
+        assert user_data.fireplaces[0].ip_address == fireplace.address
+
+        (unified,) = await UnifiedFireplace.build_fireplaces_from_user_data(
+            user_data,
+            use_http=True,
+            polling_enabled=False,
+            session=cloud.session(),
+        )
+        await unified.perform_local_poll()
+        await unified.control_api.flame_on()
+        assert fireplace.state["power"] == 1
+
+        # The local command reaches a cloud long poll
+        cloud_api = _api(cloud, user_data, fireplace.serial)
+        await cloud_api.poll()
+        await unified.control_api.set_lights(level=3)
+        assert await cloud_api.long_poll() is True
+        assert cloud_api.data.light_level == 3
+        await unified.close()
@@ -1,5 +1,7 @@
 """Test control module for intellifire4py."""
 
+import asyncio
+
 import pytest
 from intellifire4py.const import IntelliFireApiMode, IntelliFireCommand
 from intellifire4py.control import IntelliFireController
@@ -33,3 +35,76 @@ async def test_controller_basic_methods():
     # FAN_SPEED is the correct name in IntelliFireCommand
     assert c._last_command[0].name == "FAN_SPEED"
     assert c._last_command[1] == 1
+
+
+class SlowController(IntelliFireController):
+    """Controller whose sends take a while, recording started and completed values."""
+
+    def __init__(self):
+        """Initialize the recording lists."""
+        super().__init__(IntelliFireApiMode.LOCAL)
+        self.started = []
+        self.completed = []
+
+    async def _slow_send(self, *, command, value):
+        self.started.append((command, value))
+        await asyncio.sleep(0.05)
+        self.completed.append((command, value))
+
+    async def send_command(self, *, command, value):
+        """Send through the superseding queue."""
+        await self._send_superseding(command=command, value=value, send=self._slow_send)
+
+
+@pytest.mark.asyncio
+async def test_newer_value_supersedes_in_flight_command():
+    """A burst of slider values only delivers the last one and every caller returns."""
+    c = SlowController()
+    await asyncio.gather(
+        c.set_flame_height(1), c.set_flame_height(2), c.set_flame_height(3)
+    )
+    assert c.completed == [(IntelliFireCommand.FLAME_HEIGHT, 3)]
+    assert c._data.flameheight == 3
+    assert c._command_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_same_value_joins_in_flight_command():
+    """Repeating the pending value does not send it twice."""
+    c = SlowController()
+    await asyncio.gather(c.set_lights(2), c.set_lights(2))
+    assert c.started == [(IntelliFireCommand.LIGHT, 2)]
+
+
+@pytest.mark.asyncio
+async def test_joined_caller_returns_when_superseded():
+    """A caller that joined a send returns quietly when a newer value supersedes it."""
+    c = SlowController()
+    results = await asyncio.gather(
+        c.set_lights(1), c.set_lights(1), c.set_lights(2), return_exceptions=True
+    )
+    assert results == [None, None, None]
+    assert c.completed == [(IntelliFireCommand.LIGHT, 2)]
+
+
+@pytest.mark.asyncio
+async def test_different_commands_are_not_coalesced():
+    """Only sends of the same command supersede each other."""
+    c = SlowController()
+    await asyncio.gather(c.set_lights(1), c.set_fan_speed(2))
+    assert set(c.completed) == {
+        (IntelliFireCommand.LIGHT, 1),
+        (IntelliFireCommand.FAN_SPEED, 2),
+    }
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_cancels_its_send():
+    """Cancelling the caller still cancels the send instead of being treated as superseded."""
+    c = SlowController()
+    task = asyncio.create_task(c.set_lights(1))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert c.completed == []
@@ -32,7 +32,8 @@ async def cloud_api():
         verify_ssl=True,
         cookie_jar=cookie_jar,
     )
-    return api
+    yield api
+    await api.close()
 
 
 @pytest.mark.asyncio
@@ -73,6 +74,7 @@ async def test_local_api_poll_timeout_error():
 
         with pytest.raises(asyncio.TimeoutError):
             await api.poll(suppress_warnings=False, timeout_seconds=1)
+    await api.close()
 
 
 @pytest.mark.asyncio
@@ -8,6 +8,7 @@ from aioresponses import aioresponses
 
 from intellifire4py.cloud_api import IntelliFireAPICloud
 from intellifire4py.const import IntelliFireCommand, IntelliFireApiMode
+from intellifire4py.exceptions import CloudError
 from intellifire4py.local_api import IntelliFireAPILocal
 from intellifire4py.model import IntelliFireCommonFireplaceData
 from intellifire4py.unified_fireplace import UnifiedFireplace
@@ -23,17 +24,20 @@ async def cloud_api():
         verify_ssl=True,
         cookie_jar=cookie_jar,
     )
-    return api
+    yield api
+    await api.close()
 
 
-@pytest.fixture
-def local_api():
+@pytest_asyncio.fixture
+async def local_api():
     """Create a local API instance for testing."""
-    return IntelliFireAPILocal(
+    api = IntelliFireAPILocal(
         fireplace_ip="192.168.1.100",
         user_id="test_user",
         api_key="deadbeefdeadbeefdeadbeefdeadbeef",
     )
+    yield api
+    await api.close()
 
 
 # ============================================================================
@@ -56,22 +60,21 @@ async def test_cloud_send_command_unexpected_status(cloud_api):
 
 
 # ============================================================================
-# cloud_api.py - Line 236: Long poll returns False on unexpected status
+# cloud_api.py - Line 236: Long poll raises on unexpected status
 # ============================================================================
 
 
 @pytest.mark.asyncio
-async def test_cloud_long_poll_unexpected_status_returns_false(cloud_api):
-    """Test long_poll returns False on unexpected status code (line 236)."""
+async def test_cloud_long_poll_unexpected_status_raises(cloud_api):
+    """Test long_poll raises on unexpected status code so the engine backs off."""
     with aioresponses() as m:
-        # Mock 500 server error - should return False
         m.get(
             "https://iftapi.net/a/TEST123/applongpoll",
             status=500,
         )
 
-        result = await cloud_api.long_poll()
-        assert result is False
+        with pytest.raises(CloudError, match="Unexpected status code: 500"):
+            await cloud_api.long_poll()
 
 
 # ============================================================================
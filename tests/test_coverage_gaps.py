@@ -17,25 +17,29 @@ from intellifire4py.local_api import IntelliFireAPILocal
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
-def local_api():
+@pytest_asyncio.fixture
+async def local_api():
     """Create a local API instance for testing."""
-    return IntelliFireAPILocal(
+    api = IntelliFireAPILocal(
         fireplace_ip="192.168.1.100",
         user_id="test_user",
         api_key="deadbeefdeadbeefdeadbeefdeadbeef",
     )
+    yield api
+    await api.close()
 
 
 @pytest_asyncio.fixture
 async def cloud_api():
     """Create a cloud API instance for testing."""
-    return IntelliFireAPICloud(
+    api = IntelliFireAPICloud(
         serial="TEST123",
         use_http=False,
         verify_ssl=True,
         cookie_jar=CookieJar(),
     )
+    yield api
+    await api.close()
 
 
 def _make_fast_time():
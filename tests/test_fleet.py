@@ -0,0 +1,328 @@
+"""Test the fleet manager against the local and cloud simulators."""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import aiohttp
+import pytest
+
+from intellifire4py.testing.cloud_simulator import IntelliFireCloudSimulator
+from intellifire4py.const import IntelliFireApiMode, IntelliFireCommand
+from intellifire4py.fleet import (
+    FireplaceFleet,
+    IntelliFireLatencyTracker,
+    poll_all,
+)
+from intellifire4py.testing.local_simulator import IntelliFireLocalSimulator
+from intellifire4py.model import IntelliFireCommonFireplaceData, IntelliFireUserData
+from intellifire4py.snapshot import IntelliFireSnapshot
+from intellifire4py.unified_fireplace import UnifiedFireplace
+
+
+async def _user_data(local, cloud, count):
+    account = cloud.add_account()
+    fireplaces = [
+        cloud.add_fireplace(account, await local.add_fireplace()) for _ in range(count)
+    ]
+    user_data = IntelliFireUserData(
+        user_id=account.user_id,
+        auth_cookie=account.auth_cookie,
+        web_client_id=account.web_client_id,
+        fireplaces=[
+            IntelliFireCommonFireplaceData(
+                ip_address=fireplace.address,
+                api_key=fireplace.api_key,
+                serial=fireplace.serial,
+                user_id=account.user_id,
+                auth_cookie=account.auth_cookie,
+                web_client_id=account.web_client_id,
+            )
+            for fireplace in fireplaces
+        ],
+    )
+    return user_data, fireplaces
+
+
+@pytest.mark.asyncio
+async def test_registry_and_bulk_operations():
+    """Fireplaces are found by serial and IP and commanded together."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFireCloudSimulator() as cloud,
+    ):
+        user_data, virtual = await _user_data(local, cloud, 5)
+        async with FireplaceFleet(
+            session=cloud.session(), max_concurrency=2, use_http=True
+        ) as fleet:
+            added = await fleet.add_user_data(user_data)
+            assert len(added) == len(fleet) == 5
+            first = virtual[0]
+            assert first.serial in fleet
+            assert fleet.get(first.serial) is fleet.by_ip(first.address)
+            assert fleet.get("missing") is None
+            assert all(not fireplace.is_polling_enabled for fireplace in fleet)
+
+            results = await fleet.send_commands([(IntelliFireCommand.POWER, 1)])
+            assert all(result[0].success for result in results.values())
+            assert all(fireplace.state["power"] == 1 for fireplace in virtual)
+
+            results = await fleet.send_commands(
+                [(IntelliFireCommand.FLAME_HEIGHT, 99)], serials=[first.serial]
+            )
+            assert isinstance(results[first.serial], Exception)
+
+            await fleet.remove(first.serial)
+            assert len(fleet) == 4
+            assert fleet.by_ip(first.address) is None
+
+
+@pytest.mark.asyncio
+async def test_poll_and_health():
+    """Polls update every fireplace and failures show up in health."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFireCloudSimulator() as cloud,
+    ):
+        user_data, virtual = await _user_data(local, cloud, 3)
+        fleet = FireplaceFleet(session=cloud.session(), use_http=True)
+        await fleet.add_user_data(user_data)
+        virtual[0].update(power=1)
+        virtual[1].drop_rate = 1.0
+
+        results = await fleet.poll()
+        assert results[virtual[0].serial] is None
+        assert isinstance(results[virtual[1].serial], Exception)
+
+        health = fleet.health()
+        assert health.total == 3
+        assert health.polled == 3
+        assert health.failing == 1
+        assert health.on == 1
+        assert health.local == 3
+        assert health.cloud == 0
+
+        virtual[1].drop_rate = 0.0
+        assert await fleet.poll([virtual[1].serial]) == {virtual[1].serial: None}
+        assert fleet.health().failing == 0
+        await fleet.close()
+        assert not cloud.session().closed
+
+
+@pytest.mark.asyncio
+async def test_unreachable_fireplace_is_skipped():
+    """A fireplace reachable neither locally nor through the cloud is left out."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFireCloudSimulator() as cloud,
+    ):
+        user_data, virtual = await _user_data(local, cloud, 2)
+        user_data.fireplaces[1].ip_address = "127.0.0.1:1"
+        user_data.fireplaces[1].serial = "UNKNOWN"
+        async with FireplaceFleet(session=cloud.session(), use_http=True) as fleet:
+            added = await fleet.add_user_data(user_data)
+            assert [fireplace.serial for fireplace in added] == [virtual[0].serial]
+            assert "UNKNOWN" in fleet.errors
+
+
+@pytest.mark.asyncio
+async def test_history_and_polling_loop():
+    """Histories are trimmed and the single polling loop polls every fireplace."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFireCloudSimulator() as cloud,
+    ):
+        user_data, virtual = await _user_data(local, cloud, 2)
+        async with FireplaceFleet(
+            session=cloud.session(),
+            use_http=True,
+            poll_interval_seconds=0.01,
+            history_capacity=10,
+        ) as fleet:
+            await fleet.add_user_data(
+                user_data, desired_read_mode=IntelliFireApiMode.LOCAL
+            )
+            assert all(fireplace.history.capacity == 10 for fireplace in fleet)
+            await fleet.start_polling()
+            assert fleet.is_polling
+            while min(fireplace.stats["poll"] for fireplace in virtual) < 4:
+                await asyncio.sleep(0.01)
+            await fleet.stop_polling()
+            assert not fleet.is_polling
+            assert all(len(fireplace.history) > 0 for fireplace in fleet)
+
+
+@pytest.mark.asyncio
+async def test_first_poll_within_base_interval():
+    """Fireplaces not polled yet are spread over the base interval, not the idle one."""
+    async with FireplaceFleet(poll_interval_seconds=15) as fleet:
+        start = time.monotonic()
+        for host in range(50):
+            fleet.add(
+                UnifiedFireplace(
+                    IntelliFireCommonFireplaceData(
+                        serial=f"SERIAL{host}", ip_address=f"192.168.1.{host}"
+                    )
+                )
+            )
+        delays = [due - start for due, *_ in fleet.scheduler._heap]
+        assert 7.5 < max(delays) <= 15
+
+
+@pytest.mark.asyncio
+async def test_owned_session_stores_no_cookies():
+    """The fleet's own session is shared across accounts, so it keeps no cookie jar."""
+    async with FireplaceFleet() as fleet:
+        assert isinstance(fleet.session.cookie_jar, aiohttp.DummyCookieJar)
+
+
+def test_invalid_concurrency():
+    """Concurrency must be positive."""
+    with pytest.raises(ValueError):
+        FireplaceFleet(max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_poll_budget():
+    """With a rate budget, lit fireplaces are polled more often than idle ones."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFireCloudSimulator() as cloud,
+    ):
+        user_data, virtual = await _user_data(local, cloud, 4)
+        virtual[0].update(power=1)
+        async with FireplaceFleet(
+            session=cloud.session(), use_http=True, max_polls_per_second=0.5
+        ) as fleet:
+            await fleet.add_user_data(user_data)
+            # One lit (weight 4) and three idle (weight 1) fireplaces share 0.5 polls/s
+            assert fleet.budget.interval(virtual[0].serial) == pytest.approx(3.5)
+            assert fleet.budget.interval(virtual[1].serial) == pytest.approx(14)
+            assert fleet.budget.total_rate == pytest.approx(0.5)
+            assert fleet.scheduler.max_polls_per_second == 0.5
+
+            await fleet.remove(virtual[0].serial)
+            assert len(fleet.budget) == 3
+
+
+@pytest.mark.asyncio
+async def test_health_leaves_budget_alone():
+    """Reading health neither adds fireplaces to the budget nor re-weights them."""
+    async with FireplaceFleet(max_polls_per_second=1) as fleet:
+        fireplaces = [
+            UnifiedFireplace(
+                IntelliFireCommonFireplaceData(
+                    serial=f"SERIAL{host}", ip_address=f"192.168.1.{host}"
+                )
+            )
+            for host in range(3)
+        ]
+        for fireplace in fireplaces:
+            fleet.add(fireplace)
+            # Polled before, but not by the fleet, so without a share of the budget yet
+            fireplace.read_api._last_poll = datetime.now(timezone.utc)
+        assert fleet.health().stale == 0
+        assert len(fleet.budget) == 0
+
+        first = fireplaces[0]
+        interval = fleet.budget.update(first.serial, first.read_api._data)
+        first.read_api._data.is_on = True
+        fleet.health()
+        assert fleet.budget.interval(first.serial) == interval
+        assert len(fleet.budget) == 1
+
+
+@pytest.mark.asyncio
+async def test_poll_all_streams_results():
+    """Fast fireplaces are yielded without waiting for a slow one."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFireCloudSimulator() as cloud,
+    ):
+        user_data, virtual = await _user_data(local, cloud, 4)
+        async with FireplaceFleet(session=cloud.session(), use_http=True) as fleet:
+            await fleet.add_user_data(user_data)
+            virtual[0].latency = 0.3
+            virtual[1].update(power=1)
+
+            results = [result async for result in fleet.poll_all()]
+            assert [serial for serial, _, _ in results][-1] == virtual[0].serial
+            by_serial = {serial: result for serial, result, _ in results}
+            assert isinstance(by_serial[virtual[1].serial], IntelliFireSnapshot)
+            assert by_serial[virtual[1].serial].is_on
+            assert results[0].latency < 0.3 <= results[-1].latency
+            assert fleet.latency.latency(virtual[0].serial) > fleet.latency.latency(
+                virtual[1].serial
+            )
+
+
+@pytest.mark.asyncio
+async def test_poll_all_derived_timeouts():
+    """A unit that turns slow is cut off by the timeout learned from its usual latency."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFireCloudSimulator() as cloud,
+    ):
+        user_data, virtual = await _user_data(local, cloud, 2)
+        async with FireplaceFleet(
+            session=cloud.session(), use_http=True, poll_timeout_seconds=0.2
+        ) as fleet:
+            await fleet.add_user_data(user_data)
+            await fleet.poll()
+            serial = virtual[0].serial
+            assert fleet.latency.timeout(serial) == fleet.latency.min_timeout_seconds
+
+            virtual[0].latency = 1.0
+            results = {serial: result async for serial, result, _ in fleet.poll_all()}
+            assert isinstance(results[serial], TimeoutError)
+            assert fleet.errors[serial] is results[serial]
+            assert fleet.health().failing == 1
+
+
+@pytest.mark.asyncio
+async def test_poll_all_local_apis():
+    """Local APIs can be polled directly and stopping early cancels the rest."""
+    async with IntelliFireLocalSimulator() as local:
+        fireplaces = [await local.add_fireplace() for _ in range(3)]
+        fireplaces[2].latency = 1
+        apis = [fireplace.api() for fireplace in fireplaces]
+        latency = IntelliFireLatencyTracker()
+        async for address, result, _ in poll_all(
+            apis, max_concurrency=3, latency=latency
+        ):
+            assert address in {fireplace.address for fireplace in fireplaces[:2]}
+            assert result.serial in {fireplace.serial for fireplace in fireplaces[:2]}
+            break
+        assert latency.latency(fireplaces[2].address) is None
+        for api in apis:
+            await api.close()
+
+        with pytest.raises(ValueError):
+            async for _ in poll_all(apis, max_concurrency=0):
+                pass
+
+
+def test_latency_tracker():
+    """Timeouts follow smoothed latency and deviation, back off and stay within bounds."""
+    tracker = IntelliFireLatencyTracker(
+        initial_timeout_seconds=5, min_timeout_seconds=0.5, max_timeout_seconds=8
+    )
+    assert tracker.timeout("fp") == 5
+    assert tracker.latency("fp") is None
+    tracker.record("fp", 1.0)
+    assert tracker.latency("fp") == 1.0
+    assert tracker.timeout("fp") == 3.0  # 1 + 4 * 0.5
+    for _ in range(50):
+        tracker.record("fp", 0.1)
+    assert tracker.timeout("fp") == 0.5
+    tracker.record_timeout("fp")
+    tracker.record_timeout("fp")
+    tracker.record_timeout("missing")
+    assert tracker.timeout("fp") > 0.5
+    for _ in range(10):
+        tracker.record_timeout("fp")
+    assert tracker.timeout("fp") == 8
+    tracker.forget("fp")
+    assert tracker.timeout("fp") == 5
+    with pytest.raises(ValueError):
+        IntelliFireLatencyTracker(min_timeout_seconds=10, max_timeout_seconds=1)
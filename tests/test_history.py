@@ -0,0 +1,85 @@
+"""Test the telemetry history ring buffer."""
+
+import json
+
+import pytest
+
+from intellifire4py.history import IntelliFireHistory, IntelliFireHistoryBucket
+from intellifire4py.local_api import IntelliFireAPILocal
+from intellifire4py.model import IntelliFirePollData
+
+
+def _fill(history, temperatures, start=0.0, step=10.0):
+    for i, temperature in enumerate(temperatures):
+        history.record(IntelliFirePollData(temperature=temperature), start + i * step)
+
+
+def test_ring_buffer_overwrites_oldest():
+    """Memory is fixed and the oldest samples are dropped first."""
+    history = IntelliFireHistory(capacity=3, fields=["temperature_c"])
+    _fill(history, [10, 11, 12, 13, 14])
+    assert len(history) == 3
+    result = history.query()
+    assert list(result["timestamp"]) == [20.0, 30.0, 40.0]
+    assert list(result["temperature_c"]) == [12, 13, 14]
+
+    history.clear()
+    assert len(history) == 0
+    assert list(history.query()["temperature_c"]) == []
+
+
+def test_range_query_and_clock_going_back():
+    """Queries bisect on time and an earlier timestamp is clamped to keep order."""
+    history = IntelliFireHistory(capacity=10)
+    _fill(history, [10, 11, 12, 13])
+    history.record(IntelliFirePollData(temperature=20, errors=[642]), 5.0)
+
+    result = history.query(fields=["temperature_c", "error_mask"], start=10, end=30)
+    assert list(result["timestamp"]) == [10.0, 20.0, 30.0, 30.0]
+    assert list(result["temperature_c"]) == [11, 12, 13, 20]
+    assert result["error_mask"][-1] == IntelliFirePollData(errors=[642]).error_mask
+    assert list(history.query(start=100)["timestamp"]) == []
+
+
+def test_downsample_buckets():
+    """Buckets are aligned, skip gaps and report min, max and mean."""
+    history = IntelliFireHistory(capacity=10)
+    _fill(history, [10, 14, 12], start=60)
+    history.record(IntelliFirePollData(temperature=30), 200)
+
+    assert history.downsample("temperature_c", bucket_seconds=60) == [
+        IntelliFireHistoryBucket(60.0, 3, 10, 14, 12.0),
+        IntelliFireHistoryBucket(180.0, 1, 30, 30, 30.0),
+    ]
+    assert history.downsample("temperature_c", 60, start=70) == [
+        IntelliFireHistoryBucket(60.0, 2, 12, 14, 13.0),
+        IntelliFireHistoryBucket(180.0, 1, 30, 30, 30.0),
+    ]
+
+
+def test_invalid_arguments():
+    """Bad capacity, fields and bucket widths are rejected."""
+    with pytest.raises(ValueError):
+        IntelliFireHistory(capacity=0)
+    with pytest.raises(ValueError):
+        IntelliFireHistory(fields=["name"])
+    with pytest.raises(ValueError):
+        IntelliFireHistory().downsample("temperature_c", bucket_seconds=0)
+
+
+def test_provider_records_every_poll(local_poll_json):
+    """Once enabled, each applied poll is recorded, including unchanged ones, until history is disabled."""
+    api = IntelliFireAPILocal(fireplace_ip="192.168.1.100")
+    payload = json.loads(local_poll_json)
+    api._apply_poll_payload(json.dumps(payload).encode())
+    assert api.history is None
+
+    history = api.enable_history(capacity=10)
+    assert api.enable_history(capacity=10) is history
+    api._apply_poll_payload(json.dumps(payload).encode())
+    api._apply_poll_payload(json.dumps(payload).encode())
+    assert len(api.history) == 2
+    assert list(api.history.query()["temperature_c"]) == [payload["temperature"]] * 2
+
+    api.history = None
+    api._apply_poll_payload(json.dumps(payload).encode())
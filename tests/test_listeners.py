@@ -0,0 +1,155 @@
+"""Test state change listeners."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from intellifire4py import UnifiedFireplace
+from intellifire4py.const import IntelliFireApiMode
+from intellifire4py.listeners import IntelliFireListenerRegistry
+from intellifire4py.local_api import IntelliFireAPILocal
+from intellifire4py.model import IntelliFirePollData
+
+
+def test_field_filters_and_removal():
+    """Filtered listeners only fire for their fields and stop after removal."""
+    registry = IntelliFireListenerRegistry()
+    everything, temperature, errors = [], [], []
+    registry.add_listener(lambda d, c: everything.append(c))
+    remove_temperature = registry.add_listener(
+        lambda d, c: temperature.append(c), fields=["temperature_c", "temperature_f"]
+    )
+    registry.add_listener(lambda d, c: errors.append(c), fields=["error_codes"])
+
+    data = IntelliFirePollData()
+    registry.dispatch(data, {"temperature_c": (18, 19)})
+    registry.dispatch(data, {"errors": ([], [642])})
+    registry.dispatch(data, {})
+
+    assert len(everything) == 2
+    assert temperature == [{"temperature_c": (18, 19)}]
+    assert errors == [{"errors": ([], [642])}]
+
+    remove_temperature()
+    registry.dispatch(data, {"temperature_c": (19, 20)})
+    assert len(temperature) == 1
+    assert registry._by_field.keys() == {"errors"}
+
+
+def test_unknown_field_is_rejected():
+    """A typo in a field filter raises instead of silently never firing."""
+    with pytest.raises(ValueError):
+        IntelliFireListenerRegistry().add_listener(lambda d, c: None, fields=["temp"])
+
+
+def test_failing_listener_does_not_block_others():
+    """Listener exceptions are contained."""
+    registry = IntelliFireListenerRegistry()
+    calls = []
+
+    def bad(data, changes):
+        raise RuntimeError("boom")
+
+    registry.add_listener(bad)
+    registry.add_listener(lambda d, c: calls.append(c))
+    registry.dispatch(IntelliFirePollData(), {"fanspeed": (0, 1)})
+    assert len(calls) == 1
+
+
+def test_provider_notifies_only_on_change(local_poll_json):
+    """A data provider pushes real changes to its listeners."""
+    api = IntelliFireAPILocal(fireplace_ip="192.168.1.100")
+    seen = []
+    api.add_listener(lambda d, c: seen.append(c), fields=["fanspeed"])
+
+    payload = json.loads(local_poll_json)
+    api._apply_poll_payload(json.dumps(payload).encode())
+    api._apply_poll_payload(json.dumps(payload).encode())
+    payload["temperature"] = 25
+    api._apply_poll_payload(json.dumps(payload).encode())
+    payload["fanspeed"] = 3
+    api._apply_poll_payload(json.dumps(payload).encode())
+
+    # Listeners receive every change of the update that touched their field
+    assert [c["fanspeed"] for c in seen] == [(0, 1), (1, 3)]
+
+
+@pytest.mark.asyncio
+async def test_unified_forwards_from_read_api(mock_common_data_local, local_poll_json):
+    """UnifiedFireplace listeners follow the current read mode."""
+    fp = UnifiedFireplace(mock_common_data_local, read_mode=IntelliFireApiMode.LOCAL)
+    seen = []
+    fp.add_listener(lambda d, c: seen.append(d))
+
+    fp._cloud_api._apply_poll_payload(local_poll_json.encode())
+    assert seen == []
+
+    fp._local_api._apply_poll_payload(local_poll_json.encode())
+    assert seen == [fp._local_api.data]
+
+
+@pytest.mark.asyncio
+async def test_stream_conflates_to_latest(local_poll_json):
+    """A slow consumer gets the latest snapshot instead of a backlog."""
+    api = IntelliFireAPILocal(fireplace_ip="192.168.1.100")
+    payload = json.loads(local_poll_json)
+
+    stream = api.stream()
+    first = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+
+    api._apply_poll_payload(json.dumps(payload).encode())
+    assert (await first).fanspeed == 1
+
+    # Three updates while the consumer is busy
+    for speed in (2, 3, 4):
+        payload["fanspeed"] = speed
+        api._apply_poll_payload(json.dumps(payload).encode())
+
+    assert (await anext(stream)).fanspeed == 4
+    await stream.aclose()
+    assert api._listeners._all == []
+
+
+@pytest.mark.asyncio
+async def test_stream_snapshots_do_not_change(local_poll_json):
+    """A delivered snapshot is unaffected by optimistic updates to the live data."""
+    api = IntelliFireAPILocal(fireplace_ip="192.168.1.100")
+    api.send_command = AsyncMock()  # type: ignore[method-assign]
+    stream = api.stream()
+    pending = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+
+    api._apply_poll_payload(local_poll_json.encode())
+    snapshot = await pending
+    await api.set_fan_speed(speed=3)
+    await api.flame_on()
+
+    assert snapshot.fanspeed == 1
+    assert snapshot.is_on is False
+    assert api.data.fanspeed == 3
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_field_filter(local_poll_json):
+    """A filtered stream ignores unrelated changes."""
+    api = IntelliFireAPILocal(fireplace_ip="192.168.1.100")
+    payload = json.loads(local_poll_json)
+    api._apply_poll_payload(json.dumps(payload).encode())
+
+    stream = api.stream(fields=["temperature_c"])
+    pending = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+
+    payload["fanspeed"] = 4
+    api._apply_poll_payload(json.dumps(payload).encode())
+    await asyncio.sleep(0)
+    assert not pending.done()
+
+    payload["temperature"] = 30
+    api._apply_poll_payload(json.dumps(payload).encode())
+    assert (await pending).temperature_c == 30
+    await stream.aclose()
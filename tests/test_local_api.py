@@ -50,6 +50,7 @@ async def test_poll(local_poll_json: str) -> None:
             await api.poll()
 
         await api.poll()
+        await api.close()
 
 
 @pytest.mark.asyncio
@@ -102,6 +103,7 @@ async def test_local_control(mock_login_for_control_testing):
             await fp.control_api.send_command(
                 command=IntelliFireCommand.FAN_SPEED, value=8
             )
+        await fp.close()
 
 
 @pytest.mark.asyncio
@@ -136,6 +138,7 @@ async def test_control_direct(user_id: str, api_key: str, challenge_text: str) -
 
         await api.set_fan_speed(speed=1)
         assert api.data.fanspeed == 1
+        await api.close()
 
 
 def test_needs_login() -> None:
@@ -155,6 +158,7 @@ async def test_poll_timeout(monkeypatch):
     monkeypatch.setattr(aiohttp.ClientSession, "get", raise_timeout)
     with pytest.raises(asyncio.TimeoutError):
         await api.poll()
+    await api.close()
 
 
 @pytest.mark.asyncio
@@ -187,6 +191,7 @@ async def test_poll_client_response_error(monkeypatch):
     monkeypatch.setattr(aiohttp.ClientSession, "get", dummy_get)
     with pytest.raises(aiohttp.ClientResponseError):
         await api.poll()
+    await api.close()
 
 
 def test_needs_login_missing_api_key_and_user_id():
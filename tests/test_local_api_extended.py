@@ -1,22 +1,26 @@
 """Extended tests for local_api.py to improve coverage."""
 
 import pytest
+import pytest_asyncio
 import asyncio
 from unittest.mock import AsyncMock, patch
 from aioresponses import aioresponses
 import aiohttp
+from pydantic import ValidationError
 
 from intellifire4py.local_api import IntelliFireAPILocal
 
 
-@pytest.fixture
-def local_api():
+@pytest_asyncio.fixture
+async def local_api():
     """Create a local API instance for testing."""
-    return IntelliFireAPILocal(
+    api = IntelliFireAPILocal(
         fireplace_ip="192.168.1.100",
         user_id="test_user",
         api_key="deadbeefdeadbeefdeadbeefdeadbeef",
     )
+    yield api
+    await api.close()
 
 
 @pytest.mark.asyncio
@@ -38,6 +42,28 @@ async def test_background_poll_timeout_handling(local_api):
         await local_api.stop_background_polling()
 
 
+@pytest.mark.asyncio
+async def test_poll_invalid_data(local_api, caplog):
+    """Valid JSON that is not poll data raises ValidationError and keeps background polling alive."""
+    with aioresponses() as m:
+        m.get(
+            "http://192.168.1.100/poll",
+            status=200,
+            body='{"temperature": "hot"}',
+            repeat=True,
+        )
+
+        with pytest.raises(ValidationError):
+            await local_api.poll()
+        assert "Invalid poll data" in caplog.text
+
+        await local_api.start_background_polling(minimum_wait_in_seconds=1)
+        await asyncio.sleep(0.1)
+        assert local_api.failed_poll_attempts == 1
+        assert local_api.is_polling_in_background is True
+        await local_api.stop_background_polling()
+
+
 @pytest.mark.asyncio
 async def test_poll_suppress_warnings_true(local_api):
     """Test poll with suppress_warnings=True."""
@@ -152,3 +178,117 @@ async def test_poll_json_decode_error_suppress(local_api):
 
         with pytest.raises(Exception):
             await local_api.poll(suppress_warnings=True)
+
+
+@pytest.mark.asyncio
+async def test_command_uses_prefetched_challenge(local_api):
+    """A prefetched challenge lets a command go out with a single /post."""
+    from intellifire4py.const import IntelliFireCommand
+    from yarl import URL
+
+    with aioresponses() as m:
+        m.get("http://192.168.1.100/get_challenge", body="deadbeef")
+        await local_api.prefetch_challenge()
+        assert local_api._challenge == "deadbeef"
+
+        m.post("http://192.168.1.100/post", status=200)
+        with patch.object(local_api, "_schedule_challenge_prefetch"):
+            await local_api._send_local_command(
+                command=IntelliFireCommand.POWER, value=1
+            )
+
+        assert len(m.requests[("GET", URL("http://192.168.1.100/get_challenge"))]) == 1
+        assert len(m.requests[("POST", URL("http://192.168.1.100/post"))]) == 1
+        assert local_api._challenge is None
+    await local_api.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_prefetched_challenge_is_replaced(local_api):
+    """A cached challenge older than the safe window is never used."""
+    import time
+
+    local_api._challenge = "stale"
+    local_api._challenge_received = time.monotonic() - 8
+    with aioresponses() as m:
+        m.get("http://192.168.1.100/get_challenge", body="fresh")
+        challenge, age = await local_api._take_challenge(local_api._get_session())
+
+    assert challenge == "fresh"
+    assert age == 0.0
+    assert local_api._challenge is None
+    await local_api.close()
+
+
+@pytest.mark.asyncio
+async def test_successful_command_prefetches_next_challenge(local_api):
+    """After a command succeeds the next challenge is fetched in the background."""
+    from intellifire4py.const import IntelliFireCommand
+
+    with aioresponses() as m:
+        m.get("http://192.168.1.100/get_challenge", body="aaaa")
+        m.get("http://192.168.1.100/get_challenge", body="bbbb")
+        m.post("http://192.168.1.100/post", status=200)
+
+        await local_api._send_local_command(command=IntelliFireCommand.POWER, value=1)
+        assert local_api._challenge_task is not None
+        await local_api._challenge_task
+
+    assert local_api._challenge == "bbbb"
+    await local_api.close()
+
+
+@pytest.mark.asyncio
+async def test_send_commands_pipelines_batch(local_api):
+    """A batch is sent in order with one challenge per command and per-command results."""
+    from intellifire4py.const import IntelliFireCommand
+    from intellifire4py.exceptions import InputRangError
+    from yarl import URL
+
+    batch = [
+        (IntelliFireCommand.POWER, 1),
+        (IntelliFireCommand.FLAME_HEIGHT, 3),
+        (IntelliFireCommand.FAN_SPEED, 2),
+        (IntelliFireCommand.LIGHT, 1),
+    ]
+    with aioresponses() as m:
+        m.get("http://192.168.1.100/get_challenge", body="deadbeef", repeat=True)
+        m.post("http://192.168.1.100/post", status=200, repeat=True)
+
+        with pytest.raises(InputRangError):
+            await local_api.send_commands([*batch, (IntelliFireCommand.LIGHT, 9)])
+        assert ("POST", URL("http://192.168.1.100/post")) not in m.requests
+
+        with patch.object(local_api, "_schedule_challenge_prefetch"):
+            results = await local_api.send_commands(batch)
+
+        posts = m.requests[("POST", URL("http://192.168.1.100/post"))]
+        challenges = m.requests[("GET", URL("http://192.168.1.100/get_challenge"))]
+
+    assert [r.success for r in results] == [True] * 4
+    assert [r.command for r in results] == [c for c, _ in batch]
+    assert [p.kwargs["data"].split("&")[0] for p in posts] == [
+        "command=power",
+        "command=flame_height",
+        "command=fan_speed",
+        "command=light",
+    ]
+    assert len(challenges) == 4
+    await local_api.close()
+
+
+def test_construct_payload_matches_reference_signature(local_api):
+    """The cached key hash state produces the documented signature."""
+    from hashlib import sha256
+
+    challenge = "0F" * 16
+    api_bytes = bytes.fromhex(local_api._api_key)
+    expected = sha256(
+        api_bytes
+        + sha256(
+            api_bytes + bytes.fromhex(challenge) + b"post:command=power&value=1"
+        ).digest()
+    ).hexdigest()
+    for _ in range(2):
+        payload = local_api._construct_payload("power", 1, challenge)
+        assert payload.endswith(f"response={expected}")
@@ -0,0 +1,109 @@
+"""Test the local fireplace simulator."""
+
+import asyncio
+import time
+from urllib.parse import parse_qsl
+
+import aiohttp
+import pytest
+
+from intellifire4py.testing.local_simulator import (
+    IntelliFireLocalSimulator,
+    IntelliFireVirtualFireplace,
+    sign_command,
+)
+
+API_KEY = "ab" * 16
+
+
+def _fireplace(**kwargs):
+    return IntelliFireVirtualFireplace(
+        "SERIAL", api_key=API_KEY, user_id="user", **kwargs
+    )
+
+
+def _form(fireplace, challenge, command="power", value=1, **overrides):
+    api = fireplace.api()
+    form = dict(parse_qsl(api._construct_payload(command, value, challenge)))
+    return {**form, **overrides}
+
+
+def test_signature_matches_client():
+    """The simulator accepts exactly what IntelliFireAPILocal signs."""
+    fireplace = _fireplace()
+    challenge = fireplace.issue_challenge(now=0)
+    form = _form(fireplace, challenge)
+    assert form["response"] == sign_command(API_KEY, challenge, "power", 1)
+    assert fireplace.post(form, now=1) == 204
+    assert fireplace.state["power"] == 1
+    # Challenges are single use
+    assert fireplace.post(form, now=1) == 403
+
+
+@pytest.mark.parametrize(
+    ("overrides", "now", "status"),
+    [
+        ({}, 11, 403),
+        ({"user": "someone"}, 1, 403),
+        ({"response": "0" * 64}, 1, 403),
+        ({"command": "warp"}, 1, 404),
+        ({"value": "x"}, 1, 422),
+    ],
+)
+def test_rejected_posts(overrides, now, status):
+    """Expired, forged, unknown and malformed commands are refused."""
+    fireplace = _fireplace()
+    challenge = fireplace.issue_challenge(now=0)
+    assert fireplace.post(_form(fireplace, challenge, **overrides), now=now) == status
+    assert fireplace.state["power"] == 0
+
+
+def test_out_of_range_value():
+    """A validly signed value outside the command range gets 422."""
+    fireplace = _fireplace()
+    challenge = fireplace.issue_challenge(now=0)
+    assert fireplace.post(_form(fireplace, challenge, "fan_speed", 9), now=0) == 422
+
+
+@pytest.mark.asyncio
+async def test_poll_and_command_over_http():
+    """IntelliFireAPILocal polls and controls simulated fireplaces over real sockets."""
+    async with IntelliFireLocalSimulator(seed=0) as simulator:
+        first = await simulator.add_fireplace(state={"temperature": 25})
+        second = await simulator.add_fireplace()
+        assert first.address != second.address
+
+        api = first.api()
+        await api.poll()
+        assert api.data.serial == first.serial
+        assert api.data.temperature_c == 25
+
+        await api.set_fan_speed(speed=3)
+        assert first.state["fanspeed"] == 3
+        assert first.stats["post_204"] == 1
+        assert second.state["fanspeed"] == 0
+        await api.close()
+
+
+@pytest.mark.asyncio
+async def test_network_conditions():
+    """Single connection fireplaces serialize requests and dropped requests disconnect."""
+    async with IntelliFireLocalSimulator(seed=0) as simulator:
+        fireplace = await simulator.add_fireplace(latency=0.05)
+        async with aiohttp.ClientSession() as session:
+            url = f"http://{fireplace.address}/poll"
+
+            async def poll():
+                async with session.get(url) as response:
+                    return response.status
+
+            start = time.perf_counter()
+            assert await asyncio.gather(poll(), poll()) == [200, 200]
+            assert time.perf_counter() - start >= 0.09
+
+            fireplace.latency = 0
+            fireplace.drop_rate = 1.0
+            with pytest.raises(aiohttp.ClientError):
+                await poll()
+            # aiohttp retries an idempotent request once on a reused connection
+            assert fireplace.stats["dropped"] >= 1
@@ -0,0 +1,131 @@
+"""Test the cloud long poll engine."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from aiohttp import CookieJar
+
+from intellifire4py.cloud_api import IntelliFireAPICloud
+from intellifire4py.exceptions import CloudError
+from intellifire4py.long_poll import IntelliFireLongPollEngine
+
+
+@pytest_asyncio.fixture
+async def cloud_api() -> IntelliFireAPICloud:
+    """Create a cloud API whose poll() only marks the queue as synced."""
+    api = IntelliFireAPICloud(serial="TEST123", cookie_jar=CookieJar())
+
+    async def fake_poll(*args, **kwargs):
+        api._last_sync = time.monotonic()
+
+    api.poll = AsyncMock(side_effect=fake_poll)  # type: ignore[method-assign]
+    return api
+
+
+def _stop_after(engine: IntelliFireLongPollEngine, results: list):
+    """Build a long_poll side effect that replays results and then stops the engine."""
+    remaining = list(results)
+
+    async def fake_long_poll():
+        result = remaining.pop(0)
+        if not remaining:
+            engine.stop()
+        if isinstance(result, BaseException):
+            raise result
+        if result == "hang":
+            await asyncio.sleep(10)
+        return result
+
+    return fake_long_poll
+
+
+@pytest.mark.asyncio
+async def test_engine_rearms_immediately(cloud_api):
+    """A 408 or 200 is followed by the next long poll without sleeping."""
+    updates = []
+    engine = IntelliFireLongPollEngine(cloud_api, on_update=updates.append)
+    cloud_api.long_poll = AsyncMock(  # type: ignore[method-assign]
+        side_effect=_stop_after(engine, [False, True, False])
+    )
+
+    with patch("intellifire4py.long_poll.asyncio.sleep") as sleep:
+        await engine.run()
+        sleep.assert_not_called()
+
+    assert cloud_api.poll.await_count == 1  # initial resync only
+    assert engine.timeouts == 2
+    assert engine.changes == 1
+    # one update for the resync and one for the change
+    assert len(updates) == 2
+    assert engine.is_running is False
+
+
+@pytest.mark.asyncio
+async def test_engine_detects_dropped_connection(cloud_api):
+    """A request outstanding past the drop deadline triggers a resync."""
+    engine = IntelliFireLongPollEngine(cloud_api, drop_timeout_seconds=0.05)
+    cloud_api.long_poll = AsyncMock(  # type: ignore[method-assign]
+        side_effect=_stop_after(engine, ["hang", False])
+    )
+
+    await engine.run()
+
+    assert engine.drops == 1
+    assert engine.errors == 0
+    assert cloud_api.poll.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_engine_backs_off_on_errors(cloud_api):
+    """Consecutive errors double the retry delay up to the maximum."""
+    engine = IntelliFireLongPollEngine(cloud_api, max_backoff_seconds=3)
+    cloud_api.long_poll = AsyncMock(  # type: ignore[method-assign]
+        side_effect=_stop_after(
+            engine,
+            [CloudError("boom"), CloudError("boom"), CloudError("boom"), True],
+        )
+    )
+
+    with patch("intellifire4py.long_poll.asyncio.sleep") as sleep:
+        await engine.run()
+
+    assert [c.args[0] for c in sleep.call_args_list] == [1, 2, 3]
+    assert engine.errors == 3
+    assert engine.changes == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_callback_errors_are_contained(cloud_api):
+    """A failing callback does not stop the engine."""
+
+    def bad_callback(data):
+        raise RuntimeError("bad consumer")
+
+    engine = IntelliFireLongPollEngine(cloud_api, on_update=bad_callback)
+    cloud_api.long_poll = AsyncMock(  # type: ignore[method-assign]
+        side_effect=_stop_after(engine, [True, True])
+    )
+    await engine.run()
+    assert engine.changes == 2
+
+
+@pytest.mark.asyncio
+async def test_background_polling_uses_engine(cloud_api):
+    """Long poll mode runs the engine and stops it with stop_background_polling."""
+
+    async def slow_long_poll():
+        await asyncio.sleep(0.01)
+        return False
+
+    cloud_api.long_poll = AsyncMock(side_effect=slow_long_poll)  # type: ignore[method-assign]
+    await cloud_api.start_background_polling()
+    await asyncio.sleep(0.05)
+    assert cloud_api._long_poll_engine.is_running
+    assert cloud_api.long_poll.await_count > 1
+
+    await cloud_api.stop_background_polling()
+    await asyncio.sleep(0)
+    assert cloud_api._long_poll_engine.is_running is False
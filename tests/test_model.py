@@ -1,8 +1,19 @@
 """Test File."""
 
+import json
+from json import JSONDecodeError
+
+import pytest
 from pydantic import ValidationError
 
-from intellifire4py.model import IntelliFirePollData
+from intellifire4py.const import IntelliFireErrorCode
+from intellifire4py.model import (
+    ERROR_BIT_MAINTENANCE,
+    ERROR_BIT_OFFLINE,
+    ERROR_BIT_PILOT_FLAME,
+    ERROR_CODE_BITS,
+    IntelliFirePollData,
+)
 
 
 def test_json_files(local_poll_json: str, poll_response_text_error_6_642: str) -> None:
@@ -86,3 +97,79 @@ def test_jsons(cloud_poll_json, local_poll_json):
     assert local.error_soft_lock_out is False
     assert local.error_ecm_offline is False
     assert local.error_offline is False
+
+
+def test_from_json_matches_keyword_construction(
+    cloud_poll_json, local_poll_json, poll_response_text_error_6_642
+):
+    """from_json on raw bytes gives the same model as the old json.loads path."""
+    for text in (cloud_poll_json, local_poll_json, poll_response_text_error_6_642):
+        assert IntelliFirePollData.from_json(text.encode()) == IntelliFirePollData(
+            **json.loads(text)
+        )
+
+
+def test_from_json_errors():
+    """Invalid JSON keeps raising JSONDecodeError, invalid data ValidationError."""
+    with pytest.raises(JSONDecodeError):
+        IntelliFirePollData.from_json(b"<html>busy</html>")
+    with pytest.raises(ValidationError):
+        IntelliFirePollData.from_json(b'{"fanspeed": "fast"}')
+
+
+def test_error_decoding_tolerates_unknown_codes():
+    """Unknown firmware codes are kept aside instead of raising."""
+    data = IntelliFirePollData(errors=[642, 9999, 130])
+    assert data.error_codes == [
+        IntelliFireErrorCode.OFFLINE,
+        IntelliFireErrorCode.PILOT_FLAME,
+    ]
+    assert data.unknown_errors == [9999]
+    assert data.error_codes_string == "OFFLINE, PILOT_FLAME"
+    assert data.error_offline is True
+    assert data.error_pilot_flame is True
+    assert data.error_fan is False
+    assert data.has_errors is True
+
+
+def test_derived_values_follow_assignment():
+    """Assigning a source field refreshes the cached derived values."""
+    data = IntelliFirePollData(temperature=20, setpoint=2000)
+    before = data.model_copy()
+    data.temperature_c = 30
+    data.raw_thermostat_setpoint = 2500
+    data.errors = [64]
+    assert data.temperature_f == 86
+    assert data.thermostat_setpoint_c == 25
+    assert data.thermostat_setpoint_f == 77
+    assert data.error_maintenance is True
+    assert before.temperature_f == 68
+    assert before.error_maintenance is False
+
+    data.errors = []
+    assert data.has_errors is False
+    assert data.error_maintenance is False
+
+
+def test_error_mask_bits():
+    """Each known code sets its own bit; unknown codes set none."""
+    assert IntelliFirePollData(errors=[2, 130]).error_mask == ERROR_BIT_PILOT_FLAME
+    assert (
+        IntelliFirePollData(errors=[642, 64, 9999]).error_mask
+        == ERROR_BIT_OFFLINE | ERROR_BIT_MAINTENANCE
+    )
+    assert len(set(ERROR_CODE_BITS.values())) == len(ERROR_CODE_BITS)
+
+
+def test_derived_values_follow_model_copy_update():
+    """Copies with updated source fields do not keep the original's cached values.
+
+    Cached values stay out of equality and serialization.
+    """
+    data = IntelliFirePollData(errors=[64], temperature=20)
+    assert data.error_maintenance and data.temperature_f == 68
+    copied = data.model_copy(update={"errors": [], "temperature_c": 30})
+    assert copied.error_maintenance is False
+    assert copied.temperature_f == 86
+    assert data == IntelliFirePollData(errors=[64], temperature=20)
+    assert "error_mask" not in data.model_dump()
@@ -0,0 +1,189 @@
+"""Test the fleet wide poll scheduler."""
+
+import asyncio
+import time
+
+import pytest
+
+from intellifire4py.const import IntelliFireCommand
+from intellifire4py.local_api import IntelliFireAPILocal
+from intellifire4py.testing.local_simulator import IntelliFireLocalSimulator
+from intellifire4py.poll_scheduler import IntelliFirePollScheduler
+
+
+async def _wait_for(condition, timeout=5.0):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_polls_repeat_in_batches():
+    """Polls due together start in one batch and repeat at their interval."""
+    polls = dict.fromkeys(range(20), 0)
+
+    def poller(key):
+        async def poll():
+            polls[key] += 1
+
+        return poll
+
+    async with IntelliFirePollScheduler(seed=0) as scheduler:
+        for key in polls:
+            scheduler.add(key, poller(key), lambda failed: 0.02, delay=0)
+        assert len(scheduler) == 20
+        assert 3 in scheduler
+        await _wait_for(lambda: min(polls.values()) >= 3)
+    assert scheduler.stats["batches"] < scheduler.stats["dispatched"]
+    assert not scheduler.is_running
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped():
+    """No more than `max_concurrency` polls are in flight."""
+    active = peak = done = 0
+
+    async def poll():
+        nonlocal active, peak, done
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        done += 1
+
+    async with IntelliFirePollScheduler(max_concurrency=3) as scheduler:
+        for key in range(10):
+            scheduler.add(key, poll, lambda failed: 60, delay=0)
+        await _wait_for(lambda: done >= 10)
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_rate_is_capped():
+    """Polls due together start no faster than `max_polls_per_second`."""
+    starts = []
+
+    async def poll():
+        starts.append(time.monotonic())
+
+    async with IntelliFirePollScheduler(max_polls_per_second=200) as scheduler:
+        for key in range(10):
+            scheduler.add(key, poll, lambda failed: 60, delay=0)
+        await _wait_for(lambda: len(starts) >= 10)
+    assert starts[-1] - starts[0] >= 9 / 200 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_interval():
+    """The interval callback sees consecutive failures, reset by a success."""
+    seen = []
+    outcomes = iter([False, False, True, False])
+
+    async def poll():
+        if not next(outcomes, True):
+            raise TimeoutError
+
+    def interval(failed):
+        seen.append(failed)
+        return 0.001
+
+    async with IntelliFirePollScheduler(jitter=0) as scheduler:
+        scheduler.add("fp", poll, interval, delay=0)
+        await _wait_for(lambda: len(seen) >= 5)
+    assert seen[:5] == [1, 2, 0, 1, 0]
+    assert scheduler.stats["failed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_remove_and_poll_soon():
+    """Removed polls stop and `poll_soon` runs a distant poll right away."""
+    polls = []
+
+    def poller(key):
+        async def poll():
+            polls.append(key)
+
+        return poll
+
+    async with IntelliFirePollScheduler() as scheduler:
+        scheduler.add("soon", poller("soon"), lambda failed: 3600, delay=3600)
+        scheduler.add("gone", poller("gone"), lambda failed: 0.001, delay=0.05)
+        scheduler.remove("gone")
+        scheduler.poll_soon("soon")
+        scheduler.poll_soon("missing")
+        await _wait_for(lambda: polls)
+        await asyncio.sleep(0.1)
+    assert polls == ["soon"]
+
+
+@pytest.mark.asyncio
+async def test_stop_keeps_registrations():
+    """A poll cancelled by `stop` runs again after `start`."""
+    started = asyncio.Event()
+    finished = []
+
+    async def poll():
+        started.set()
+        await asyncio.sleep(0.05)
+        finished.append(True)
+
+    scheduler = IntelliFirePollScheduler()
+    scheduler.add("fp", poll, lambda failed: 3600, delay=0)
+    await scheduler.start()
+    await started.wait()
+    await scheduler.stop()
+    assert not finished
+    assert scheduler.in_flight == 0
+    await scheduler.start()
+    await _wait_for(lambda: finished)
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_local_api_scheduled_polling():
+    """A local API polls through the scheduler and polls again right after a command."""
+    async with (
+        IntelliFireLocalSimulator() as local,
+        IntelliFirePollScheduler() as scheduler,
+    ):
+        fireplace = await local.add_fireplace()
+        async with fireplace.api() as api:
+            api.schedule_polling(scheduler, minimum_wait_in_seconds=3600)
+            assert api.poll_scheduler is scheduler
+            assert api in scheduler
+            scheduler.poll_soon(api)
+            await _wait_for(lambda: fireplace.stats["poll"] >= 1)
+
+            await api.send_command(command=IntelliFireCommand.POWER, value=1)
+            await _wait_for(lambda: fireplace.stats["poll"] >= 2)
+            assert api.data.is_on
+        assert api not in scheduler
+        assert api.poll_scheduler is None
+
+
+def test_scheduling_does_not_read_uninitialized_data(caplog):
+    """Picking the first delay before any poll does not warn about uninitialized data."""
+    scheduler = IntelliFirePollScheduler()
+    api = IntelliFireAPILocal(fireplace_ip="192.168.1.100")
+    api.schedule_polling(scheduler)
+    assert api in scheduler
+    assert "uninitialized" not in caplog.text
+
+
+def test_first_poll_within_base_interval():
+    """A provider never polled is first polled within the base interval, not the idle one."""
+    scheduler = IntelliFirePollScheduler(seed=0)
+    start = time.monotonic()
+    for host in range(50):
+        api = IntelliFireAPILocal(fireplace_ip=f"192.168.1.{host}")
+        api.schedule_polling(scheduler, minimum_wait_in_seconds=15)
+    delays = [due - start for due, *_ in scheduler._heap]
+    assert 7.5 < max(delays) <= 15
+
+
+def test_invalid_arguments():
+    """Concurrency must be positive and jitter a fraction."""
+    with pytest.raises(ValueError):
+        IntelliFirePollScheduler(max_concurrency=0)
+    with pytest.raises(ValueError):
+        IntelliFirePollScheduler(jitter=1.5)
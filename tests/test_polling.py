@@ -0,0 +1,159 @@
+"""Test the adaptive polling policy."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from intellifire4py.local_api import IntelliFireAPILocal
+from intellifire4py.model import IntelliFirePollData
+from intellifire4py.polling import IntelliFirePollBudget, IntelliFirePollingPolicy
+
+HEALTHY = {"connection_quality": 995871, "ecm_latency": 0}
+
+
+def test_idle_unit_polls_slowly():
+    """An off, error free unit waits idle_multiplier times the base interval."""
+    policy = IntelliFirePollingPolicy()
+    data = IntelliFirePollData(**HEALTHY)
+    assert policy.next_interval(data, base_interval=15) == 60
+
+
+def test_active_states_use_base_interval():
+    """Flame on, a running timer or errors keep the base interval."""
+    policy = IntelliFirePollingPolicy()
+    for state in ({"power": 1}, {"timer": 1}, {"errors": [642]}):
+        data = IntelliFirePollData(**HEALTHY, **state)
+        assert policy.next_interval(data, base_interval=15) == 15
+
+
+def test_transitions_poll_fast():
+    """Prepurge and a recent command switch to the fast interval."""
+    policy = IntelliFirePollingPolicy(fast_interval_seconds=3)
+    assert (
+        policy.next_interval(
+            IntelliFirePollData(**HEALTHY, prepurge=1), base_interval=15
+        )
+        == 3
+    )
+
+    policy.note_command()
+    assert policy.next_interval(IntelliFirePollData(**HEALTHY), base_interval=15) == 3
+    # Never slower than the caller asked for
+    assert policy.next_interval(IntelliFirePollData(**HEALTHY), base_interval=1) == 1
+
+
+def test_struggling_device_backs_off():
+    """High ecm latency, poor link quality and failures stretch the delay up to the cap."""
+    policy = IntelliFirePollingPolicy(max_interval_seconds=100)
+    on = {"power": 1}
+    assert (
+        policy.next_interval(
+            IntelliFirePollData(connection_quality=995871, ecm_latency=900, **on),
+            base_interval=15,
+        )
+        == 30
+    )
+    assert (
+        policy.next_interval(
+            IntelliFirePollData(connection_quality=500000, **on), base_interval=15
+        )
+        == 30
+    )
+    data = IntelliFirePollData(**HEALTHY, **on)
+    assert policy.next_interval(data, base_interval=15, failed_attempts=2) == 60
+    assert policy.next_interval(data, base_interval=15, failed_attempts=5) == 100
+
+
+def test_fixed_policy():
+    """adaptive=False always returns the base interval."""
+    policy = IntelliFirePollingPolicy(adaptive=False)
+    policy.note_command()
+    assert policy.next_interval(IntelliFirePollData(), base_interval=15) == 15
+
+
+@pytest.mark.asyncio
+async def test_background_poll_uses_policy_and_wakes_after_command():
+    """The local loop sleeps for the policy interval and a command cuts the sleep short."""
+    api = IntelliFireAPILocal(fireplace_ip="192.168.1.100")
+    polls = 0
+
+    async def fake_poll(**kwargs):
+        nonlocal polls
+        polls += 1
+        api._data = IntelliFirePollData(**HEALTHY)
+
+    with patch.object(api, "poll", side_effect=fake_poll):
+        with patch.object(
+            api.polling_policy, "next_interval", wraps=api.polling_policy.next_interval
+        ) as next_interval:
+            await api.start_background_polling(minimum_wait_in_seconds=15)
+            await asyncio.sleep(0.01)
+            assert polls == 1
+            assert next_interval.call_args.kwargs["base_interval"] == 15
+
+            api._poll_soon()
+            await asyncio.sleep(0.01)
+            assert polls == 2
+
+    await api.stop_background_polling()
+    assert api._poll_sleep is None
+
+
+def test_budget_favours_changing_fireplaces():
+    """Weights follow state and the allocation spends exactly the budget."""
+    budget = IntelliFirePollBudget(max_polls_per_second=1)
+    idle = IntelliFirePollData(**HEALTHY)
+    states = {
+        "idle": ({}, {}),
+        "hot": ({"hot": 1}, {}),
+        "on": ({"power": 1}, {}),
+        "timer": ({"timer": 1}, {}),
+        "purging": ({"prepurge": 1}, {}),
+        "commanded": ({}, {"recently_commanded": True}),
+        "offline": ({"power": 1}, {"failed_attempts": 2}),
+    }
+    for index in range(20):
+        for name, (fields, extra) in states.items():
+            budget.update(
+                f"{name}{index}", IntelliFirePollData(**HEALTHY, **fields), **extra
+            )
+    assert len(budget) == 140
+    intervals = {name: budget.interval(f"{name}0") for name in states}
+    assert intervals["purging"] == intervals["commanded"] < intervals["on"]
+    assert intervals["on"] == intervals["timer"] < intervals["hot"]
+    assert intervals["hot"] < intervals["idle"] < intervals["offline"]
+    assert intervals["idle"] == 4 * intervals["on"]
+    assert budget.total_rate == pytest.approx(1)
+
+    # A state change moves the fireplace to its new tier
+    assert budget.update("on0", idle) == budget.interval("idle0")
+    assert budget.interval("idle0") < intervals["idle"]
+    budget.remove("on0")
+    with pytest.raises(KeyError):
+        budget.interval("on0")
+
+
+def test_budget_caps_at_minimum_interval():
+    """Rate a fireplace cannot use at the minimum interval goes to the others."""
+    budget = IntelliFirePollBudget(max_polls_per_second=1, min_interval_seconds=3)
+    budget.update("on", IntelliFirePollData(**HEALTHY, power=1))
+    for index in range(3):
+        budget.update(index, IntelliFirePollData(**HEALTHY))
+    assert budget.interval("on") == 3
+    assert budget.interval(0) == pytest.approx(3 / (1 - 1 / 3) * 1)
+    assert budget.total_rate == pytest.approx(1)
+
+    # More budget than the fleet can use leaves everyone at the minimum interval
+    generous = IntelliFirePollBudget(max_polls_per_second=100)
+    generous.update("idle", IntelliFirePollData(**HEALTHY))
+    assert generous.interval("idle") == 3
+    assert generous.total_rate == pytest.approx(1 / 3)
+
+
+def test_budget_rejects_invalid_settings():
+    """Rates, intervals and weights must be positive."""
+    with pytest.raises(ValueError):
+        IntelliFirePollBudget(max_polls_per_second=0)
+    with pytest.raises(ValueError):
+        IntelliFirePollBudget(max_polls_per_second=1, offline_weight=0)
@@ -1,6 +1,12 @@
 """Test IntelliFireDataProvider and related read logic for intellifire4py."""
 
+import json
 from datetime import datetime, timezone
+from json import JSONDecodeError
+from unittest.mock import patch
+
+import pytest
+
 from intellifire4py.read import IntelliFireDataProvider
 from intellifire4py.model import IntelliFirePollData
 
@@ -27,6 +33,9 @@ class DummyProvider(IntelliFireDataProvider):
         self._polling_started = False
         return True
 
+    async def _scheduled_poll(self) -> None:
+        """Mock scheduled poll."""
+
 
 def test_init_and_last_poll():
     """Test initialization and last_poll_utc property."""
@@ -38,3 +47,50 @@ def test_init_and_last_poll():
     assert provider.last_poll_utc == now
     # data property returns the _data instance
     assert isinstance(provider.data, IntelliFirePollData)
+
+
+def test_identical_payload_skips_rebuild(local_poll_json):
+    """A byte-identical poll body is neither decoded nor validated again."""
+    provider = DummyProvider()
+    payload = local_poll_json.encode()
+    changes = provider._apply_poll_payload(payload)
+    assert changes["serial"] == ("unset", "BD0E054B5D6DF7AFBC8F9B28C9011111")
+    first = provider.data
+
+    with patch("intellifire4py.read.IntelliFirePollData") as model:
+        assert provider._apply_poll_payload(payload) == {}
+        model.assert_not_called()
+    assert provider.data is first
+    assert provider.last_changes == {}
+
+
+def test_changed_payload_reports_field_diff(local_poll_json):
+    """Only fields whose values changed are reported as (old, new)."""
+    provider = DummyProvider()
+    provider._apply_poll_payload(local_poll_json.encode())
+    changed = json.loads(local_poll_json)
+    changed["power"] = 1
+    changed["height"] = 2
+
+    changes = provider._apply_poll_payload(json.dumps(changed).encode())
+    assert changes == {"is_on": (False, True), "flameheight": (4, 2)}
+    assert provider.data.is_on is True
+
+
+def test_locally_modified_data_is_rebuilt(local_poll_json):
+    """An optimistic update is replaced by the device state even if the body is unchanged."""
+    provider = DummyProvider()
+    payload = local_poll_json.encode()
+    provider._apply_poll_payload(payload)
+    provider._data.is_on = True
+
+    assert provider._apply_poll_payload(payload) == {"is_on": (True, False)}
+    assert provider.data.is_on is False
+
+
+def test_invalid_payload_raises():
+    """Invalid JSON still raises JSONDecodeError and keeps the old data."""
+    provider = DummyProvider()
+    with pytest.raises(JSONDecodeError):
+        provider._apply_poll_payload(b"not json")
+    assert provider.data.serial == "unset"
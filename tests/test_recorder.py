@@ -0,0 +1,105 @@
+"""Test recording and replaying device traffic."""
+
+import json
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from intellifire4py.local_api import IntelliFireAPILocal
+from intellifire4py.recorder import (
+    IntelliFireExchange,
+    IntelliFireTrafficRecorder,
+    load_exchanges,
+    replay_polls,
+    save_exchanges,
+)
+
+
+@pytest_asyncio.fixture
+async def fireplace(local_poll_json):
+    """Serve /poll with a changing fan speed and /boom with a server error."""
+    payload = json.loads(local_poll_json)
+    polls = 0
+
+    async def handle_poll(request: web.Request) -> web.Response:
+        nonlocal polls
+        polls += 1
+        return web.json_response({**payload, "fanspeed": min(polls, 2)})
+
+    async def handle_boom(request: web.Request) -> web.Response:
+        return web.Response(status=500, body=b"\xff\xfe")
+
+    app = web.Application()
+    app.router.add_get("/poll", handle_poll)
+    app.router.add_get("/boom", handle_boom)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    yield f"127.0.0.1:{runner.addresses[0][1]}"
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay(tmp_path, fireplace):
+    """Polls are logged to disk and replay through the parse and diff path."""
+    log = tmp_path / "traffic.jsonl.gz"
+    recorder = IntelliFireTrafficRecorder(log)
+    api = IntelliFireAPILocal(fireplace_ip=fireplace, session=recorder.session())
+    for _ in range(3):
+        await api.poll()
+    await recorder.close()
+
+    exchanges = list(load_exchanges(log))
+    assert len(exchanges) == 3
+    assert all(exchange.is_poll for exchange in exchanges)
+    assert exchanges[0].url == f"http://{fireplace}/poll"
+    assert exchanges[0].elapsed > 0
+    assert json.loads(exchanges[2].body)["fanspeed"] == 2
+
+    replayed = IntelliFireAPILocal(fireplace_ip="192.168.1.100")
+    assert replay_polls(replayed, exchanges) == (3, 2)
+    assert replayed.data == api.data
+
+
+@pytest.mark.asyncio
+async def test_flight_recorder_dumps_on_errors(tmp_path, fireplace):
+    """Error responses and failed requests write the recent traffic ring to disk."""
+    flight = tmp_path / "flight.jsonl.gz"
+    recorder = IntelliFireTrafficRecorder(flight_size=2, flight_path=flight)
+    session = recorder.session()
+
+    async with session.get(f"http://{fireplace}/poll") as response:
+        await response.read()
+    assert not flight.exists()
+
+    async with session.get(
+        f"http://{fireplace}/boom", headers={"Cookie": "secret"}
+    ) as response:
+        assert response.status == 500
+    dumped = list(load_exchanges(flight))
+    assert [exchange.status for exchange in dumped] == [200, 500]
+    assert "Cookie" not in dumped[1].request_headers
+    assert dumped[1].body == b""
+
+    with pytest.raises(aiohttp.ClientError):
+        await session.get("http://127.0.0.1:1/poll")
+    dumped = list(load_exchanges(flight))
+    assert [exchange.status for exchange in dumped] == [500, 0]
+    assert dumped[1].error
+    await recorder.close()
+
+
+def test_binary_bodies_round_trip(tmp_path):
+    """Bodies that are not UTF-8 survive serialization."""
+    exchange = IntelliFireExchange(
+        started=1.0,
+        elapsed=0.5,
+        method="GET",
+        url="http://x/poll",
+        status=200,
+        body=b"\xff",
+    )
+    save_exchanges(tmp_path / "binary.jsonl.gz", [exchange])
+    assert list(load_exchanges(tmp_path / "binary.jsonl.gz")) == [exchange]
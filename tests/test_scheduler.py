@@ -0,0 +1,105 @@
+"""Test the per device request scheduler."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from aioresponses import aioresponses
+
+from intellifire4py.const import IntelliFireCommand
+from intellifire4py.local_api import IntelliFireAPILocal
+from intellifire4py.scheduler import IntelliFireRequestScheduler, RequestPriority
+
+
+@pytest.mark.asyncio
+async def test_commands_go_before_queued_polls():
+    """Waiting commands are granted before polls that queued earlier."""
+    scheduler = IntelliFireRequestScheduler()
+    order = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def request(name: str, priority: RequestPriority):
+        nonlocal in_flight, max_in_flight
+        async with scheduler.slot(priority):
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            order.append(name)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    first = asyncio.create_task(request("poll-1", RequestPriority.POLL))
+    await asyncio.sleep(0)
+    rest = [
+        asyncio.create_task(request("poll-2", RequestPriority.POLL)),
+        asyncio.create_task(request("command-1", RequestPriority.COMMAND)),
+        asyncio.create_task(request("poll-3", RequestPriority.POLL)),
+        asyncio.create_task(request("command-2", RequestPriority.COMMAND)),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.pending == 4
+
+    await asyncio.gather(first, *rest)
+
+    assert order == ["poll-1", "command-1", "command-2", "poll-2", "poll-3"]
+    assert max_in_flight == 1
+    assert scheduler.is_busy is False
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_block_others():
+    """Cancelling a queued request leaves the device available to the rest."""
+    scheduler = IntelliFireRequestScheduler()
+    release = asyncio.Event()
+    granted = []
+
+    async def holder():
+        async with scheduler.slot(RequestPriority.POLL):
+            await release.wait()
+
+    async def waiter(name: str):
+        async with scheduler.slot(RequestPriority.COMMAND):
+            granted.append(name)
+
+    hold = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(waiter("cancelled"))
+    survivor = asyncio.create_task(waiter("survivor"))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    release.set()
+    await asyncio.gather(hold, survivor)
+
+    assert granted == ["survivor"]
+    assert scheduler.is_busy is False
+
+
+@pytest.mark.asyncio
+async def test_send_command_keeps_background_polling():
+    """A command no longer cancels and re-creates the background poll task."""
+    api = IntelliFireAPILocal(
+        fireplace_ip="192.168.1.100",
+        user_id="test_user",
+        api_key="deadbeefdeadbeefdeadbeefdeadbeef",
+    )
+
+    with aioresponses() as m:
+        m.get("http://192.168.1.100/poll", payload={"serial": "X"}, repeat=True)
+        m.get("http://192.168.1.100/get_challenge", body="deadbeef", repeat=True)
+        m.post("http://192.168.1.100/post", status=200)
+
+        await api.start_background_polling(minimum_wait_in_seconds=30)
+        task = api._bg_task
+        await asyncio.sleep(0)
+
+        with patch.object(api, "start_background_polling") as start:
+            await api.send_command(command=IntelliFireCommand.POWER, value=1)
+            start.assert_not_called()
+
+        assert api._bg_task is task
+        assert not task.done()
+        assert api.is_sending is False
+
+        await api.close()
+        assert task.done()
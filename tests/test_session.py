@@ -0,0 +1,92 @@
+"""Test shared and owned aiohttp session handling."""
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+from yarl import URL
+
+from intellifire4py.cloud_api import IntelliFireAPICloud
+from intellifire4py.const import USER_AGENT
+from intellifire4py.local_api import IntelliFireAPILocal
+from intellifire4py.unified_fireplace import UnifiedFireplace
+
+IP = "192.168.1.69"
+
+
+@pytest.mark.asyncio
+async def test_local_owned_session_is_reused_and_closed(local_poll_json: str) -> None:
+    """An owned session survives across polls and is closed by close()."""
+    with aioresponses() as m:
+        m.get(f"http://{IP}/poll", body=local_poll_json, repeat=True)
+        api = IntelliFireAPILocal(fireplace_ip=IP)
+        await api.poll()
+        session = api._get_session()
+        await api.poll()
+        assert api._get_session() is session
+
+        await api.close()
+        assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_local_external_session_is_not_closed(local_poll_json: str) -> None:
+    """An injected session is used for requests but left open on close()."""
+    with aioresponses() as m:
+        m.get(f"http://{IP}/poll", body=local_poll_json, repeat=True)
+        async with aiohttp.ClientSession() as session:
+            async with IntelliFireAPILocal(fireplace_ip=IP, session=session) as api:
+                await api.poll()
+                assert api._get_session() is session
+                assert api.data.serial == "BD0E054B5D6DF7AFBC8F9B28C9011111"
+            assert not session.closed
+
+
+@pytest.mark.asyncio
+async def test_cloud_external_session_sends_cookies(
+    cloud_poll_json: str, mock_common_data_local
+) -> None:
+    """A shared session gets the fireplace cookies and user agent per request."""
+    serial = mock_common_data_local.serial
+    with aioresponses() as m:
+        m.get(f"https://iftapi.net/a/{serial}//apppoll", body=cloud_poll_json)
+        async with aiohttp.ClientSession() as session:
+            api = IntelliFireAPICloud(
+                serial=serial,
+                cookie_jar=mock_common_data_local.cookie_jar,
+                session=session,
+            )
+            await api.poll()
+            await api.close()
+            assert not session.closed
+
+        call = m.requests[("GET", URL(f"https://iftapi.net/a/{serial}//apppoll"))][0]
+        assert call.kwargs["headers"] == {"user-agent": USER_AGENT}
+        assert call.kwargs["cookies"]["auth_cookie"] == (
+            mock_common_data_local.auth_cookie
+        )
+        assert api.data.brand == "H&G"
+
+
+@pytest.mark.asyncio
+async def test_cloud_owned_session_uses_cookie_jar(cloud_poll_json: str) -> None:
+    """An owned session carries the cookie jar, so no per-request cookies are sent."""
+    with aioresponses() as m:
+        m.get("https://iftapi.net/a/TEST123//apppoll", body=cloud_poll_json)
+        api = IntelliFireAPICloud(serial="TEST123", cookie_jar=aiohttp.CookieJar())
+        await api.poll()
+        call = m.requests[("GET", URL("https://iftapi.net/a/TEST123//apppoll"))][0]
+        assert "cookies" not in call.kwargs
+        await api.close()
+        assert api._session is not None and api._session.closed
+
+
+@pytest.mark.asyncio
+async def test_unified_fireplace_shares_session(mock_common_data_local) -> None:
+    """Both underlying APIs use the session handed to UnifiedFireplace."""
+    async with aiohttp.ClientSession() as session:
+        async with UnifiedFireplace(
+            mock_common_data_local, session=session
+        ) as fireplace:
+            assert fireplace._local_api._get_session() is session
+            assert fireplace._cloud_api._get_session() is session
+        assert not session.closed
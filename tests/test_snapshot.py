@@ -0,0 +1,76 @@
+"""Test compact poll data snapshots."""
+
+import pickle
+from json import JSONDecodeError
+
+import pytest
+
+from intellifire4py.model import IntelliFirePollData
+from intellifire4py.snapshot import IntelliFireSnapshot
+
+
+def test_snapshot_covers_every_model_field():
+    """Slots and annotations stay in sync with IntelliFirePollData."""
+    assert IntelliFireSnapshot.__slots__ == tuple(IntelliFirePollData.model_fields)
+    assert set(IntelliFireSnapshot.__annotations__) == set(
+        IntelliFirePollData.model_fields
+    )
+
+
+def test_round_trip_matches_model(
+    cloud_poll_json, local_poll_json, poll_response_text_error_6_642
+):
+    """Parsing raw bytes and converting back is lossless."""
+    for text in (cloud_poll_json, local_poll_json, poll_response_text_error_6_642):
+        data = IntelliFirePollData.from_json(text.encode())
+        snapshot = IntelliFireSnapshot.from_json(text.encode())
+        assert snapshot.to_poll_data() == data
+        assert IntelliFireSnapshot.from_poll_data(data) == snapshot
+        assert pickle.loads(pickle.dumps(snapshot)) == snapshot  # noqa: S301
+
+
+def test_snapshot_is_immutable_and_compact(local_poll_json):
+    """Snapshots reject assignment, have no __dict__ and share interned strings."""
+    first = IntelliFireSnapshot.from_json(local_poll_json.encode())
+    second = IntelliFireSnapshot.from_json(local_poll_json)
+    assert not hasattr(first, "__dict__")
+    assert first.brand is second.brand
+    assert first.ipv4_address is second.ipv4_address
+    assert hash(first) == hash(second)
+
+    with pytest.raises(AttributeError):
+        first.fanspeed = 2
+    with pytest.raises(AttributeError):
+        del first.fanspeed
+
+    changed = first.replace(fanspeed=4)
+    assert changed.fanspeed == 4
+    assert first.fanspeed == 1
+
+
+def test_constructor_accepts_names_and_aliases():
+    """Field names and raw keys both work and missing fields use the model defaults."""
+    snapshot = IntelliFireSnapshot(temperature=21, fanspeed="2", power=1, errors=[642])
+    assert snapshot.temperature_c == 21
+    assert snapshot.fanspeed == 2
+    assert snapshot.is_on is True
+    assert snapshot.errors == (642,)
+    assert snapshot.raw_thermostat_setpoint == 2200
+
+    with pytest.raises(TypeError):
+        IntelliFireSnapshot(temp=21)
+
+
+def test_invalid_json_raises_decode_error():
+    """Malformed bodies raise JSONDecodeError like IntelliFirePollData.from_json."""
+    with pytest.raises(JSONDecodeError):
+        IntelliFireSnapshot.from_json(b"{not json")
+
+
+@pytest.mark.parametrize("payload", [b"[]", b'"x"', b"3", b"null"])
+def test_non_object_json_raises_value_error(payload):
+    """Valid JSON that is not an object raises ValueError, like IntelliFirePollData.from_json."""
+    with pytest.raises(ValueError, match="not an object"):
+        IntelliFireSnapshot.from_json(payload)
+    with pytest.raises(ValueError):
+        IntelliFirePollData.from_json(payload)
@@ -0,0 +1,87 @@
+"""Test the SQLite history sink."""
+
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from intellifire4py import UnifiedFireplace
+from intellifire4py.const import IntelliFireApiMode
+from intellifire4py.model import IntelliFirePollData
+from intellifire4py.sqlite_sink import IntelliFireErrorEpisode, IntelliFireSQLiteSink
+
+
+def _rows(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute(
+            "SELECT serial, timestamp, is_on, errors FROM poll_history ORDER BY timestamp"
+        ).fetchall()
+
+
+@pytest.mark.asyncio
+async def test_runtime_and_error_queries(tmp_path):
+    """Flame on intervals, runtime and error episodes are derived from state changes."""
+    sink = IntelliFireSQLiteSink(tmp_path / "history.db")
+    for timestamp, state in [
+        (0, {}),
+        (100, {"power": 1}),
+        (400, {"power": 1, "errors": [6]}),
+        (500, {"errors": [6, 642]}),
+        (700, {"errors": [642]}),
+        (1000, {"power": 1, "errors": [9999]}),
+    ]:
+        sink.record("ABC", IntelliFirePollData(**state), timestamp)
+    sink.record("OTHER", IntelliFirePollData(power=1), 50)
+    await sink.flush()
+
+    assert await sink.flame_on_intervals("ABC", end=1800) == [(100, 500), (1000, 1800)]
+    assert await sink.runtime_hours("ABC", end=1800) == pytest.approx(1200 / 3600)
+    assert await sink.flame_on_intervals("ABC", start=450, end=1800) == [(1000, 1800)]
+    assert await sink.error_episodes("ABC", end=1800) == [
+        IntelliFireErrorEpisode(6, 400, 700),
+        IntelliFireErrorEpisode(642, 500, 1000),
+        IntelliFireErrorEpisode(9999, 1000, None),
+    ]
+    await sink.close()
+
+
+@pytest.mark.asyncio
+async def test_batches_are_written_in_background(tmp_path):
+    """A full batch is written off the event loop without an explicit flush."""
+    path = tmp_path / "batch.db"
+    sink = IntelliFireSQLiteSink(path, batch_size=2)
+    sink.record("ABC", IntelliFirePollData(), 1)
+    assert not path.exists()
+    sink.record("ABC", IntelliFirePollData(power=1), 2)
+    await asyncio.gather(*sink._flush_tasks)
+    assert [row[1] for row in _rows(path)] == [1, 2]
+
+    sink.record("ABC", IntelliFirePollData(), 3)
+    await sink.close()
+    assert len(_rows(path)) == 3
+    with sqlite3.connect(path) as connection:
+        indexes = connection.execute("PRAGMA index_list(poll_history)").fetchall()
+    assert any(index[1] == "idx_poll_history_serial_timestamp" for index in indexes)
+
+
+@pytest.mark.asyncio
+async def test_attach_records_fireplace_changes(
+    tmp_path, mock_common_data_local, local_poll_json
+):
+    """An attached fireplace logs each changed poll under its serial."""
+    fireplace = UnifiedFireplace(
+        mock_common_data_local, read_mode=IntelliFireApiMode.LOCAL
+    )
+    sink = IntelliFireSQLiteSink(tmp_path / "attach.db")
+    detach = sink.attach(fireplace)
+    fireplace._local_api._apply_poll_payload(local_poll_json.encode())
+    fireplace._local_api._apply_poll_payload(local_poll_json.encode())
+    detach()
+    changed = {**json.loads(local_poll_json), "fanspeed": 4}
+    fireplace._local_api._apply_poll_payload(json.dumps(changed).encode())
+    await sink.close()
+
+    rows = _rows(tmp_path / "attach.db")
+    assert len(rows) == 1
+    assert rows[0][0] == fireplace.serial
@@ -0,0 +1,87 @@
+"""Test the compressed telemetry store."""
+
+import pytest
+
+from intellifire4py.model import IntelliFirePollData
+from intellifire4py.telemetry_store import (
+    IntelliFireTelemetryStore,
+    _decode_column,
+    _encode_column,
+)
+
+
+@pytest.mark.parametrize("order", [1, 2])
+def test_column_round_trip(order):
+    """Run-length encoded differences decode to the original values."""
+    values = [0, 0, 0, 5, 5, -3, 10**13, 10**13, -(10**12), 7]
+    out = bytearray()
+    _encode_column(values, order, out)
+    assert _decode_column(bytes(out), 0, len(values), order) == (values, len(out))
+
+
+def test_append_query_and_reopen(tmp_path):
+    """Samples survive a reopen, including appends after it, and range queries filter by time."""
+    path = tmp_path / "fireplace.ifts"
+    with IntelliFireTelemetryStore(
+        path, fields=["temperature_c", "fanspeed"], block_size=4
+    ) as store:
+        for i in range(10):
+            store.append(1000 + i * 15, [20 + i // 5, 1])
+        assert len(store) == 10
+        # Two full blocks on disk, two samples still buffered
+        assert len(store._blocks) == 2
+        result = store.query(start=1030, end=1090)
+        assert list(result["timestamp"]) == [1030.0, 1045.0, 1060.0, 1075.0, 1090.0]
+        assert list(result["temperature_c"]) == [20, 20, 20, 21, 21]
+
+    with IntelliFireTelemetryStore(
+        path, fields=["temperature_c", "fanspeed"], block_size=4
+    ) as store:
+        assert len(store) == 10
+        store.record(IntelliFirePollData(temperature=30, fanspeed=4), 2000.5)
+        store.flush()
+        result = store.query(fields=["fanspeed"], start=1135)
+        assert list(result["timestamp"]) == [1135.0, 2000.5]
+        assert list(result["fanspeed"]) == [1, 4]
+        assert "temperature_c" not in result
+
+
+def test_compresses_steady_polls(tmp_path):
+    """Periodic polls of an unchanging fireplace take well under a byte per sample."""
+    path = tmp_path / "steady.ifts"
+    with IntelliFireTelemetryStore(path) as store:
+        for i in range(5000):
+            store.record(IntelliFirePollData(temperature=21), 1_700_000_000 + i * 15)
+    assert path.stat().st_size / 5000 < 1
+
+
+def test_partial_block_is_truncated(tmp_path):
+    """A block cut short by a crash is dropped on open and appends continue cleanly."""
+    path = tmp_path / "crash.ifts"
+    with IntelliFireTelemetryStore(path, block_size=2) as store:
+        for i in range(4):
+            store.append(i, [i] * 8)
+    size = path.stat().st_size
+    with open(path, "ab") as file:
+        file.write(b"\x40\x00\x00\x00\x02")
+
+    with IntelliFireTelemetryStore(path, block_size=2) as store:
+        assert path.stat().st_size == size
+        store.append(10, [9] * 8)
+    with IntelliFireTelemetryStore(path) as store:
+        assert list(store.query()["temperature_c"]) == [0, 1, 2, 3, 9]
+
+
+def test_rejects_mismatched_files(tmp_path):
+    """Opening with other fields or a foreign file fails loudly."""
+    path = tmp_path / "fields.ifts"
+    IntelliFireTelemetryStore(path, fields=["fanspeed"]).close()
+    with pytest.raises(ValueError):
+        IntelliFireTelemetryStore(path, fields=["temperature_c"])
+
+    foreign = tmp_path / "foreign.ifts"
+    foreign.write_bytes(b"not a telemetry store")
+    with pytest.raises(ValueError):
+        IntelliFireTelemetryStore(foreign)
+    with pytest.raises(ValueError):
+        IntelliFireTelemetryStore(tmp_path / "other.ifts", fields=["name"])
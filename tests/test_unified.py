@@ -26,7 +26,7 @@ async def test_build_from_common_data_local_with_local_connectivity(
     assert local_fp.read_mode == IntelliFireApiMode.LOCAL
     assert local_fp.control_mode == IntelliFireApiMode.LOCAL
     try:
-        await local_fp.read_api.stop_background_polling()
+        await local_fp.close()
     except Exception as e:
         logging.error(f"Exception during cleanup: {e}")
 
@@ -44,7 +44,7 @@ async def test_build_from_common_data_local_with_local_connectivity1(
     assert local_fp.control_mode == IntelliFireApiMode.CLOUD
 
     try:
-        await local_fp.read_api.stop_background_polling()
+        await local_fp.close()
     except Exception as e:
         logging.error(f"Exception during cleanup: {e}")
 
@@ -63,7 +63,7 @@ async def test_build_from_common_data_local_without_local_connectivity2(
     assert local_fp.read_mode == IntelliFireApiMode.CLOUD
     assert local_fp.control_mode == IntelliFireApiMode.CLOUD
     try:
-        await local_fp.read_api.stop_background_polling()
+        await local_fp.close()
     except Exception as e:
         logging.error(f"Exception during cleanup: {e}")
 
@@ -83,7 +83,7 @@ async def test_build_with_user_data_cloud_only(
     assert fp.cloud_connectivity is True
     assert fp.local_connectivity is False
     try:
-        await fp.read_api.stop_background_polling()
+        await fp.close()
     except Exception as e:
         logging.error(f"Exception during cleanup: {e}")
 
@@ -103,7 +103,7 @@ async def test_build_with_user_data_cloud_and_local(
     assert fp.cloud_connectivity is True
     assert fp.local_connectivity is True
     try:
-        await fp.read_api.stop_background_polling()
+        await fp.close()
     except Exception as e:
         logging.error(f"Exception during cleanup: {e}")
 
@@ -250,7 +250,7 @@ async def test_is_cloud_and_local_polling_properties_cleanup(mock_common_data_lo
         assert fp.is_local_polling is True
     # Clean up background polling if started
     try:
-        await fp.read_api.stop_background_polling()
+        await fp.close()
     except Exception as e:
         logging.error(f"Exception during cleanup: {e}")
 
@@ -301,6 +301,7 @@ async def test_build_fireplace_direct(mock_async_validate_connectivity):
     assert fp.auth_cookie == "cookie"
     assert fp.user_id == "user"
     assert fp.web_client_id == "webid"
+    await fp.close()
 
 
 @pytest.mark.asyncio
@@ -409,6 +410,7 @@ async def test_build_fireplace_from_common_data_real(mock_common_data_local):
             mock_common_data_local
         )
         assert isinstance(fp, UnifiedFireplace)
+        await fp.close()
 
 
 @pytest.mark.asyncio
@@ -448,3 +450,17 @@ async def test_debug_method(mock_common_data_local):
     with patch("intellifire4py.unified_fireplace.inspect") as mock_inspect:
         fp.debug()
         mock_inspect.assert_called_once_with(fp, methods=True, help=True)
+
+
+@pytest.mark.asyncio
+async def test_send_commands_uses_control_api(mock_common_data_local):
+    """UnifiedFireplace.send_commands delegates to the active control api."""
+    from intellifire4py.const import IntelliFireCommand
+
+    fp = UnifiedFireplace(mock_common_data_local)
+    sentinel = [object()]
+    fp._local_api.send_commands = AsyncMock(return_value=sentinel)  # type: ignore[method-assign]
+
+    batch = [(IntelliFireCommand.POWER, 1)]
+    assert await fp.send_commands(batch) is sentinel
+    fp._local_api.send_commands.assert_awaited_once_with(batch)